@@ -8,6 +8,9 @@ from fastapi.responses import JSONResponse
 import logging
 from datetime import datetime
 import os
+from typing import Optional
+
+from core.content_analyzer.telemetry import LATENCY_BUCKETS, SIZE_BUCKETS, get_stage_latency
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -97,6 +100,17 @@ async def readiness_check():
         raise HTTPException(status_code=503, detail="Service not ready")
 
 
+@app.get("/metrics/content-analysis")
+async def content_analysis_metrics(stage: Optional[str] = None):
+    """Content analysis stage latency histograms, by stage and document size."""
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "size_buckets": [label for label, _ in SIZE_BUCKETS],
+        "latency_buckets_seconds": list(LATENCY_BUCKETS),
+        "stages": get_stage_latency(stage),
+    }
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler."""
@@ -5,11 +5,17 @@ This module provides content parsing, analysis, and quality assessment capabilit
 """
 
 from .parser import ContentParser
+from .tokenizer import TokenizedDocument
 from .structure_analyzer import ContentStructureAnalyzer
 from .style_analyzer import StyleAnalyzer
 from .question_generator import QuestionGenerator
 from .quality_scorer import QualityScorer
-from .analyzer import ContentAnalyzer, ContentAnalysisError
+from .analyzer import ContentAnalyzer, ContentAnalysisError, ContentAnalysisTimeout
+from .batch import BatchAnalysis, BatchItemResult, BatchStats
+from .cache import AnalysisCache
+from .metrics import TextMetrics
+from .sections import SectionCache
+from .readability import ReadabilityScores, readability_scores
 from .models import (
     ContentStructure,
     StyleAnalysis,
@@ -20,12 +26,22 @@ from .models import (
 
 __all__ = [
     'ContentParser',
+    'TokenizedDocument',
     'ContentStructureAnalyzer', 
     'StyleAnalyzer',
     'QuestionGenerator',
     'QualityScorer',
     'ContentAnalyzer',
     'ContentAnalysisError',
+    'ContentAnalysisTimeout',
+    'BatchAnalysis',
+    'BatchItemResult',
+    'BatchStats',
+    'AnalysisCache',
+    'TextMetrics',
+    'SectionCache',
+    'ReadabilityScores',
+    'readability_scores',
     'ContentStructure',
     'StyleAnalysis',
     'PurposeAnalysis',
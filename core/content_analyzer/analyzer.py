@@ -2,76 +2,395 @@
 Main content analyzer service that orchestrates all analysis components.
 """
 
+import asyncio
+import os
+import threading
 import time
-from typing import Dict, Any, Optional
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Callable, Dict, Any, Iterable, List, Optional, Set
 from .parser import ContentParser
 from .structure_analyzer import ContentStructureAnalyzer
 from .style_analyzer import StyleAnalyzer
 from .question_generator import QuestionGenerator
 from .quality_scorer import QualityScorer
-from .models import AnalysisResults, ContentStructure, StyleAnalysis, PurposeAnalysis, QualityMetrics
+from .models import AnalysisResults, ContentStructure, StyleAnalysis, PurposeAnalysis, QualityMetrics, build_result
+from .batch import BatchAnalysis, BatchDocument, BatchEntry, BatchItemResult, to_batch_entries
+from .cache import AnalysisCache, make_cache_key
+from .features import FeatureGraph
+from .sections import SectionCache, SectionMetrics, measure_sections, measure_token_sections
+from .telemetry import get_stage_latency, stage_latency
+
+
+# Where the CPU-bound pipeline runs: on the event loop, in a thread pool or in a process pool
+EXECUTOR_MODES = ('inline', 'thread', 'process')
+
+# Input formats analyze_content accepts
+CONTENT_FORMATS = ('markdown', 'html')
+
+# Thread pools by max_workers, shared by every analyzer in the process
+_thread_pools: Dict[Optional[int], ThreadPoolExecutor] = {}
+_thread_pools_lock = threading.Lock()
+
+
+def _shared_thread_pool(max_workers: Optional[int]) -> ThreadPoolExecutor:
+    """The process-wide thread pool for ``max_workers``, created on first use."""
+    with _thread_pools_lock:
+        pool = _thread_pools.get(max_workers)
+        if pool is None:
+            pool = _thread_pools[max_workers] = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix='content-analyzer'
+            )
+        return pool
 
 
 class ContentAnalyzer:
-    """Main content analyzer that orchestrates all analysis components."""
+    """Main content analyzer that orchestrates all analysis components.
+    
+    ``executor_mode`` controls where ``analyze_content`` runs the pipeline so a
+    long article does not block the event loop. Timeouts and cancellation are
+    checked between pipeline stages and, while parsing and measuring, before
+    every token and section. In process mode a timed out or cancelled call
+    also retires its pool: later calls get a new pool and the old one's
+    workers are terminated once its other in-flight calls have finished.
+    Thread mode uses a thread pool shared by all analyzers in the process;
+    a process pool belongs to its analyzer and is released by ``shutdown``
+    or by leaving ``async with``.
+    
+    With a ``cache`` repeated analyses of the same normalized content and
+    parameters are served from it instead of re-running the pipeline; it is
+    consulted in this process, before any work is sent to a pool.
+    Independently of that, metrics are measured per section and kept in
+    ``section_cache``, so a revised article only re-measures edited sections.
+    Process workers cannot share it and keep their own section cache of the
+    same size.
     
-    def __init__(self):
+    Content is markdown by default; with ``content_format='html'`` a page is
+    parsed from its lxml tree directly, without a markdown conversion.
+    """
+    
+    def __init__(self, executor_mode: str = "thread", max_workers: Optional[int] = None,
+                 timeout: Optional[float] = None, cache: Optional[AnalysisCache] = None,
+                 section_cache: Optional[SectionCache] = None):
+        if executor_mode not in EXECUTOR_MODES:
+            raise ValueError(f"Unknown executor mode: {executor_mode}")
+        
         self.parser = ContentParser()
         self.structure_analyzer = ContentStructureAnalyzer()
         self.style_analyzer = StyleAnalyzer()
         self.question_generator = QuestionGenerator()
         self.quality_scorer = QualityScorer()
+        
+        self.executor_mode = executor_mode
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache = cache
+        self.section_cache = section_cache if section_cache is not None else SectionCache()
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()
+        # In-flight calls per process pool, and pools to terminate once they have none
+        self._pool_calls: Dict[Executor, int] = {}
+        self._retired_pools: Set[Executor] = set()
+        self.stages = self._build_stages()
+    
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await asyncio.to_thread(self.shutdown)
+    
+    def _build_stages(self) -> FeatureGraph:
+        """Declare the pipeline stages and the inputs each one reads."""
+        graph = FeatureGraph()
+        graph.add('parsed_content', self._parse, ['content', 'content_format', 'checkpoint'])
+        # Unchanged sections come from the section cache
+        graph.add('metrics', self._measure, ['parsed_content', 'checkpoint'])
+        graph.add('content_structure', self._analyze_structure, ['parsed_content', 'metrics'])
+        graph.add('style_analysis', self._analyze_style, ['metrics'])
+        graph.add('purpose_analysis', self._analyze_purpose, ['metrics', 'purpose', 'target_audience'])
+        graph.add('quality_metrics', self._assess_quality, [
+            'metrics', 'content_structure', 'style_analysis', 'purpose_analysis'
+        ])
+        return graph
+    
+    def _parse(self, content: str, content_format: str,
+               checkpoint: Optional[Callable[[], None]]) -> Dict[str, Any]:
+        if content_format == 'html':
+            return self.parser.parse_html(content, tokenize=False, checkpoint=checkpoint)
+        return self.parser.parse_content(content, tokenize=False, checkpoint=checkpoint)
+    
+    def _measure(self, parsed_content: Dict[str, Any],
+                 checkpoint: Optional[Callable[[], None]]) -> SectionMetrics:
+        if parsed_content.get('format') == 'html':
+            return measure_token_sections(parsed_content['tokens'], self.style_analyzer, self.section_cache,
+                                          checkpoint)
+        return measure_sections(parsed_content['content'], self.style_analyzer, self.section_cache,
+                                checkpoint)
+    
+    def _analyze_structure(self, parsed_content: Dict[str, Any], metrics: SectionMetrics) -> ContentStructure:
+        return self.structure_analyzer.analyze_structure(parsed_content, metrics.raw)
+    
+    def _analyze_style(self, metrics: SectionMetrics) -> StyleAnalysis:
+        return self.style_analyzer.analyze_metrics(metrics.prose)
+    
+    def _analyze_purpose(self, metrics: SectionMetrics, purpose: str, target_audience: str) -> PurposeAnalysis:
+        return self.question_generator.generate_purpose_analysis(metrics.raw, purpose, target_audience)
+    
+    def _assess_quality(self, metrics: SectionMetrics, content_structure: ContentStructure,
+                        style_analysis: StyleAnalysis, purpose_analysis: PurposeAnalysis) -> QualityMetrics:
+        return self.quality_scorer.assess_quality(
+            metrics.raw, content_structure, style_analysis, purpose_analysis
+        )
     
     async def analyze_content(self, content: str, purpose: str = "auto", 
-                            target_audience: str = "general", content_id: Optional[str] = None) -> AnalysisResults:
-        """Perform comprehensive content analysis."""
+                            target_audience: str = "general", content_id: Optional[str] = None,
+                            timeout: Optional[float] = None,
+                            content_format: str = "markdown") -> AnalysisResults:
+        """Perform comprehensive content analysis.
+        
+        ``content_format`` is ``'markdown'`` or ``'html'``.
+        """
+        if content_format not in CONTENT_FORMATS:
+            raise ValueError(f"Unknown content format: {content_format}")
+        if self.cache is None:
+            return await self._analyze_content(content, purpose, target_audience, content_id, timeout,
+                                               content_format)
+        
+        key = make_cache_key(content, purpose, target_audience, content_format)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return cached.model_copy(update={
+                'content_id': content_id,
+                'metadata': {**cached.metadata, 'cache_hit': True}
+            })
+        
+        results = await self._analyze_content(content, purpose, target_audience, content_id, timeout,
+                                              content_format)
+        await self.cache.set(key, results)
+        return results
+    
+    async def _analyze_content(self, content: str, purpose: str, target_audience: str,
+                               content_id: Optional[str], timeout: Optional[float],
+                               content_format: str = "markdown") -> AnalysisResults:
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.time() + timeout if timeout is not None else None
+        
+        if self.executor_mode == 'inline':
+            results = self.analyze_content_sync(content, purpose, target_audience, content_id, deadline,
+                                                content_format=content_format)
+            stage_latency.observe_results(results)
+            return results
+        
         start_time = time.time()
+        cancel_event: Optional[threading.Event] = None
+        if self.executor_mode == 'thread':
+            cancel_event = threading.Event()
+            call = partial(
+                self.analyze_content_sync, content, purpose, target_audience,
+                content_id, deadline, cancel_event, content_format
+            )
+        else:
+            call = partial(_analyze_in_worker, content, purpose, target_audience, content_id, deadline,
+                           content_format)
+        
+        loop = asyncio.get_running_loop()
+        executor = self._enter_executor()
+        future = loop.run_in_executor(executor, call)
         
         try:
-            # Step 1: Parse content
-            parsed_content = self.parser.parse_content(content)
-            
-            # Step 2: Analyze content structure
-            content_structure = self.structure_analyzer.analyze_structure(parsed_content)
-            
-            # Step 3: Analyze writing style
-            style_analysis = self.style_analyzer.analyze_style(content)
-            
-            # Step 4: Generate purpose analysis and questions
-            purpose_analysis = self.question_generator.generate_purpose_analysis(
-                content, purpose, target_audience
-            )
-            
-            # Step 5: Assess quality
-            quality_metrics = self.quality_scorer.assess_quality(
-                content,
-                content_structure.model_dump(),
-                style_analysis.model_dump(),
-                purpose_analysis.model_dump()
+            results = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self._stop_worker(executor, cancel_event)
+            raise ContentAnalysisTimeout(
+                f"Content analysis timed out after {timeout}s", time.time() - start_time
             )
+        except asyncio.CancelledError:
+            self._stop_worker(executor, cancel_event)
+            raise
+        except BrokenProcessPool as e:
+            self._retire_pool(executor)
+            raise ContentAnalysisError(f"Content analysis failed: {str(e)}", time.time() - start_time)
+        finally:
+            self._leave_executor(executor)
+        
+        # Recorded here, not in the worker, so process mode feeds this process's histograms
+        stage_latency.observe_results(results)
+        return results
+    
+    def analyze_content_sync(self, content: str, purpose: str = "auto", target_audience: str = "general",
+                             content_id: Optional[str] = None, deadline: Optional[float] = None,
+                             cancel_event: Optional[threading.Event] = None,
+                             content_format: str = "markdown") -> AnalysisResults:
+        """Run the analysis pipeline in the calling thread.
+        
+        ``deadline`` (a ``time.time()`` value) and ``cancel_event`` are checked
+        between stages and inside parsing and section measurement, so a timed
+        out or cancelled call stops doing work.
+        """
+        start_time = time.time()
+        
+        try:
+            # Each stage runs once, after the stages it reads from
+            checkpoint = None
+            if deadline is not None or cancel_event is not None:
+                checkpoint = partial(_check_cancelled, deadline, cancel_event, start_time)
+            stages = self.stages.evaluate({
+                'content': content,
+                'content_format': content_format,
+                'purpose': purpose,
+                'target_audience': target_audience,
+                'checkpoint': checkpoint
+            })
+            stages.compute(['quality_metrics'], checkpoint=checkpoint)
+            metrics = stages['metrics']
             
             # Calculate processing time
             processing_time = time.time() - start_time
             
             # Create comprehensive analysis results
-            analysis_results = AnalysisResults(
+            analysis_results = build_result(
+                AnalysisResults,
                 content_id=content_id,
-                content_structure=content_structure,
-                style_analysis=style_analysis,
-                purpose_analysis=purpose_analysis,
-                quality_metrics=quality_metrics,
+                content_structure=stages['content_structure'],
+                style_analysis=stages['style_analysis'],
+                purpose_analysis=stages['purpose_analysis'],
+                quality_metrics=stages['quality_metrics'],
+                metadata={
+                    'sections': metrics.sections,
+                    'sections_reused': metrics.reused,
+                    'input': {'characters': len(content), 'words': metrics.raw.word_count},
+                    'stage_timings': {
+                        stage: round(seconds, 6) for stage, seconds in stages.timings.items()
+                    },
+                },
                 processing_time_seconds=round(processing_time, 3)
             )
             
             return analysis_results
             
+        except ContentAnalysisError:
+            raise
         except Exception as e:
             # If analysis fails, return error information
             processing_time = time.time() - start_time
             raise ContentAnalysisError(f"Content analysis failed: {str(e)}", processing_time)
     
+    def analyze_batch(self, documents: Iterable[BatchDocument], purpose: str = "auto",
+                      target_audience: str = "general", ordered: bool = True,
+                      chunksize: int = 4, max_workers: Optional[int] = None) -> BatchAnalysis:
+        """Analyze many documents across a process pool.
+        
+        ``documents`` may mix content strings and ``os.PathLike`` file paths.
+        Iterate the returned ``BatchAnalysis`` with ``async for`` to receive
+        ``BatchItemResult`` objects as chunks complete; its ``stats`` report
+        throughput. Each worker process builds its analyzer once.
+        """
+        entries = to_batch_entries(documents)
+        
+        if self.executor_mode == 'inline':
+            async def submit_inline(chunk: List[BatchEntry]) -> List[BatchItemResult]:
+                return _analyze_chunk(self, chunk, purpose, target_audience)
+            return BatchAnalysis(entries, submit_inline, chunksize, 1, ordered)
+        
+        on_finish = None
+        if self.executor_mode == 'process' and max_workers is None:
+            executor = None
+            workers = self.max_workers
+        else:
+            # Batches always fan out to processes; this pool lives as long as the batch
+            workers = max_workers or self.max_workers
+            executor = self._new_process_pool(workers)
+            on_finish = partial(executor.shutdown, wait=False, cancel_futures=True)
+        workers = workers or os.cpu_count() or 1
+        
+        async def submit(chunk: List[BatchEntry]) -> List[BatchItemResult]:
+            loop = asyncio.get_running_loop()
+            if executor is not None:
+                return await loop.run_in_executor(
+                    executor, _analyze_chunk_in_worker, chunk, purpose, target_audience
+                )
+            # On the analyzer's own pool, counted so a timed out call does not kill this chunk
+            pool = self._enter_executor()
+            try:
+                return await loop.run_in_executor(
+                    pool, _analyze_chunk_in_worker, chunk, purpose, target_audience
+                )
+            finally:
+                self._leave_executor(pool)
+        
+        # Two chunks per worker keep every process busy while results are consumed
+        return BatchAnalysis(entries, submit, chunksize, workers * 2, ordered, on_finish)
+    
+    def _get_executor(self) -> Executor:
+        """The worker pool for the configured mode, created on first use."""
+        if self.executor_mode == 'thread':
+            return _shared_thread_pool(self.max_workers)
+        with self._executor_lock:
+            return self._get_process_pool()
+    
+    def _get_process_pool(self) -> Executor:
+        # Called with _executor_lock held
+        if self._executor is None:
+            self._executor = self._new_process_pool(self.max_workers)
+        return self._executor
+    
+    def _new_process_pool(self, max_workers: Optional[int]) -> ProcessPoolExecutor:
+        """A process pool whose workers mirror this analyzer's section cache size."""
+        return ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker,
+            initargs=(self.section_cache.max_entries,)
+        )
+    
+    def _enter_executor(self) -> Executor:
+        """The pool for a new call, counting the call against a process pool."""
+        if self.executor_mode == 'thread':
+            return _shared_thread_pool(self.max_workers)
+        with self._executor_lock:
+            pool = self._get_process_pool()
+            self._pool_calls[pool] = self._pool_calls.get(pool, 0) + 1
+            return pool
+    
+    def _leave_executor(self, pool: Executor) -> None:
+        """Finish a call; the last call on a retired pool terminates it."""
+        if self.executor_mode == 'thread':
+            return
+        with self._executor_lock:
+            remaining = self._pool_calls.get(pool, 1) - 1
+            if remaining > 0:
+                self._pool_calls[pool] = remaining
+                return
+            self._pool_calls.pop(pool, None)
+            if pool not in self._retired_pools:
+                return
+            self._retired_pools.discard(pool)
+        _terminate_process_pool(pool)
+    
+    def _stop_worker(self, pool: Executor, cancel_event: Optional[threading.Event]) -> None:
+        """Stop the work behind a timed out or cancelled call."""
+        if cancel_event is not None:
+            cancel_event.set()
+        elif self.executor_mode == 'process':
+            self._retire_pool(pool)
+    
+    def _retire_pool(self, pool: Executor) -> None:
+        """Stop handing out ``pool``; it is terminated when its last call leaves."""
+        with self._executor_lock:
+            if self._executor is pool:
+                self._executor = None
+            self._retired_pools.add(pool)
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Release the process pool; the shared thread pool lives as long as the process."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+    
     async def analyze_file(self, file_path: str, purpose: str = "auto", 
-                          target_audience: str = "general") -> AnalysisResults:
+                          target_audience: str = "general", timeout: Optional[float] = None) -> AnalysisResults:
         """Analyze content from a file."""
         try:
             # Parse file
@@ -79,8 +398,10 @@ class ContentAnalyzer:
             content = parsed_content['content']
             
             # Perform analysis
-            return await self.analyze_content(content, purpose, target_audience, file_path)
+            return await self.analyze_content(content, purpose, target_audience, file_path, timeout)
             
+        except ContentAnalysisTimeout:
+            raise
         except Exception as e:
             raise ContentAnalysisError(f"File analysis failed: {str(e)}")
     
@@ -173,8 +494,14 @@ class ContentAnalyzer:
                 ]
             },
             'html': {
-                'supported': False,
-                'note': 'HTML support planned for future versions'
+                'supported': True,
+                'features': [
+                    'Parsed from the lxml tree (no markdown conversion)',
+                    'Headings, paragraphs, lists, blockquotes and <pre> code blocks',
+                    'Links and images',
+                    'Title and <meta> metadata',
+                    'Scripts, styles and page chrome skipped'
+                ]
             },
             'docx': {
                 'supported': False,
@@ -187,6 +514,7 @@ class ContentAnalyzer:
         return {
             'content_parsing': {
                 'markdown_parsing': True,
+                'html_parsing': True,
                 'metadata_extraction': True,
                 'structure_analysis': True,
                 'link_extraction': True,
@@ -216,10 +544,24 @@ class ContentAnalyzer:
             },
             'performance': {
                 'async_processing': True,
+                'executor_mode': self.executor_mode,
+                'timeouts': True,
                 'large_content_support': True,
-                'processing_time_tracking': True
+                'processing_time_tracking': True,
+                'batch_processing': True,
+                'result_cache': self.cache is not None,
+                'incremental_sections': True,
+                'stage_timings': True
             }
         }
+    
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Get result cache hit/miss statistics (None when caching is off)."""
+        return self.cache.get_stats() if self.cache is not None else None
+    
+    def get_stage_latency(self, stage: Optional[str] = None) -> Dict[str, Any]:
+        """Get the process-wide stage latency histograms, by stage and size bucket."""
+        return get_stage_latency(stage)
 
 
 class ContentAnalysisError(Exception):
@@ -229,3 +571,80 @@ class ContentAnalysisError(Exception):
         self.message = message
         self.processing_time = processing_time
         super().__init__(self.message)
+    
+    def __reduce__(self):
+        # Keep processing_time when the error crosses a process boundary
+        return (self.__class__, (self.message, self.processing_time))
+
+
+class ContentAnalysisTimeout(ContentAnalysisError):
+    """Exception raised when content analysis exceeds its timeout."""
+
+
+def _check_cancelled(deadline: Optional[float], cancel_event: Optional[threading.Event],
+                     start_time: float) -> None:
+    """Stop the pipeline between stages once it timed out or was cancelled."""
+    if cancel_event is not None and cancel_event.is_set():
+        raise ContentAnalysisError("Content analysis cancelled", time.time() - start_time)
+    if deadline is not None and time.time() > deadline:
+        raise ContentAnalysisTimeout("Content analysis timed out", time.time() - start_time)
+
+
+# Per-process analyzer used by process pool workers
+_worker_analyzer: Optional[ContentAnalyzer] = None
+
+
+def _init_worker(section_cache_entries: Optional[int] = None) -> None:
+    """Process pool initializer: build the analyzer once per worker."""
+    global _worker_analyzer
+    section_cache = SectionCache(section_cache_entries) if section_cache_entries is not None else None
+    _worker_analyzer = ContentAnalyzer(executor_mode='inline', section_cache=section_cache)
+
+
+def _terminate_process_pool(pool: Executor) -> None:
+    """Kill a process pool's workers, including ones busy with a call."""
+    terminate_workers = getattr(pool, 'terminate_workers', None)
+    if terminate_workers is not None:
+        terminate_workers()
+        return
+    
+    processes = list((getattr(pool, '_processes', None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+
+def _analyze_chunk(analyzer: ContentAnalyzer, chunk: List[BatchEntry], purpose: str,
+                   target_audience: str) -> List[BatchItemResult]:
+    """Analyze one chunk of a batch, capturing per-document errors."""
+    items = []
+    for index, content, file_path in chunk:
+        try:
+            if file_path is not None:
+                content = analyzer.parser.parse_file(file_path)['content']
+            result = analyzer.analyze_content_sync(content, purpose, target_audience, file_path)
+            items.append(BatchItemResult(index=index, content_id=file_path, result=result))
+        except ContentAnalysisError as e:
+            items.append(BatchItemResult(index=index, content_id=file_path, error=e))
+        except Exception as e:
+            error = ContentAnalysisError(f"File analysis failed: {str(e)}")
+            items.append(BatchItemResult(index=index, content_id=file_path, error=error))
+    return items
+
+
+def _analyze_chunk_in_worker(chunk: List[BatchEntry], purpose: str,
+                             target_audience: str) -> List[BatchItemResult]:
+    """Analyze a batch chunk inside a process pool worker."""
+    if _worker_analyzer is None:
+        _init_worker()
+    return _analyze_chunk(_worker_analyzer, chunk, purpose, target_audience)
+
+
+def _analyze_in_worker(content: str, purpose: str, target_audience: str,
+                       content_id: Optional[str], deadline: Optional[float],
+                       content_format: str = "markdown") -> AnalysisResults:
+    """Run the pipeline inside a process pool worker."""
+    if _worker_analyzer is None:
+        _init_worker()
+    return _worker_analyzer.analyze_content_sync(content, purpose, target_audience, content_id, deadline,
+                                                 content_format=content_format)
@@ -0,0 +1,172 @@
+"""
+Batch analysis: fan documents out to workers and stream results back.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .models import AnalysisResults
+from .telemetry import stage_latency
+
+
+# (index, content, file_path) - exactly one of content / file_path is set
+BatchEntry = Tuple[int, Optional[str], Optional[str]]
+BatchDocument = Union[str, os.PathLike]
+
+
+@dataclass
+class BatchItemResult:
+    """Outcome of analyzing one document of a batch."""
+    index: int
+    content_id: Optional[str]
+    result: Optional[AnalysisResults] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BatchStats:
+    """Throughput statistics for a batch run."""
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    total_words: int = 0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def elapsed_seconds(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return end - self.started_at
+
+    @property
+    def documents_per_second(self) -> float:
+        elapsed = self.elapsed_seconds
+        return (self.completed + self.failed) / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def words_per_second(self) -> float:
+        elapsed = self.elapsed_seconds
+        return self.total_words / elapsed if elapsed > 0 else 0.0
+
+    def record(self, item: BatchItemResult) -> None:
+        if item.ok:
+            self.completed += 1
+            self.total_words += item.result.content_structure.total_words
+        else:
+            self.failed += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'total_words': self.total_words,
+            'elapsed_seconds': round(self.elapsed_seconds, 3),
+            'documents_per_second': round(self.documents_per_second, 2),
+            'words_per_second': round(self.words_per_second, 1),
+        }
+
+
+def to_batch_entries(documents: Iterable[BatchDocument]) -> Iterable[BatchEntry]:
+    """Tag each document as inline content (str) or a file path (PathLike)."""
+    for index, document in enumerate(documents):
+        if isinstance(document, os.PathLike):
+            yield index, None, os.fspath(document)
+        else:
+            yield index, document, None
+
+
+class BatchAnalysis:
+    """Async iterator over the results of a batch run.
+
+    Documents are submitted in chunks with a bounded number of chunks in
+    flight, so large corpora are never materialized up front. Results are
+    yielded in input order when ``ordered`` is true, otherwise as soon as
+    their chunk completes. ``stats`` reports throughput while and after the
+    batch runs.
+    """
+
+    def __init__(self, entries: Iterable[BatchEntry],
+                 submit: Callable[[List[BatchEntry]], Awaitable[List[BatchItemResult]]],
+                 chunksize: int, max_in_flight: int, ordered: bool = True,
+                 on_finish: Optional[Callable[[], None]] = None):
+        if chunksize < 1:
+            raise ValueError("chunksize must be at least 1")
+        self._entries = iter(entries)
+        self._submit = submit
+        self._chunksize = chunksize
+        self._max_in_flight = max(1, max_in_flight)
+        self._on_finish = on_finish
+        self.ordered = ordered
+        self.stats = BatchStats()
+
+    def __aiter__(self) -> AsyncIterator[BatchItemResult]:
+        return self._run()
+
+    async def collect(self) -> List[BatchItemResult]:
+        """Run the whole batch and return all items."""
+        return [item async for item in self]
+
+    def _next_chunk(self) -> List[BatchEntry]:
+        return list(islice(self._entries, self._chunksize))
+
+    async def _run(self) -> AsyncIterator[BatchItemResult]:
+        self.stats.started_at = time.perf_counter()
+        pending: Dict[asyncio.Future, List[BatchEntry]] = {}
+        buffered: Dict[int, BatchItemResult] = {}
+        next_index = 0
+        exhausted = False
+
+        try:
+            while True:
+                while not exhausted and len(pending) < self._max_in_flight:
+                    chunk = self._next_chunk()
+                    if not chunk:
+                        exhausted = True
+                        break
+                    self.stats.submitted += len(chunk)
+                    pending[asyncio.ensure_future(self._submit(chunk))] = chunk
+
+                if not pending:
+                    break
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    chunk = pending.pop(future)
+                    try:
+                        items = future.result()
+                    except Exception as e:
+                        # The worker itself failed; report every document of the chunk
+                        items = [
+                            BatchItemResult(index=index, content_id=path, error=e)
+                            for index, _, path in chunk
+                        ]
+
+                    for item in items:
+                        self.stats.record(item)
+                        if item.ok:
+                            stage_latency.observe_results(item.result)
+                        if self.ordered:
+                            buffered[item.index] = item
+                        else:
+                            yield item
+
+                while next_index in buffered:
+                    yield buffered.pop(next_index)
+                    next_index += 1
+        finally:
+            for future in pending:
+                future.cancel()
+            self.stats.finished_at = time.perf_counter()
+            if self._on_finish is not None:
+                self._on_finish()
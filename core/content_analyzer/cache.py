@@ -0,0 +1,161 @@
+"""
+Two-tier cache for analysis results keyed by content hash and parameters.
+
+The first tier is an in-process LRU with size and TTL eviction; the optional
+second tier is a MongoDB collection with a TTL index shared by every replica.
+The index is created on first use of the collection. Entries are stored and
+handed out as deep copies, so callers may modify the results they get.
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, UTC
+from typing import Any, Dict, Optional, Tuple
+
+from .models import AnalysisResults
+
+logger = logging.getLogger(__name__)
+
+# Bump when analyzer changes alter results so stale cache entries are ignored
+ANALYSIS_VERSION = "4"
+
+
+def normalize_content(content: str) -> str:
+    """Normalize content so whitespace-only edits hit the same cache entry."""
+    lines = content.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    return '\n'.join(line.rstrip() for line in lines).strip()
+
+
+def make_cache_key(content: str, purpose: str, target_audience: str,
+                   content_format: str = "markdown") -> str:
+    """Hash normalized content together with the analysis parameters."""
+    digest = hashlib.sha256()
+    parts = (ANALYSIS_VERSION, purpose, target_audience.lower())
+    # Markdown keys do not name the format, so existing entries stay valid
+    if content_format != "markdown":
+        parts += (content_format,)
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    digest.update(normalize_content(content).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """LRU + TTL cache in front of ``ContentAnalyzer.analyze_content``."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600,
+                 db: Optional[Any] = None, collection_name: str = "analysis_cache"):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.collection = db[collection_name] if db is not None else None
+        self._indexed = False
+        self._entries: "OrderedDict[str, Tuple[float, AnalysisResults]]" = OrderedDict()
+        self.memory_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def ensure_indexes(self) -> None:
+        """Create the TTL index that expires shared entries, once."""
+        if self.collection is None or self._indexed:
+            return
+        await self.collection.create_index(
+            "created_at", expireAfterSeconds=int(self.ttl_seconds)
+        )
+        self._indexed = True
+
+    async def get(self, key: str) -> Optional[AnalysisResults]:
+        """Look a key up in memory, then in the shared collection."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, results = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return results.model_copy(deep=True)
+            del self._entries[key]
+
+        results = await self._get_shared(key)
+        if results is not None:
+            self.shared_hits += 1
+            self._put_local(key, results.model_copy(deep=True))
+            return results
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, results: AnalysisResults) -> None:
+        """Store results in both tiers."""
+        self._put_local(key, results.model_copy(deep=True))
+
+        if self.collection is None:
+            return
+        try:
+            await self.ensure_indexes()
+            await self.collection.replace_one(
+                {"_id": key},
+                {
+                    "_id": key,
+                    "results": results.model_dump(mode="json"),
+                    "created_at": datetime.now(UTC),
+                },
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"Failed to write analysis cache entry {key}: {e}")
+
+    def clear(self) -> None:
+        """Drop every in-process entry."""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss statistics."""
+        hits = self.memory_hits + self.shared_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "shared": self.collection is not None,
+        }
+
+    def _put_local(self, key: str, results: AnalysisResults) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def _get_shared(self, key: str) -> Optional[AnalysisResults]:
+        if self.collection is None:
+            return None
+        try:
+            await self.ensure_indexes()
+            document = await self.collection.find_one({"_id": key})
+        except Exception as e:
+            logger.warning(f"Failed to read analysis cache entry {key}: {e}")
+            return None
+        if not document:
+            return None
+
+        # MongoDB's TTL monitor runs periodically, so check the age as well
+        created_at = document.get("created_at")
+        if created_at is not None:
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=UTC)
+            if datetime.now(UTC) - created_at > timedelta(seconds=self.ttl_seconds):
+                return None
+
+        try:
+            return AnalysisResults.model_validate(document["results"])
+        except Exception as e:
+            logger.warning(f"Discarding unreadable analysis cache entry {key}: {e}")
+            return None
@@ -0,0 +1,132 @@
+"""
+Declarative feature graphs: every derived value names the features (or
+inputs) it depends on and is computed lazily, at most once per document.
+"""
+
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+
+class Feature(NamedTuple):
+    """A named value computed as ``compute(*dependency_values)``."""
+    name: str
+    compute: Callable[..., Any]
+    depends: Tuple[str, ...]
+
+
+class FeatureGraph:
+    """Registry of features and the features or inputs they depend on."""
+
+    def __init__(self):
+        self.features: Dict[str, Feature] = {}
+
+    def add(self, name: str, compute: Callable[..., Any], depends: Iterable[str] = ()) -> None:
+        """Register a feature; dependencies may be registered later or be inputs."""
+        if name in self.features:
+            raise ValueError(f"Feature already registered: {name}")
+        self.features[name] = Feature(name, compute, tuple(depends))
+
+    def add_model(self, name: str, model: Callable[..., Any],
+                  fields: Union[Iterable[str], Mapping[str, str]]) -> None:
+        """Register a feature that builds ``model`` from other features.
+
+        ``fields`` lists features named after the model's fields, or maps
+        field names to the features that provide them.
+        """
+        if not isinstance(fields, Mapping):
+            fields = {field: field for field in fields}
+        names = tuple(fields)
+
+        def build(*values: Any) -> Any:
+            return model(**dict(zip(names, values)))
+
+        self.add(name, build, fields.values())
+
+    def evaluate(self, inputs: Dict[str, Any]) -> 'FeatureValues':
+        """Start a lazy evaluation of the graph for one document."""
+        return FeatureValues(self, inputs)
+
+    def schedule(self, targets: Iterable[str], known: Iterable[str] = ()) -> List[List[str]]:
+        """Group the features needed for ``targets`` into dependency levels.
+
+        Features in the same level never depend on each other, so a level can
+        be computed concurrently once the previous levels are done. Names in
+        ``known`` (inputs, already computed features) are not scheduled.
+        """
+        known = set(known)
+        depth: Dict[str, int] = {}
+        visiting = set()
+
+        def visit(name: str) -> int:
+            if name in known:
+                return -1
+            if name in depth:
+                return depth[name]
+            feature = self.features.get(name)
+            if feature is None:
+                raise KeyError(f"Unknown feature or missing input: {name}")
+            if name in visiting:
+                raise ValueError(f"Feature dependency cycle at: {name}")
+            visiting.add(name)
+            level = 1 + max((visit(dependency) for dependency in feature.depends), default=-1)
+            visiting.discard(name)
+            depth[name] = level
+            return level
+
+        for target in targets:
+            visit(target)
+
+        levels: List[List[str]] = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+        for name, level in depth.items():
+            levels[level].append(name)
+        return levels
+
+
+class FeatureValues:
+    """Feature values of one document, computed on demand and memoized.
+
+    ``timings`` holds how long each computed feature took, in seconds.
+    """
+
+    def __init__(self, graph: FeatureGraph, inputs: Dict[str, Any]):
+        self.graph = graph
+        self.values: Dict[str, Any] = dict(inputs)
+        self.timings: Dict[str, float] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self.values:
+            self.compute([name])
+        return self.values[name]
+
+    def compute(self, targets: Iterable[str], executor: Optional[Executor] = None,
+                checkpoint: Optional[Callable[[], None]] = None) -> Dict[str, Any]:
+        """Compute ``targets`` and everything they depend on.
+
+        With an ``executor`` the independent features of each level run
+        concurrently. ``checkpoint`` is called before each feature (before
+        each level when running concurrently), e.g. to stop a cancelled run.
+        """
+        targets = list(targets)
+        for level in self.graph.schedule(targets, self.values):
+            if executor is not None and len(level) > 1:
+                if checkpoint is not None:
+                    checkpoint()
+                futures = [(name, executor.submit(self._run, name)) for name in level]
+                for name, future in futures:
+                    self.values[name] = future.result()
+                continue
+
+            for name in level:
+                if checkpoint is not None:
+                    checkpoint()
+                self.values[name] = self._run(name)
+
+        return {name: self.values[name] for name in targets}
+
+    def _run(self, name: str) -> Any:
+        feature = self.graph.features[name]
+        start = time.perf_counter()
+        value = feature.compute(*(self.values[dependency] for dependency in feature.depends))
+        self.timings[name] = time.perf_counter() - start
+        return value
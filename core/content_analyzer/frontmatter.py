@@ -0,0 +1,142 @@
+"""
+Frontmatter splitting and loading (YAML, TOML or JSON).
+
+The frontmatter is split off the body in one scan of its lines. Parsed
+metadata is cached by a hash of the frontmatter text, so archives where many
+posts share the same (often large) frontmatter parse it once.
+"""
+
+import copy
+import hashlib
+import json
+import threading
+import tomllib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import yaml
+
+
+# libyaml's C loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Opening line (stripped) -> (format, closing line)
+FRONTMATTER_FENCES = {
+    '---': ('yaml', '---'),
+    '+++': ('toml', '+++'),
+    '{': ('json', '}'),
+}
+
+_WHITESPACE = ' \t\r\n\f\v'
+
+
+def frontmatter_format(line: str) -> Optional[Tuple[str, str]]:
+    """Return ``(format, closing line)`` if ``line`` opens frontmatter."""
+    return FRONTMATTER_FENCES.get(line.rstrip())
+
+
+def split_frontmatter(content: str) -> Tuple[Optional[str], str, str]:
+    """Split leading frontmatter off the content in a single scan.
+
+    Returns ``(format, frontmatter text, body)``; ``format`` is ``None`` (and
+    the body is the whole content) when there is no complete frontmatter.
+    The closing line must end with a line break, and the blank lines after it
+    are not part of the body. JSON frontmatter keeps its braces.
+    """
+    first_end = content.find('\n')
+    if first_end < 0:
+        return None, '', content
+    fence = frontmatter_format(content[:first_end])
+    if fence is None:
+        return None, '', content
+    format_name, closing = fence
+
+    line_start = first_end + 1
+    while True:
+        line_end = content.find('\n', line_start)
+        if line_end < 0:
+            return None, '', content
+        if content[line_start:line_end].rstrip() == closing:
+            break
+        line_start = line_end + 1
+
+    if format_name == 'json':
+        text = content[:line_end]
+    else:
+        text = content[first_end + 1:line_start]
+
+    # Drop the blank lines after the closing line, up to the last line break
+    body_start = line_end + 1
+    position = body_start
+    while position < len(content) and content[position] in _WHITESPACE:
+        if content[position] == '\n':
+            body_start = position + 1
+        position += 1
+
+    return format_name, text.rstrip('\n'), content[body_start:]
+
+
+def _parse(text: str, format_name: str) -> Dict[str, Any]:
+    """Parse frontmatter text; invalid frontmatter yields no metadata."""
+    try:
+        if format_name == 'toml':
+            metadata = tomllib.loads(text)
+        elif format_name == 'json':
+            metadata = json.loads(text)
+        else:
+            metadata = yaml.load(text, Loader=YAML_LOADER)
+    except (yaml.YAMLError, tomllib.TOMLDecodeError, ValueError):
+        return {}
+    return metadata or {}
+
+
+class MetadataCache:
+    """Thread-safe LRU of parsed frontmatter keyed by a hash of its text."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, text: str, format_name: str = 'yaml') -> Dict[str, Any]:
+        """Parse frontmatter text, reusing the result for identical text.
+
+        Callers get their own copy, so mutating it does not alter the cache.
+        """
+        key = hashlib.blake2b(f'{format_name}\0{text}'.encode('utf-8'), digest_size=16).digest()
+        with self._lock:
+            metadata = self._entries.get(key)
+            if metadata is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(metadata)
+            self.misses += 1
+
+        metadata = _parse(text, format_name)
+        with self._lock:
+            self._entries[key] = metadata
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return copy.deepcopy(metadata)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+            }
+
+
+# Shared by every parser in the process
+metadata_cache = MetadataCache()
@@ -0,0 +1,243 @@
+"""
+HTML input: build the parser's token stream straight from an lxml tree.
+
+One walk over the tree yields the same block and inline ``Token`` stream
+``ContentParser.lex`` produces for markdown, so HTML pages are analyzed
+without converting them to markdown first. The analyzed text is the text of
+the blocks, each followed by a blank line; token offsets point into it.
+"""
+
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import lxml.html
+from lxml import etree
+
+from .markup import Token
+
+
+HEADING_TAGS = {'h1': 1, 'h2': 2, 'h3': 3, 'h4': 4, 'h5': 5, 'h6': 6}
+
+# Elements whose whole content is one block (nested blocks become lines of it)
+CAPTURING_TAGS = {'pre': 'code_block', 'blockquote': 'blockquote', **{tag: 'heading' for tag in HEADING_TAGS}}
+
+# Elements that are blocks of their own kind
+BLOCK_TAGS = {'p': 'paragraph', 'li': 'list_item', 'dt': 'list_item', 'dd': 'list_item'}
+
+# Elements that end the current block; text directly inside them forms paragraphs
+CONTAINER_TAGS = frozenset((
+    'html', 'body', 'div', 'section', 'article', 'main', 'header', 'address', 'hgroup',
+    'ul', 'ol', 'dl', 'menu', 'table', 'caption', 'thead', 'tbody', 'tfoot', 'tr', 'td', 'th',
+    'figure', 'figcaption', 'details', 'summary', 'fieldset', 'hr', 'center',
+))
+
+# Elements that are not article content (page chrome, scripts, embedded media)
+SKIPPED_TAGS = frozenset((
+    'script', 'style', 'noscript', 'template', 'svg', 'math', 'iframe', 'object', 'embed',
+    'canvas', 'nav', 'aside', 'footer', 'form', 'button', 'select', 'textarea',
+))
+
+# <meta name=...> (or Open Graph property) -> metadata key
+META_FIELDS = {
+    'description': 'description',
+    'og:description': 'description',
+    'author': 'author',
+    'article:author': 'author',
+    'keywords': 'keywords',
+    'og:title': 'title',
+    'article:published_time': 'date',
+}
+
+_WHITESPACE = re.compile(r'\s+')
+_CODE_LANGUAGE = re.compile(r'\b(?:language|lang)-([\w+#.-]+)')
+
+
+class HtmlDocument(NamedTuple):
+    """Text, token stream and ``<head>`` metadata of an HTML page."""
+    text: str
+    tokens: List[Token]
+    metadata: Dict[str, Any]
+
+
+class _HtmlLexer:
+    """Collects the text of the current block while walking the tree."""
+
+    def __init__(self):
+        self.pieces: List[str] = []
+        self.tokens: List[Token] = []
+        self.metadata: Dict[str, Any] = {}
+        self.offset = 0
+        # Current block: its text pieces, length and pending inline tokens
+        self.parts: List[str] = []
+        self.length = 0
+        self.inline: List[Tuple[str, int, int, str, str]] = []
+        # Kinds of the open blocks; text outside any block is a paragraph
+        self.kinds: List[str] = ['paragraph']
+        self.capture: Optional[etree._Element] = None
+        self.capture_kind = ''
+        self.level = 0
+        self.language: Optional[str] = None
+        # Open links: (element, index of their first part, start in the block, href)
+        self.links: List[Tuple[etree._Element, int, int, str]] = []
+
+    # Text of the current block
+
+    def add_text(self, text: Optional[str]) -> None:
+        if not text:
+            return
+        if self.capture_kind != 'code_block':
+            text = _WHITESPACE.sub(' ', text)
+            if not self.parts or self.parts[-1][-1] in ' \n':
+                text = text.lstrip(' ')
+                if not text:
+                    return
+        self.parts.append(text)
+        self.length += len(text)
+
+    def break_line(self) -> None:
+        """Start a new line of the current block (``<br>``, nested blocks of a capture)."""
+        if not self.parts:
+            return
+        if self.parts[-1].endswith(' '):
+            stripped = self.parts[-1].rstrip(' ')
+            self.length -= len(self.parts[-1]) - len(stripped)
+            self.parts[-1] = stripped
+        if not self.parts[-1].endswith('\n'):
+            self.parts.append('\n')
+            self.length += 1
+
+    def flush(self, kind: str) -> None:
+        """Emit the current block as a token of ``kind``, followed by its links and images."""
+        text = ''.join(self.parts)
+        # Only code keeps leading whitespace; a line break right after <pre> is not part of it
+        shift = 1 if kind == 'code_block' and text.startswith('\n') else 0
+        text = text[shift:].rstrip()
+        start = self.offset
+
+        if text:
+            self.tokens.append(Token(kind, start, start + len(text), text,
+                                     level=self.level, language=self.language))
+            self.pieces.append(text)
+            self.pieces.append('\n\n')
+            self.offset += len(text) + 2
+        end = start + len(text)
+        for inline_kind, inline_start, inline_end, inline_text, url in self.inline:
+            self.tokens.append(Token(inline_kind, min(start + inline_start - shift, end),
+                                     min(start + inline_end - shift, end), inline_text, url=url))
+
+        self.parts = []
+        self.length = 0
+        self.inline = []
+
+    # Tree events
+
+    def start(self, element: etree._Element) -> bool:
+        """Handle an opening tag; returns False when its subtree is skipped."""
+        tag = element.tag
+        if tag in SKIPPED_TAGS:
+            return False
+        if tag == 'head':
+            self.read_head(element)
+            return False
+
+        if self.capture is not None:
+            if tag in BLOCK_TAGS or tag in CONTAINER_TAGS or tag in CAPTURING_TAGS:
+                self.break_line()
+        elif tag in CAPTURING_TAGS:
+            self.flush(self.kinds[-1])
+            self.capture, self.capture_kind = element, CAPTURING_TAGS[tag]
+            self.level = HEADING_TAGS.get(tag, 0)
+            self.language = _code_language(element) if tag == 'pre' else None
+        elif tag in BLOCK_TAGS or tag in CONTAINER_TAGS:
+            self.flush(self.kinds[-1])
+            self.kinds.append(BLOCK_TAGS.get(tag, 'paragraph'))
+
+        if tag == 'br':
+            self.break_line()
+        elif tag == 'a' and element.get('href'):
+            self.links.append((element, len(self.parts), self.length, element.get('href').strip()))
+        elif tag == 'img' and element.get('src'):
+            alt = _WHITESPACE.sub(' ', element.get('alt') or '').strip()
+            self.inline.append(('image', self.length, self.length, alt, element.get('src').strip()))
+
+        self.add_text(element.text)
+        return True
+
+    def end(self, element: etree._Element) -> None:
+        tag = element.tag
+        if self.links and self.links[-1][0] is element:
+            _, first_part, link_start, url = self.links.pop()
+            text = ''.join(self.parts[first_part:]).strip()
+            if text and url:
+                self.inline.append(('link', link_start, self.length, text, url))
+
+        if element is self.capture:
+            self.flush(self.capture_kind)
+            self.capture, self.capture_kind = None, ''
+            self.level, self.language = 0, None
+        elif self.capture is not None:
+            if tag in BLOCK_TAGS or tag in CONTAINER_TAGS or tag in CAPTURING_TAGS:
+                self.break_line()
+        elif tag in BLOCK_TAGS or tag in CONTAINER_TAGS:
+            self.flush(self.kinds.pop())
+
+        self.add_text(element.tail)
+
+    def read_head(self, head: etree._Element) -> None:
+        """Read the title and ``<meta>`` fields of ``<head>``."""
+        for element in head.iter('title', 'meta'):
+            if element.tag == 'title':
+                title = _WHITESPACE.sub(' ', element.text_content()).strip()
+                if title:
+                    self.metadata['title'] = title
+                continue
+            key = META_FIELDS.get((element.get('name') or element.get('property') or '').lower())
+            value = _WHITESPACE.sub(' ', element.get('content') or '').strip()
+            if key and value:
+                if key == 'keywords':
+                    value = [keyword.strip() for keyword in value.split(',') if keyword.strip()]
+                self.metadata.setdefault(key, value)
+
+
+def _code_language(pre: etree._Element) -> Optional[str]:
+    """Language named by a ``language-*``/``lang-*`` class on a ``<pre>`` or its ``<code>``."""
+    for element in (pre, *pre.iterchildren('code')):
+        match = _CODE_LANGUAGE.search(element.get('class') or '')
+        if match:
+            return match.group(1)
+    return None
+
+
+def lex_html(source: str) -> HtmlDocument:
+    """Lex an HTML page into its text and token stream in one walk of the tree.
+
+    Headings, paragraphs, list items, ``<pre>`` code blocks and blockquotes
+    become block tokens, ``<a href>`` with text and ``<img src>`` become link
+    and image tokens. Scripts, styles, navigation and other page chrome are
+    skipped; ``<head>`` only contributes metadata (title, description,
+    author, keywords, language).
+    """
+    try:
+        root = lxml.html.document_fromstring(source)
+    except (etree.ParserError, ValueError):
+        raise ValueError("Content cannot be empty")
+
+    lexer = _HtmlLexer()
+    if root.get('lang'):
+        lexer.metadata['language'] = root.get('lang')
+
+    walker = etree.iterwalk(root, events=('start', 'end', 'comment', 'pi'))
+    for event, element in walker:
+        if event in ('comment', 'pi'):
+            # Only the text after a comment or processing instruction is content
+            lexer.add_text(element.tail)
+        elif event == 'start':
+            if not lexer.start(element):
+                walker.skip_subtree()
+        else:
+            lexer.end(element)
+
+    if lexer.capture is not None:
+        lexer.flush(lexer.capture_kind)
+    lexer.flush(lexer.kinds[-1])
+    return HtmlDocument(''.join(lexer.pieces), lexer.tokens, lexer.metadata)
@@ -0,0 +1,327 @@
+"""
+Indicator lexicons and a shared multi-pattern matcher for content analysis.
+
+Every indicator list used by the analyzers lives here and is compiled into a
+single Aho-Corasick automaton over word tokens, so one scan of a document
+yields word-boundary-correct counts for all categories.
+"""
+
+import re
+from collections import Counter, deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+from .tokenizer import TokenizedDocument
+
+
+# Tone indicators (StyleAnalyzer)
+FORMAL_INDICATORS = [
+    'furthermore', 'moreover', 'consequently', 'therefore', 'thus', 'hence',
+    'accordingly', 'subsequently', 'nevertheless', 'nonetheless', 'notwithstanding',
+    'in addition', 'in conclusion', 'in summary', 'as a result', 'for this reason'
+]
+
+CASUAL_INDICATORS = [
+    'hey', 'wow', 'cool', 'awesome', 'amazing', 'incredible', 'fantastic',
+    'great', 'good', 'nice', 'sweet', 'perfect', 'excellent', 'brilliant',
+    'genius', 'smart', 'clever', 'savvy', 'pro', 'expert', 'guru', 'ninja',
+    'rockstar', 'wizard', 'master', 'champion', 'hero', 'legend', 'icon'
+]
+
+TECHNICAL_INDICATORS = [
+    'implementation', 'algorithm', 'optimization', 'framework', 'architecture',
+    'protocol', 'interface', 'database', 'api', 'sdk', 'library', 'module',
+    'function', 'class', 'method', 'variable', 'parameter', 'configuration'
+]
+
+# Quality indicators (QualityScorer)
+CLARITY_INDICATORS = {
+    'positive': [
+        'clear', 'concise', 'simple', 'straightforward', 'easy to understand',
+        'well-explained', 'logical', 'organized', 'structured', 'coherent'
+    ],
+    'negative': [
+        'confusing', 'unclear', 'vague', 'ambiguous', 'complex', 'complicated',
+        'difficult', 'hard to follow', 'unorganized', 'disjointed'
+    ]
+}
+
+COHERENCE_INDICATORS = {
+    'positive': [
+        'flow', 'transition', 'connection', 'link', 'follow', 'lead to',
+        'therefore', 'thus', 'consequently', 'as a result', 'because'
+    ],
+    'negative': [
+        'jump', 'disconnect', 'unrelated', 'random', 'out of place',
+        'doesn\'t follow', 'no connection', 'irrelevant'
+    ]
+}
+
+COMPLETENESS_INDICATORS = {
+    'positive': [
+        'complete', 'comprehensive', 'thorough', 'detailed', 'full',
+        'all aspects', 'everything', 'complete picture', 'whole story'
+    ],
+    'negative': [
+        'incomplete', 'missing', 'partial', 'inadequate', 'insufficient',
+        'lacks', 'doesn\'t cover', 'missing information', 'gaps'
+    ]
+}
+
+ACCURACY_INDICATORS = {
+    'positive': [
+        'accurate', 'correct', 'precise', 'exact', 'verified', 'confirmed',
+        'reliable', 'trustworthy', 'factual', 'evidence-based'
+    ],
+    'negative': [
+        'inaccurate', 'incorrect', 'wrong', 'false', 'misleading',
+        'unverified', 'unreliable', 'questionable', 'doubtful'
+    ]
+}
+
+ENGAGEMENT_INDICATORS = {
+    'positive': [
+        'interesting', 'engaging', 'captivating', 'fascinating', 'exciting',
+        'compelling', 'intriguing', 'thought-provoking', 'stimulating'
+    ],
+    'negative': [
+        'boring', 'dull', 'uninteresting', 'tedious', 'monotonous',
+        'repetitive', 'dry', 'lifeless', 'uninspiring'
+    ]
+}
+
+FLOW_INDICATORS = ['first', 'second', 'third', 'next', 'then', 'finally', 'lastly']
+TRANSITION_WORDS = ['however', 'moreover', 'furthermore', 'additionally', 'in addition']
+ESSENTIAL_ELEMENTS = ['introduction', 'conclusion', 'summary']
+INSTRUCTIONAL_ELEMENTS = ['example', 'explanation', 'step']
+CITATION_INDICATORS = ['according to', 'research shows', 'study', 'source', 'reference']
+HEDGING_WORDS = ['maybe', 'perhaps', 'possibly', 'might', 'could', 'seems', 'appears']
+INTERACTIVE_ELEMENTS = ['question', 'think about', 'consider', 'imagine', 'suppose']
+STORY_ELEMENTS = ['story', 'example', 'case study', 'scenario', 'situation']
+
+# Audience indicators (QuestionGenerator)
+AUDIENCE_INDICATORS = {
+    'beginners': [
+        'introduction', 'basics', 'fundamentals', 'getting started', 'first time',
+        'simple', 'easy', 'basic', 'overview', 'prerequisites'
+    ],
+    'intermediate': [
+        'advanced', 'intermediate', 'experienced', 'deep dive', 'detailed',
+        'implementation', 'practical', 'hands-on', 'real-world'
+    ],
+    'advanced': [
+        'expert', 'advanced', 'complex', 'sophisticated', 'optimization',
+        'architecture', 'design patterns', 'best practices', 'performance'
+    ],
+    'developers': [
+        'code', 'programming', 'development', 'implementation', 'api',
+        'framework', 'library', 'debugging', 'testing', 'deployment'
+    ],
+    'managers': [
+        'strategy', 'business', 'management', 'leadership', 'team',
+        'project', 'planning', 'budget', 'timeline', 'stakeholder'
+    ],
+    'students': [
+        'learning', 'education', 'study', 'academic', 'research',
+        'theory', 'concept', 'principle', 'analysis', 'evaluation'
+    ]
+}
+
+# Content type detection terms (QuestionGenerator); optional plurals are spelled out
+CONTENT_TYPE_INDICATORS = {
+    'tutorial': [
+        'step by step', 'how to', 'tutorial', 'guide', 'walkthrough',
+        'instructions', 'procedure', 'process', 'steps', 'follow'
+    ],
+    'review': [
+        'review', 'evaluation', 'assessment', 'analysis', 'comparison',
+        'pro and con', 'pros and con', 'pro and cons', 'pros and cons',
+        'advantage and disadvantage', 'advantages and disadvantage',
+        'advantage and disadvantages', 'advantages and disadvantages', 'rating'
+    ],
+    'technical': [
+        'technical', 'implementation', 'code', 'programming', 'development',
+        'architecture', 'design', 'algorithm', 'framework', 'api'
+    ],
+    'educational': [
+        'learn', 'education', 'teaching', 'learning', 'course', 'lesson',
+        'concept', 'principle', 'theory', 'understanding', 'knowledge'
+    ],
+    'entertainment': [
+        'fun', 'entertaining', 'story', 'anecdote', 'humor', 'joke',
+        'interesting', 'fascinating', 'amazing', 'incredible'
+    ]
+}
+
+
+def _build_lexicons() -> Dict[str, List[str]]:
+    """Collect every lexicon under a dotted category name."""
+    lexicons: Dict[str, List[str]] = {
+        'tone.formal': FORMAL_INDICATORS,
+        'tone.casual': CASUAL_INDICATORS,
+        'tone.technical': TECHNICAL_INDICATORS,
+        'coherence.flow': FLOW_INDICATORS,
+        'coherence.transition': TRANSITION_WORDS,
+        'completeness.essential': ESSENTIAL_ELEMENTS,
+        'completeness.instructional': INSTRUCTIONAL_ELEMENTS,
+        'accuracy.citation': CITATION_INDICATORS,
+        'accuracy.hedging': HEDGING_WORDS,
+        'engagement.interactive': INTERACTIVE_ELEMENTS,
+        'engagement.story': STORY_ELEMENTS,
+    }
+    for dimension, indicators in (
+        ('clarity', CLARITY_INDICATORS),
+        ('coherence', COHERENCE_INDICATORS),
+        ('completeness', COMPLETENESS_INDICATORS),
+        ('accuracy', ACCURACY_INDICATORS),
+        ('engagement', ENGAGEMENT_INDICATORS),
+    ):
+        for polarity, terms in indicators.items():
+            lexicons[f'{dimension}.{polarity}'] = terms
+    for audience, terms in AUDIENCE_INDICATORS.items():
+        lexicons[f'audience.{audience}'] = terms
+    for content_type, terms in CONTENT_TYPE_INDICATORS.items():
+        lexicons[f'content_type.{content_type}'] = terms
+    return lexicons
+
+
+LEXICONS = _build_lexicons()
+
+_TERM_WORD_PATTERN = re.compile(r'\w+')
+
+
+class LexiconMatches:
+    """Per-term occurrence counts for one document.
+
+    Counts are sparse (term id -> occurrences), so matches of separately
+    matched sections can be added together.
+    """
+
+    __slots__ = ('matcher', 'term_counts')
+
+    def __init__(self, matcher: 'LexiconMatcher', term_counts: Counter):
+        self.matcher = matcher
+        self.term_counts = term_counts
+
+    def count(self, category: str) -> int:
+        """Total occurrences of all terms in a category."""
+        counts = self.term_counts
+        return sum(counts[term_id] for term_id in self.matcher.categories[category])
+
+    def distinct(self, category: str) -> int:
+        """Number of distinct terms of a category present in the document."""
+        counts = self.term_counts
+        return sum(1 for term_id in self.matcher.categories[category] if counts[term_id])
+
+    def has(self, term: str) -> bool:
+        """Whether a term occurs in the document."""
+        term_id = self.matcher.term_ids.get(self.matcher.normalize(term))
+        return term_id is not None and self.term_counts[term_id] > 0
+
+
+class LexiconMatcher:
+    """Aho-Corasick automaton over word tokens covering many lexicons.
+
+    Terms are matched on whole words (``pro`` never matches ``process``) and
+    multi-word terms do not match across sentence boundaries.
+    """
+
+    def __init__(self, lexicons: Dict[str, Iterable[str]]):
+        self.term_ids: Dict[Tuple[str, ...], int] = {}
+        self.categories: Dict[str, Tuple[int, ...]] = {}
+
+        # Trie: one transition dict per state, outputs are term ids
+        self._goto: List[Dict[str, int]] = [{}]
+        self._outputs: List[Tuple[int, ...]] = [()]
+
+        for category, terms in lexicons.items():
+            ids = []
+            for term in terms:
+                words = self.normalize(term)
+                if not words:
+                    continue
+                term_id = self.term_ids.get(words)
+                if term_id is None:
+                    term_id = len(self.term_ids)
+                    self.term_ids[words] = term_id
+                    self._insert(words, term_id)
+                if term_id not in ids:
+                    ids.append(term_id)
+            self.categories[category] = tuple(ids)
+
+        self._fail = self._build_failure_links()
+
+    @staticmethod
+    def normalize(term: str) -> Tuple[str, ...]:
+        """Split a term into the lowercase word tokens it must match."""
+        return tuple(_TERM_WORD_PATTERN.findall(term.lower()))
+
+    def _insert(self, words: Tuple[str, ...], term_id: int) -> None:
+        state = 0
+        for word in words:
+            next_state = self._goto[state].get(word)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][word] = next_state
+                self._goto.append({})
+                self._outputs.append(())
+            state = next_state
+        self._outputs[state] += (term_id,)
+
+    def _build_failure_links(self) -> List[int]:
+        goto, outputs = self._goto, self._outputs
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and word not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(word, 0)
+                # Inherit the outputs of the longest proper suffix
+                outputs[next_state] += outputs[fail[next_state]]
+        return fail
+
+    def match(self, document: TokenizedDocument) -> LexiconMatches:
+        """Count every term occurrence in a single scan of the document's words."""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        counts = Counter()
+        text = document.text
+        sentence_ends = document.sentence_ends
+        sentence_index = 0
+        sentence_end = sentence_ends[0] if sentence_ends else len(text)
+        state = 0
+
+        for start, end in zip(document.word_starts, document.word_ends):
+            if start > sentence_end:
+                # New sentence: multi-word terms never span a terminator
+                while sentence_index + 1 < len(sentence_ends) and start > sentence_ends[sentence_index]:
+                    sentence_index += 1
+                sentence_end = sentence_ends[sentence_index]
+                state = 0
+
+            word = text[start:end].lower()
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for term_id in outputs[state]:
+                counts[term_id] += 1
+
+        return LexiconMatches(self, counts)
+
+
+@lru_cache(maxsize=None)
+def get_lexicon_matcher() -> LexiconMatcher:
+    """Return the process-wide matcher covering all analyzer lexicons."""
+    return LexiconMatcher(LEXICONS)
+
+
+def match_lexicons(document: TokenizedDocument) -> LexiconMatches:
+    """Match all lexicons against a document, memoized on the document."""
+    matches = document.derived.get('lexicon_matches')
+    if matches is None:
+        matches = get_lexicon_matcher().match(document)
+        document.derived['lexicon_matches'] = matches
+    return matches
@@ -0,0 +1,305 @@
+"""
+Markdown line classification and a single-pass markdown-to-plaintext stripper.
+
+``classify_line`` is the block classification used by ``ContentParser``;
+``strip_markdown`` uses the same classification to extract prose in one
+linear pass, keeping an offset map from the prose back to the source.
+"""
+
+import bisect
+import re
+from array import array
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from .tokenizer import iter_lines
+
+
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.+)$', re.MULTILINE)
+LIST_ITEM_PATTERN = re.compile(r'^[\s]*(?:[-*+]|\d+\.)\s+')
+_HEADING_MARKER = re.compile(r'#{1,6}\s+')
+_BLOCKQUOTE_MARKER = re.compile(r'>[ \t]*')
+_INLINE_MARKUP = re.compile(r'[`*\[!]')
+
+# Line kinds returned by classify_line
+LINE_BLANK = 'blank'
+LINE_FENCE = 'code_block'
+LINE_BLOCKQUOTE = 'blockquote'
+LINE_LIST_ITEM = 'list_item'
+LINE_HEADING = 'heading'
+LINE_PARAGRAPH = 'paragraph'
+
+
+def classify_line(text: str) -> Tuple[str, Optional[re.Match]]:
+    """Classify a line (without its line break) outside a code block.
+
+    Returns the line kind and, for list items and headings, the match of the
+    marker pattern.
+    """
+    if not text.strip():
+        return LINE_BLANK, None
+    if text.startswith('```'):
+        return LINE_FENCE, None
+    if text.startswith('>'):
+        return LINE_BLOCKQUOTE, None
+    match = LIST_ITEM_PATTERN.match(text)
+    if match:
+        return LINE_LIST_ITEM, match
+    match = HEADING_PATTERN.match(text)
+    if match:
+        return LINE_HEADING, match
+    return LINE_PARAGRAPH, None
+
+
+class Token(NamedTuple):
+    """A block or inline markdown token with its source offsets.
+
+    Block tokens (heading, paragraph, list_item, code_block, blockquote) span
+    their block's text; ``link`` and ``image`` tokens follow the block they
+    occur in. ``text`` is the heading/item/quote text, code, link text or
+    image alt text.
+    """
+    kind: str
+    start: int
+    end: int
+    text: str
+    level: int = 0
+    language: Optional[str] = None
+    url: Optional[str] = None
+
+
+def iter_inline(source: str, start: int = 0, end: Optional[int] = None) -> Iterator[Token]:
+    """Lex the links and images of ``source[start:end]`` in one linear scan.
+
+    Links are ``[text](url)`` with non-empty text and url, images
+    ``![alt](url)`` with a possibly empty alt text; text and alt text cannot
+    contain ``]`` and urls cannot contain ``)``.
+    """
+    if end is None:
+        end = len(source)
+    # Next ']' / ')' at or after the current position (cached so failed searches are not repeated)
+    next_bracket = next_paren = start - 1
+    position = source.find('[', start, end)
+
+    while position >= 0:
+        image = position > start and source[position - 1] == '!'
+        if next_bracket <= position:
+            next_bracket = source.find(']', position + 1, end)
+            if next_bracket < 0:
+                return
+        if (next_bracket > position + (not image)
+                and source.startswith('(', next_bracket + 1) and next_bracket + 1 < end):
+            if next_paren <= next_bracket + 1:
+                next_paren = source.find(')', next_bracket + 2, end)
+                if next_paren < 0:
+                    next_paren = end
+            if next_bracket + 2 < next_paren < end:
+                yield Token(
+                    'image' if image else 'link',
+                    position - image,
+                    next_paren + 1,
+                    source[position + 1:next_bracket],
+                    url=source[next_bracket + 2:next_paren],
+                )
+                position = source.find('[', next_paren + 1, end)
+                continue
+        position = source.find('[', position + 1, end)
+
+
+class PlainText:
+    """Prose extracted from markdown with a map back to source offsets.
+
+    The prose is a concatenation of source slices; segment ``i`` starts at
+    ``plain_starts[i]`` in the prose and ``source_starts[i]`` in the source.
+    """
+
+    __slots__ = ('text', 'plain_starts', 'source_starts')
+
+    def __init__(self, text: str, plain_starts: array, source_starts: array):
+        self.text = text
+        self.plain_starts = plain_starts
+        self.source_starts = source_starts
+
+    def source_offset(self, index: int) -> int:
+        """Source offset of the prose character at ``index``."""
+        if not 0 <= index < len(self.text):
+            raise IndexError(index)
+        segment = bisect.bisect_right(self.plain_starts, index) - 1
+        return self.source_starts[segment] + index - self.plain_starts[segment]
+
+    def source_span(self, start: int, end: int) -> Tuple[int, int]:
+        """Source span covering the prose characters ``start:end`` (end exclusive)."""
+        return self.source_offset(start), self.source_offset(end - 1) + 1
+
+
+class _Segments:
+    """Collects source slices, merging slices that are contiguous in the source."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.slices: List[Tuple[int, int]] = []
+
+    def add(self, start: int, end: int) -> None:
+        if start >= end:
+            return
+        if self.slices and self.slices[-1][1] == start:
+            self.slices[-1] = (self.slices[-1][0], end)
+        else:
+            self.slices.append((start, end))
+
+    def build(self) -> PlainText:
+        source = self.source
+        plain_starts = array('l')
+        source_starts = array('l')
+        position = 0
+        for start, end in self.slices:
+            plain_starts.append(position)
+            source_starts.append(start)
+            position += end - start
+        text = ''.join(source[start:end] for start, end in self.slices)
+        return PlainText(text, plain_starts, source_starts)
+
+
+def _strip_inline(source: str, start: int, end: int, segments: _Segments) -> None:
+    """Copy ``source[start:end]`` without inline markup.
+
+    Emphasis markers (``**``/``*``) and inline code backticks are dropped
+    when closed on the same line, links keep their text and images their alt
+    text. Every search resumes after the previous one or gives up for the
+    rest of the line, so the scan is linear in the line length.
+    """
+    # Closing delimiters found ahead: position -> position to continue from
+    skips: Dict[int, int] = {}
+    # Positions of the next ']' / ')' (cached so failed searches are not repeated)
+    next_bracket = next_paren = start - 1
+    copy_from = position = start
+
+    while position < end:
+        # Jump over plain text to the next markup character or pending closer
+        match = _INLINE_MARKUP.search(source, position, end)
+        position = match.start() if match else end
+        if skips:
+            position = min(position, min(skips))
+        if position >= end:
+            break
+        char = source[position]
+
+        if position in skips:
+            segments.add(copy_from, position)
+            position = copy_from = skips.pop(position)
+            continue
+
+        if char == '`':
+            close = source.find('`', position + 1, end)
+            if close > position + 1:
+                segments.add(copy_from, position)
+                segments.add(position + 1, close)
+                position = copy_from = close + 1
+                continue
+            position += 1
+            continue
+
+        if char == '*':
+            marker = 1
+            close = -1
+            if source.startswith('**', position) and position + 1 < end:
+                marker = 2
+                close = source.find('**', position + 2, end)
+                if close < 0:
+                    marker = 1
+            if close < 0:
+                close = source.find('*', position + 1, end)
+            if close >= 0:
+                segments.add(copy_from, position)
+                skips[close] = close + marker
+                position = copy_from = position + marker
+                continue
+            position += 1
+            continue
+
+        if char == '[' or (char == '!' and source.startswith('[', position + 1)):
+            bracket = position + (char == '!')
+            if next_bracket <= bracket:
+                next_bracket = source.find(']', bracket + 1, end)
+                if next_bracket < 0:
+                    next_bracket = end
+            if (next_bracket > bracket + (char == '[')
+                    and next_bracket < end and source.startswith('(', next_bracket + 1)):
+                if next_paren <= next_bracket + 1:
+                    next_paren = source.find(')', next_bracket + 2, end)
+                    if next_paren < 0:
+                        next_paren = end
+                if next_bracket + 2 < next_paren < end:
+                    segments.add(copy_from, position)
+                    skips[next_bracket] = next_paren + 1
+                    position = copy_from = bracket + 1
+                    continue
+            position = bracket + 1
+            continue
+
+        position += 1
+
+    segments.add(copy_from, end)
+
+
+def _strip_line(source: str, start: int, end: int, kind: str,
+                marker: Optional[re.Match], segments: _Segments) -> None:
+    """Copy one content line (``end`` includes its line break) without markup."""
+    text_end = end
+    while text_end > start and source[text_end - 1] in '\r\n':
+        text_end -= 1
+
+    if kind == LINE_BLOCKQUOTE:
+        start = _BLOCKQUOTE_MARKER.match(source, start).end()
+        # A list inside a blockquote loses both markers
+        list_marker = LIST_ITEM_PATTERN.match(source[start:text_end])
+        if list_marker:
+            start += list_marker.end()
+    elif kind == LINE_LIST_ITEM:
+        start += marker.end()
+    elif kind == LINE_HEADING:
+        start = _HEADING_MARKER.match(source, start).end()
+
+    _strip_inline(source, start, text_end, segments)
+    segments.add(text_end, end)
+
+
+def strip_markdown(source: str) -> PlainText:
+    """Extract the prose of a markdown text in one pass.
+
+    Fenced code blocks are dropped (an unclosed fence is kept as prose, as
+    ``ContentParser`` treats it as a paragraph); heading, blockquote and list
+    markers and inline markup are removed; blank lines are kept.
+    """
+    segments = _Segments(source)
+    # (start, end) of the lines of an open code block, kept as prose if it never closes
+    fenced: Optional[List[Tuple[int, int]]] = None
+    offset = 0
+
+    for line in iter_lines(source):
+        start, offset = offset, offset + len(line)
+        text = line.rstrip()
+
+        if fenced is not None:
+            fenced.append((start, offset))
+            if text.startswith('```'):
+                fenced = None
+            continue
+
+        kind, marker = classify_line(text)
+        if kind == LINE_FENCE:
+            fenced = [(start, offset)]
+        elif kind == LINE_BLANK:
+            segments.add(start, offset)
+        else:
+            _strip_line(source, start, offset, kind, marker, segments)
+
+    if fenced is not None:
+        for start, end in fenced:
+            _strip_line(source, start, end, LINE_PARAGRAPH, None, segments)
+
+    return segments.build()
+
+
+def iter_plain_lines(source: str) -> Iterator[str]:
+    """Prose lines of a markdown text (see ``strip_markdown``)."""
+    return iter_lines(strip_markdown(source).text)
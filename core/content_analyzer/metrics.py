@@ -0,0 +1,127 @@
+"""
+Mergeable text metrics read by the analyzer stages.
+
+Every count the stages need is additive (or an ordered concatenation), so the
+metrics of independently measured sections merge into the metrics of the
+whole document.
+"""
+
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import FrozenSet, Iterable, Union
+
+from .lexicon import LexiconMatches, get_lexicon_matcher, match_lexicons
+from .tokenizer import TokenizedDocument, as_document
+
+
+# Words with at least this many characters count as complex
+COMPLEX_WORD_LENGTH = 7
+# Whitespace-separated tokens longer than this count as long
+LONG_TOKEN_LENGTH = 12
+
+# Markdown markers whose presence the question generator checks
+MARKERS = ('#', '```', '[', '](', '- ', '* ', '+ ')
+
+_SUMMED_FIELDS = (
+    'word_count',
+    'complex_word_count',
+    'token_count',
+    'long_token_count',
+    'terminator_count',
+    'period_count',
+    'exclamation_count',
+    'question_count',
+    'passive_count',
+    'contraction_count',
+    'technical_term_count',
+    'syllable_count',
+    'polysyllable_count',
+)
+
+
+@dataclass
+class TextMetrics:
+    """Counts over a text (raw markdown or prose with formatting removed).
+
+    The style fields (passive, contraction, technical term, syllable and
+    polysyllabic word counts) are filled in by ``StyleAnalyzer.measure`` for prose only.
+    """
+    word_count: int = 0
+    complex_word_count: int = 0
+    token_count: int = 0
+    long_token_count: int = 0
+    # Whitespace-separated tokens per sentence, in document order
+    sentence_lengths: array = field(default_factory=lambda: array('l'))
+    terminator_count: int = 0
+    period_count: int = 0
+    exclamation_count: int = 0
+    question_count: int = 0
+    markers: FrozenSet[str] = frozenset()
+    # Sparse lexicon term id -> occurrences
+    lexicon_counts: Counter = field(default_factory=Counter)
+    passive_count: int = 0
+    contraction_count: int = 0
+    technical_term_count: int = 0
+    syllable_count: int = 0
+    polysyllable_count: int = 0
+
+    @classmethod
+    def from_document(cls, document: TokenizedDocument) -> 'TextMetrics':
+        """Measure a tokenized document."""
+        text = document.text
+        return cls(
+            word_count=document.word_count,
+            complex_word_count=document.count_words(min_length=COMPLEX_WORD_LENGTH),
+            token_count=document.token_count,
+            long_token_count=sum(1 for length in document.token_lengths if length > LONG_TOKEN_LENGTH),
+            sentence_lengths=array('l', document.sentence_lengths),
+            terminator_count=document.segment_count - 1,
+            period_count=text.count('.'),
+            exclamation_count=text.count('!'),
+            question_count=text.count('?'),
+            markers=frozenset(marker for marker in MARKERS if marker in text),
+            lexicon_counts=match_lexicons(document).term_counts,
+        )
+
+    @classmethod
+    def merge(cls, parts: Iterable['TextMetrics']) -> 'TextMetrics':
+        """Combine the metrics of consecutive sections, in order."""
+        merged = cls()
+        for part in parts:
+            merged.add(part)
+        return merged
+
+    def add(self, other: 'TextMetrics') -> 'TextMetrics':
+        """Accumulate the metrics of the section following this text, in place."""
+        for name in _SUMMED_FIELDS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.sentence_lengths.extend(other.sentence_lengths)
+        self.lexicon_counts.update(other.lexicon_counts)
+        self.markers = self.markers | other.markers
+        return self
+
+    @property
+    def sentence_count(self) -> int:
+        return len(self.sentence_lengths)
+
+    @property
+    def segment_count(self) -> int:
+        """Segments produced by splitting the text on terminator runs."""
+        return self.terminator_count + 1
+
+    @property
+    def lexicon(self) -> LexiconMatches:
+        return LexiconMatches(get_lexicon_matcher(), self.lexicon_counts)
+
+
+def as_metrics(content: Union[str, TokenizedDocument, TextMetrics]) -> TextMetrics:
+    """Return metrics for raw text, a tokenized document or existing metrics."""
+    if isinstance(content, TextMetrics):
+        return content
+    document = as_document(content)
+    metrics = document.derived.get('metrics')
+    if metrics is None:
+        metrics = TextMetrics.from_document(document)
+        document.derived['metrics'] = metrics
+    return metrics
@@ -2,7 +2,7 @@
 Data models for content analysis results.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Type, TypeVar
 from datetime import datetime
 from pydantic import BaseModel, Field
 
@@ -28,6 +28,9 @@ class StyleAnalysis(BaseModel):
     sentence_structure: str = Field(..., description="Sentence structure type (varied, simple, complex)")
     vocabulary_level: str = Field(..., description="Vocabulary complexity level")
     readability_score: float = Field(..., ge=0, le=100, description="Readability score (0-100)")
+    readability_metrics: Dict[str, float] = Field(
+        default={}, description="Flesch reading ease, Flesch-Kincaid grade, Gunning Fog and SMOG"
+    )
     style_consistency: float = Field(..., ge=0, le=1, description="Style consistency score (0-1)")
     engagement_score: float = Field(..., ge=0, le=1, description="Engagement potential score (0-1)")
     style_notes: List[str] = Field(default=[], description="Style analysis notes")
@@ -69,3 +72,21 @@ class AnalysisResults(BaseModel):
     quality_metrics: QualityMetrics = Field(..., description="Quality assessment metrics")
     metadata: Dict[str, Any] = Field(default={}, description="Additional analysis metadata")
     processing_time_seconds: float = Field(..., description="Total processing time in seconds")
+
+
+ModelT = TypeVar('ModelT', bound=BaseModel)
+
+# Validate results built by the analyzers themselves (off by default; useful in tests)
+VALIDATE_INTERNAL_RESULTS = False
+
+
+def build_result(model: Type[ModelT], **values: Any) -> ModelT:
+    """Build a result model from values computed by the analyzers.
+    
+    The pipeline produces these values itself, so by default they are
+    assigned without re-validation (``model_construct``). Data from outside
+    the pipeline (API input, the shared cache) goes through ``model_validate``.
+    """
+    if VALIDATE_INTERNAL_RESULTS:
+        return model(**values)
+    return model.model_construct(**values)
@@ -1,24 +1,32 @@
 """
-Content parser for markdown and metadata extraction.
+Content parser for markdown (and HTML) and metadata extraction.
 """
 
-import re
-from typing import Dict, Any, Optional, List
+from itertools import chain
+from typing import Callable, Dict, Any, Iterable, Iterator, Optional, List, Tuple
 from pathlib import Path
-import yaml
 from datetime import datetime
+from .frontmatter import frontmatter_format, metadata_cache, split_frontmatter
+from .html_parser import lex_html
+from .markup import HEADING_PATTERN, LIST_ITEM_PATTERN, LINE_BLANK, Token, classify_line, iter_inline
+from .records import CodeBlock, Heading, Image, Link
+from .tokenizer import (
+    TokenizedDocument, BLOCK_PARAGRAPH, BLOCK_HEADING, BLOCK_LIST_ITEM,
+    BLOCK_CODE, BLOCK_BLOCKQUOTE, iter_lines
+)
+
+
+# Frontmatter longer than this is not buffered when streaming; it is parsed as content
+MAX_STREAMED_FRONTMATTER = 64 * 1024
 
 
 class ContentParser:
     """Parser for markdown content with metadata extraction."""
     
     def __init__(self):
-        self.metadata_pattern = re.compile(r'^---\s*\n(.*?)\n---\s*\n', re.DOTALL)
-        self.heading_pattern = re.compile(r'^(#{1,6})\s+(.+)$', re.MULTILINE)
-        self.link_pattern = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
-        self.image_pattern = re.compile(r'!\[([^\]]*)\]\(([^)]+)\)')
-        self.code_block_pattern = re.compile(r'```[\w]*\n(.*?)\n```', re.DOTALL)
-        self.inline_code_pattern = re.compile(r'`([^`]+)`')
+        self.metadata_cache = metadata_cache
+        self.heading_pattern = HEADING_PATTERN
+        self.list_item_pattern = LIST_ITEM_PATTERN
     
     def parse_file(self, file_path: str) -> Dict[str, Any]:
         """Parse a markdown file and extract content and metadata."""
@@ -31,59 +39,166 @@ class ContentParser:
         except UnicodeDecodeError:
             raise ValueError(f"Unable to decode file: {file_path}")
     
-    def parse_content(self, content: str, source: Optional[str] = None) -> Dict[str, Any]:
-        """Parse markdown content and extract metadata."""
-        if not content.strip():
-            raise ValueError("Content cannot be empty")
+    def stream_file(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """Parse a markdown file incrementally, yielding one block at a time.
         
-        # Extract frontmatter metadata
-        metadata = self._extract_metadata(content)
+        The file is read line by line, so memory use is bounded by the largest
+        block rather than the file size. Frontmatter is yielded first as a
+        ``'metadata'`` block; every other block is a heading, paragraph,
+        list_item, code_block or blockquote dict with its offsets (relative to
+        the content after the frontmatter), ``raw`` text, links and images.
+        """
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                metadata_block, lines = self._stream_frontmatter(f)
+                if metadata_block is not None:
+                    yield metadata_block
+                for block in self._iter_blocks(lines):
+                    tokens = iter_inline(block['raw']) if block['type'] != 'code_block' else ()
+                    inline = self._derive_outputs(tokens)
+                    block['links'] = inline['links']
+                    block['images'] = inline['images']
+                    yield block
+        except FileNotFoundError:
+            raise ValueError(f"File not found: {file_path}")
+        except UnicodeDecodeError:
+            raise ValueError(f"Unable to decode file: {file_path}")
+    
+    def _stream_frontmatter(self, lines: Iterable[str]) -> Tuple[Optional[Dict[str, Any]], Iterator[str]]:
+        """Split leading frontmatter off a line iterator.
         
-        # Remove frontmatter from content
-        clean_content = self._remove_frontmatter(content)
+        Returns the metadata block (or ``None``) and an iterator over the
+        remaining lines.
+        """
+        lines = iter(lines)
+        first = next(lines, None)
+        if first is None:
+            return None, iter(())
+        fence = frontmatter_format(first)
+        if fence is None:
+            return None, chain([first], lines)
+        format_name, closing = fence
         
-        # Parse content structure
-        structure = self._parse_structure(clean_content)
+        buffered = [first]
+        size = len(first)
+        for line in lines:
+            buffered.append(line)
+            size += len(line)
+            if line.rstrip() == closing and line.endswith('\n') and len(buffered) > 2:
+                raw = ''.join(buffered)
+                # JSON frontmatter keeps its braces
+                text = raw if format_name == 'json' else ''.join(buffered[1:-1])
+                return {
+                    'type': 'metadata',
+                    'metadata': self._load_metadata(text.rstrip('\n'), format_name),
+                    'raw': raw,
+                    'line_number': 1
+                }, lines
+            if size > MAX_STREAMED_FRONTMATTER:
+                break
+        return None, chain(buffered, lines)
+    
+    def parse_content(self, content: str, source: Optional[str] = None,
+                      tokenize: bool = True,
+                      checkpoint: Optional[Callable[[], None]] = None) -> Dict[str, Any]:
+        """Parse markdown content and extract metadata.
         
-        # Extract links and images
-        links = self._extract_links(clean_content)
-        images = self._extract_images(clean_content)
+        With ``tokenize=False`` the whole-document ``'document'`` is skipped
+        (``None``), for callers that measure the content section by section.
+        ``checkpoint`` is called for every token, e.g. to stop a timed out run.
+        """
+        if not content.strip():
+            raise ValueError("Content cannot be empty")
         
-        # Extract code blocks
-        code_blocks = self._extract_code_blocks(clean_content)
+        # Split the frontmatter off and load its metadata
+        format_name, frontmatter, clean_content = split_frontmatter(content)
+        metadata = self._load_metadata(frontmatter, format_name) if format_name else {}
+        
+        # Lex the content once; structure, links, images and code blocks derive from the tokens
+        blocks: List[tuple] = []
+        derived = self._derive_outputs(self.lex(clean_content), blocks, checkpoint)
+        
+        # Tokenize once; every analyzer reads from this document
+        document = TokenizedDocument.from_text(clean_content, blocks) if tokenize else None
         
         return {
             'metadata': metadata,
             'content': clean_content,
-            'structure': structure,
-            'links': links,
-            'images': images,
-            'code_blocks': code_blocks,
+            **derived,
+            'document': document,
             'source': source,
             'parsed_at': datetime.now().isoformat()
         }
     
-    def _extract_metadata(self, content: str) -> Dict[str, Any]:
-        """Extract YAML frontmatter metadata."""
-        match = self.metadata_pattern.match(content)
-        if not match:
-            return {}
+    def parse_html(self, html: str, source: Optional[str] = None,
+                   tokenize: bool = True,
+                   checkpoint: Optional[Callable[[], None]] = None) -> Dict[str, Any]:
+        """Parse an HTML page without converting it to markdown.
         
-        try:
-            metadata_text = match.group(1)
-            metadata = yaml.safe_load(metadata_text)
-            return metadata or {}
-        except yaml.YAMLError:
-            # If YAML parsing fails, return empty dict
-            return {}
+        The token stream is built from the lxml tree (see ``lex_html``) and
+        the outputs derive from it as for markdown. ``'content'`` is the text
+        of the blocks, ``'tokens'`` the token stream and ``'metadata'`` comes
+        from ``<head>``.
+        """
+        if not html.strip():
+            raise ValueError("Content cannot be empty")
+        
+        page = lex_html(html)
+        if not page.text:
+            raise ValueError("Content cannot be empty")
+        
+        blocks: List[tuple] = []
+        derived = self._derive_outputs(page.tokens, blocks, checkpoint)
+        document = TokenizedDocument.from_text(page.text, blocks) if tokenize else None
+        
+        return {
+            'metadata': page.metadata,
+            'content': page.text,
+            **derived,
+            'document': document,
+            'tokens': page.tokens,
+            'format': 'html',
+            'source': source,
+            'parsed_at': datetime.now().isoformat()
+        }
+    
+    def _extract_metadata(self, content: str) -> Dict[str, Any]:
+        """Extract YAML, TOML or JSON frontmatter metadata."""
+        format_name, frontmatter, _ = split_frontmatter(content)
+        return self._load_metadata(frontmatter, format_name) if format_name else {}
+    
+    def _load_metadata(self, metadata_text: str, format_name: str = 'yaml') -> Dict[str, Any]:
+        """Load frontmatter text (cached by its hash; invalid frontmatter gives {})."""
+        return self.metadata_cache.load(metadata_text, format_name)
     
     def _remove_frontmatter(self, content: str) -> str:
         """Remove frontmatter from content."""
-        return self.metadata_pattern.sub('', content)
+        return split_frontmatter(content)[2]
     
-    def _parse_structure(self, content: str) -> Dict[str, Any]:
-        """Parse content structure (headings, paragraphs, etc.)."""
-        lines = content.split('\n')
+    def lex(self, content: str) -> Iterator[Token]:
+        """Lex markdown into a stream of block tokens, each followed by its links and images.
+        
+        One linear pass over the lines groups them into blocks; the inline
+        scan of each block covers only that block's text. Code blocks carry
+        their language and are not scanned for inline tokens.
+        """
+        for block in self._iter_blocks(iter_lines(content)):
+            block_type = block['type']
+            yield Token(block_type, block['start'], block['end'], block['text'],
+                        level=block.get('level', 0), language=block.get('language'))
+            if block_type != 'code_block':
+                yield from iter_inline(content, block['start'], block['end'])
+    
+    def _derive_outputs(self, tokens: Iterable[Token], blocks: Optional[List[tuple]] = None,
+                        checkpoint: Optional[Callable[[], None]] = None) -> Dict[str, Any]:
+        """Build the structure, links, images and code blocks from a token stream.
+        
+        Headings, links, images and code blocks are slotted records (see
+        ``records``) that read like dicts; ``as_dict`` converts them.
+        
+        When ``blocks`` is given, ``(start, end, kind)`` character offsets of
+        every block are appended to it. ``checkpoint`` is called before each token.
+        """
         structure = {
             'headings': [],
             'paragraphs': [],
@@ -91,117 +206,193 @@ class ContentParser:
             'code_blocks': [],
             'blockquotes': []
         }
+        links = []
+        images = []
+        code_blocks = []
+        if blocks is None:
+            blocks = []
         
-        current_paragraph = []
+        for token in tokens:
+            if checkpoint is not None:
+                checkpoint()
+            kind = token.kind
+            span = (token.start, token.end)
+            
+            if kind == 'link':
+                links.append(Link(token.text, token.url))
+            elif kind == 'image':
+                # Image markup also has the link syntax, so (with alt text) it is reported as a link too
+                if token.text:
+                    links.append(Link(token.text, token.url))
+                images.append(Image(token.text, token.url))
+            elif kind == 'heading':
+                structure['headings'].append(Heading(
+                    token.level,
+                    token.text,
+                    len(structure['paragraphs']) + len(structure['headings'])
+                ))
+                blocks.append((*span, BLOCK_HEADING))
+            elif kind == 'blockquote':
+                # Handle multi-line blockquotes
+                quote = token.text
+                if quote:
+                    if structure['blockquotes'] and not quote.startswith('Another'):
+                        # Continue previous blockquote
+                        structure['blockquotes'][-1] += " " + quote
+                    else:
+                        # Start new blockquote
+                        structure['blockquotes'].append(quote)
+                    blocks.append((*span, BLOCK_BLOCKQUOTE))
+            elif kind == 'list_item':
+                structure['lists'].append(token.text)
+                blocks.append((*span, BLOCK_LIST_ITEM))
+            elif kind == 'code_block':
+                structure['code_blocks'].append(token.text)
+                code_blocks.append(CodeBlock(token.language or 'unknown', token.text))
+                blocks.append((*span, BLOCK_CODE))
+            else:
+                structure['paragraphs'].append(token.text)
+                blocks.append((*span, BLOCK_PARAGRAPH))
+        
+        return {
+            'structure': structure,
+            'links': links,
+            'images': images,
+            'code_blocks': code_blocks
+        }
+    
+    def _parse_structure(self, content: str, blocks: Optional[List[tuple]] = None) -> Dict[str, Any]:
+        """Parse content structure (headings, paragraphs, etc.).
+        
+        When ``blocks`` is given, ``(start, end, kind)`` character offsets of
+        every block are appended to it.
+        """
+        tokens = (token for token in self.lex(content) if token.kind not in ('link', 'image'))
+        return self._derive_outputs(tokens, blocks)['structure']
+    
+    def _iter_blocks(self, lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """Group lines (each keeping its newline) into typed blocks.
+        
+        Every block carries its character ``start``/``end`` offsets, 1-based
+        ``line_number`` and ``raw`` source text. ``raw`` includes the blank
+        lines that follow the block, so joining the ``raw`` of all blocks
+        gives back the input (unless it has no block at all, e.g. blank or a
+        lone empty fence). A block is yielded once the next block starts, so
+        only one block is held in memory at a time.
+        """
+        held: Optional[Dict[str, Any]] = None
+        raw: List[str] = []
+        paragraph: List[str] = []
+        paragraph_start = paragraph_end = paragraph_line = 0
         in_code_block = False
-        in_list = False
+        language = None
+        # Index into ``raw`` where a code block starts while the block before it is still held
+        deferred: Optional[int] = None
+        offset = 0
+        line_number = 0
+        
+        def make_block(block_type: str, text: str, start: int, end: int, number: int,
+                       **extra: Any) -> Dict[str, Any]:
+            return {'type': block_type, 'text': text, 'start': start, 'end': end,
+                    'line_number': number, **extra}
         
         for line in lines:
-            line = line.rstrip()
+            line_number += 1
+            line_start = offset
+            offset += len(line)
+            text = line.rstrip()
+            line_end = line_start + len(text)
             
-            # Check for code blocks
-            if line.startswith('```'):
-                if in_code_block:
+            if in_code_block:
+                if deferred is not None:
+                    # The fence has content, so the block before it is complete
+                    held['raw'] = ''.join(raw[:deferred])
+                    yield held
+                    held = None
+                    raw = raw[deferred:]
+                    deferred = None
+                raw.append(line)
+                if text.startswith('```'):
                     # End of code block
-                    structure['code_blocks'].append('\n'.join(current_paragraph))
-                    current_paragraph = []
+                    held = make_block('code_block', '\n'.join(paragraph), paragraph_start,
+                                      line_end, paragraph_line, language=language)
+                    paragraph = []
                     in_code_block = False
                 else:
-                    # Start of code block
-                    if current_paragraph:
-                        structure['paragraphs'].append('\n'.join(current_paragraph))
-                        current_paragraph = []
-                    in_code_block = True
+                    paragraph.append(text)
                 continue
             
-            if in_code_block:
-                current_paragraph.append(line)
-                continue
-            
-            # Check for headings
-            heading_match = self.heading_pattern.match(line)
-            if heading_match:
-                if current_paragraph:
-                    structure['paragraphs'].append('\n'.join(current_paragraph))
-                    current_paragraph = []
-                
-                level = len(heading_match.group(1))
-                text = heading_match.group(2).strip()
-                structure['headings'].append({
-                    'level': level,
-                    'text': text,
-                    'line_number': len(structure['paragraphs']) + len(structure['headings'])
-                })
+            block_type, marker = classify_line(text)
+            if block_type == LINE_BLANK:
+                # Empty line ends current paragraph
+                if paragraph:
+                    held = make_block('paragraph', '\n'.join(paragraph), paragraph_start,
+                                      paragraph_end, paragraph_line)
+                    paragraph = []
+                raw.append(line)
                 continue
             
-            # Check for blockquotes
-            if line.startswith('>'):
-                if current_paragraph:
-                    structure['paragraphs'].append('\n'.join(current_paragraph))
-                    current_paragraph = []
-                # Handle multi-line blockquotes
-                if line[1:].strip():
-                    if structure['blockquotes'] and not line[1:].strip().startswith('Another'):
-                        # Continue previous blockquote
-                        structure['blockquotes'][-1] += " " + line[1:].strip()
-                    else:
-                        # Start new blockquote
-                        structure['blockquotes'].append(line[1:].strip())
+            if block_type == 'paragraph' and paragraph:
+                # Regular content continues the current paragraph
+                paragraph.append(text)
+                paragraph_end = line_end
+                raw.append(line)
                 continue
             
-            # Check for list items
-            if re.match(r'^[\s]*[-*+]\s+', line) or re.match(r'^[\s]*\d+\.\s+', line):
-                if current_paragraph:
-                    structure['paragraphs'].append('\n'.join(current_paragraph))
-                    current_paragraph = []
-                structure['lists'].append(line.strip())
-                in_list = True
-                continue
+            # A new block starts: finish the current paragraph and release the held block
+            if paragraph:
+                held = make_block('paragraph', '\n'.join(paragraph), paragraph_start,
+                                  paragraph_end, paragraph_line)
+                paragraph = []
+            if held is not None and block_type == 'code_block':
+                # Keep the previous block until the fence turns out to have content
+                deferred = len(raw)
+            elif held is not None:
+                held['raw'] = ''.join(raw)
+                yield held
+                held = None
+                raw = []
+            raw.append(line)
             
-            # Regular content
-            if line.strip():
-                current_paragraph.append(line)
-                in_list = False
-            elif current_paragraph:
-                # Empty line ends current paragraph
-                structure['paragraphs'].append('\n'.join(current_paragraph))
-                current_paragraph = []
-        
-        # Add any remaining paragraph
-        if current_paragraph:
-            structure['paragraphs'].append('\n'.join(current_paragraph))
+            if block_type == 'code_block':
+                in_code_block = True
+                language = text[3:].strip() or None
+                paragraph_start, paragraph_line = line_start, line_number
+            elif block_type == 'heading':
+                held = make_block('heading', marker.group(2).strip(), line_start,
+                                  line_end, line_number, level=len(marker.group(1)))
+            elif block_type == 'blockquote':
+                held = make_block('blockquote', text[1:].strip(), line_start, line_end, line_number)
+            elif block_type == 'list_item':
+                held = make_block('list_item', text.strip(), line_start, line_end, line_number)
+            else:
+                paragraph = [text]
+                paragraph_start, paragraph_end, paragraph_line = line_start, line_end, line_number
         
-        return structure
+        # An unclosed code block is treated as prose (including the empty
+        # line after a trailing newline, as ``str.split`` would produce)
+        if in_code_block and line.endswith('\n'):
+            paragraph.append('')
+        if paragraph:
+            if deferred is not None:
+                held['raw'] = ''.join(raw[:deferred])
+                yield held
+                raw = raw[deferred:]
+            held = make_block('paragraph', '\n'.join(paragraph), paragraph_start,
+                              offset if in_code_block else paragraph_end, paragraph_line)
+        if held is not None:
+            held['raw'] = ''.join(raw)
+            yield held
     
-    def _extract_links(self, content: str) -> List[Dict[str, str]]:
+    def _extract_links(self, content: str) -> List[Link]:
         """Extract all links from content."""
-        links = []
-        for match in self.link_pattern.finditer(content):
-            links.append({
-                'text': match.group(1),
-                'url': match.group(2)
-            })
-        return links
-    
-    def _extract_images(self, content: str) -> List[Dict[str, str]]:
+        tokens = iter_inline(content)
+        return self._derive_outputs(tokens)['links']
+    
+    def _extract_images(self, content: str) -> List[Image]:
         """Extract all images from content."""
-        images = []
-        for match in self.image_pattern.finditer(content):
-            images.append({
-                'alt_text': match.group(1),
-                'url': match.group(2)
-            })
-        return images
-    
-    def _extract_code_blocks(self, content: str) -> List[Dict[str, str]]:
-        """Extract code blocks from content."""
-        code_blocks = []
-        for match in self.code_block_pattern.finditer(content):
-            code_blocks.append({
-                'language': 'unknown',
-                'code': match.group(1)
-            })
-        return code_blocks
+        tokens = iter_inline(content)
+        return self._derive_outputs(tokens)['images']
     
     def validate_content(self, content: str) -> List[str]:
         """Validate content and return any issues found."""
@@ -222,8 +413,8 @@ class ContentParser:
             issues.append("Unclosed code block detected")
         
         # Check for broken links (basic validation)
-        for match in self.link_pattern.finditer(content):
-            url = match.group(2)
+        for link in self._extract_links(content):
+            url = link.url
             if not url.startswith(('http://', 'https://', 'mailto:', '#', '/')):
                 issues.append(f"Potentially broken link: {url}")
         
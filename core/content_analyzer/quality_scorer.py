@@ -2,74 +2,112 @@
 Quality scorer for assessing content quality metrics.
 """
 
-import re
-from typing import Dict, Any, List
-from .models import QualityMetrics
+from itertools import chain
+from typing import Dict, Any, List, Sequence, Union
+import numpy as np
+from pydantic import BaseModel
+from .models import ContentStructure, StyleAnalysis, PurposeAnalysis, QualityMetrics, build_result
+from .tokenizer import TokenizedDocument
+from .lexicon import (
+    CLARITY_INDICATORS, COHERENCE_INDICATORS, COMPLETENESS_INDICATORS,
+    ACCURACY_INDICATORS, ENGAGEMENT_INDICATORS, ESSENTIAL_ELEMENTS,
+    INSTRUCTIONAL_ELEMENTS
+)
+from .lexicon import get_lexicon_matcher
+from .metrics import TextMetrics, as_metrics
+
+
+# Sentences with more whitespace-separated tokens than this hurt clarity
+LONG_SENTENCE_LENGTH = 25
+
+# Expected word count ranges by purpose
+EXPECTED_WORD_RANGES = {
+    'tutorial': (500, 2000),
+    'educational': (800, 3000),
+    'review': (600, 2500),
+    'technical': (1000, 4000),
+    'informational': (400, 2000),
+    'entertainment': (300, 1500)
+}
+DEFAULT_WORD_RANGE = (400, 2000)
+
+# Purposes whose content should also contain the instructional elements
+INSTRUCTIONAL_PURPOSES = ('educational', 'tutorial', 'technical')
+
+# Weights of the quality dimensions in the overall score
+DIMENSION_WEIGHTS = {
+    'clarity': 0.25,
+    'coherence': 0.20,
+    'completeness': 0.20,
+    'accuracy': 0.25,
+    'engagement': 0.10
+}
+
+# Lexicon categories whose distinct terms the dimension scores count
+SCORED_CATEGORIES = (
+    'clarity.positive', 'clarity.negative',
+    'coherence.positive', 'coherence.negative', 'coherence.flow', 'coherence.transition',
+    'completeness.positive', 'completeness.negative',
+    'accuracy.positive', 'accuracy.negative', 'accuracy.citation', 'accuracy.hedging',
+    'engagement.positive', 'engagement.negative', 'engagement.interactive', 'engagement.story',
+)
+
+# Columns of the batch feature matrix (after the lexicon categories)
+BATCH_FEATURES = SCORED_CATEGORIES + (
+    'missing_essential',
+    'missing_instructional',
+    'long_sentences',
+    'long_tokens',
+    'tokens',
+    'structure_score',
+    'style_engagement',
+    'min_expected_words',
+    'max_expected_words',
+    'instructional',
+)
+
+
+def _field(analysis: Union[BaseModel, Dict[str, Any]], name: str, default: Any) -> Any:
+    """Read a field of a typed stage result or of its dict form."""
+    if isinstance(analysis, dict):
+        return analysis.get(name, default)
+    return getattr(analysis, name, default)
+
+
+def _indicator_scores(positive: np.ndarray, negative: np.ndarray) -> np.ndarray:
+    """Share of positive indicators as a 0-100 score, 75.0 where there are none."""
+    total = positive + negative
+    ratio = np.divide(positive, total, out=np.zeros_like(positive), where=total > 0)
+    return np.where(total > 0, ratio * 100, 75.0)
+
+
+def _clip_scores(scores: np.ndarray) -> np.ndarray:
+    """Clip scores to 0-100 (``+ 0.0`` turns -0.0 into 0.0, as ``max(0.0, ...)`` does)."""
+    return np.maximum(np.minimum(scores, 100.0), 0.0) + 0.0
 
 
 class QualityScorer:
     """Scorer for content quality assessment."""
     
     def __init__(self):
-        # Quality indicators
-        self.clarity_indicators = {
-            'positive': [
-                'clear', 'concise', 'simple', 'straightforward', 'easy to understand',
-                'well-explained', 'logical', 'organized', 'structured', 'coherent'
-            ],
-            'negative': [
-                'confusing', 'unclear', 'vague', 'ambiguous', 'complex', 'complicated',
-                'difficult', 'hard to follow', 'unorganized', 'disjointed'
-            ]
-        }
-        
-        self.coherence_indicators = {
-            'positive': [
-                'flow', 'transition', 'connection', 'link', 'follow', 'lead to',
-                'therefore', 'thus', 'consequently', 'as a result', 'because'
-            ],
-            'negative': [
-                'jump', 'disconnect', 'unrelated', 'random', 'out of place',
-                'doesn\'t follow', 'no connection', 'irrelevant'
-            ]
-        }
-        
-        self.completeness_indicators = {
-            'positive': [
-                'complete', 'comprehensive', 'thorough', 'detailed', 'full',
-                'all aspects', 'everything', 'complete picture', 'whole story'
-            ],
-            'negative': [
-                'incomplete', 'missing', 'partial', 'inadequate', 'insufficient',
-                'lacks', 'doesn\'t cover', 'missing information', 'gaps'
-            ]
-        }
+        # Quality indicators (matched through the shared lexicon automaton)
+        self.clarity_indicators = CLARITY_INDICATORS
+        self.coherence_indicators = COHERENCE_INDICATORS
+        self.completeness_indicators = COMPLETENESS_INDICATORS
+        self.accuracy_indicators = ACCURACY_INDICATORS
+        self.engagement_indicators = ENGAGEMENT_INDICATORS
+    
+    def assess_quality(self, content: Union[str, TokenizedDocument, TextMetrics],
+                       structure_analysis: Union[ContentStructure, Dict[str, Any]],
+                       style_analysis: Union[StyleAnalysis, Dict[str, Any]],
+                       purpose_analysis: Union[PurposeAnalysis, Dict[str, Any]]) -> QualityMetrics:
+        """Assess overall content quality and generate metrics.
         
-        self.accuracy_indicators = {
-            'positive': [
-                'accurate', 'correct', 'precise', 'exact', 'verified', 'confirmed',
-                'reliable', 'trustworthy', 'factual', 'evidence-based'
-            ],
-            'negative': [
-                'inaccurate', 'incorrect', 'wrong', 'false', 'misleading',
-                'unverified', 'unreliable', 'questionable', 'doubtful'
-            ]
-        }
+        The stage results are read as typed models (as the pipeline passes
+        them) or as their dict form.
+        """
+        content = as_metrics(content)
         
-        self.engagement_indicators = {
-            'positive': [
-                'interesting', 'engaging', 'captivating', 'fascinating', 'exciting',
-                'compelling', 'intriguing', 'thought-provoking', 'stimulating'
-            ],
-            'negative': [
-                'boring', 'dull', 'uninteresting', 'tedious', 'monotonous',
-                'repetitive', 'dry', 'lifeless', 'uninspiring'
-            ]
-        }
-    
-    def assess_quality(self, content: str, structure_analysis: Dict[str, Any], 
-                      style_analysis: Dict[str, Any], purpose_analysis: Dict[str, Any]) -> QualityMetrics:
-        """Assess overall content quality and generate metrics."""
         # Calculate individual quality scores
         clarity_score = self._calculate_clarity_score(content)
         coherence_score = self._calculate_coherence_score(content, structure_analysis)
@@ -95,7 +133,8 @@ class QualityScorer:
             accuracy_score, engagement_score, quality_issues
         )
         
-        return QualityMetrics(
+        return build_result(
+            QualityMetrics,
             overall_score=overall_score,
             clarity_score=clarity_score,
             coherence_score=coherence_score,
@@ -106,15 +145,191 @@ class QualityScorer:
             improvement_suggestions=improvement_suggestions
         )
     
-    def _calculate_clarity_score(self, content: str) -> float:
+    def assess_batch(self, contents: Sequence[Union[str, TokenizedDocument, TextMetrics]],
+                     structure_analyses: Sequence[Union[ContentStructure, Dict[str, Any]]],
+                     style_analyses: Sequence[Union[StyleAnalysis, Dict[str, Any]]],
+                     purpose_analyses: Sequence[Union[PurposeAnalysis, Dict[str, Any]]]) -> List[QualityMetrics]:
+        """Assess the quality of many documents at once.
+        
+        The dimension and overall scores are computed with array operations
+        over the batch feature matrix; the results are identical to calling
+        ``assess_quality`` on each document.
+        """
+        metrics = [as_metrics(content) for content in contents]
+        features = self.batch_features(metrics, structure_analyses, style_analyses, purpose_analyses)
+        scores = {name: values.tolist() for name, values in self._score_features(features).items()}
+        
+        results = []
+        for row, content in enumerate(metrics):
+            clarity_score = scores['clarity'][row]
+            coherence_score = scores['coherence'][row]
+            completeness_score = scores['completeness'][row]
+            accuracy_score = scores['accuracy'][row]
+            engagement_score = scores['engagement'][row]
+            quality_issues = self._identify_quality_issues(
+                content, clarity_score, coherence_score, completeness_score,
+                accuracy_score, engagement_score
+            )
+            results.append(build_result(
+                QualityMetrics,
+                overall_score=round(scores['overall'][row], 1),
+                clarity_score=clarity_score,
+                coherence_score=coherence_score,
+                completeness_score=completeness_score,
+                accuracy_score=accuracy_score,
+                engagement_score=engagement_score,
+                quality_issues=quality_issues,
+                improvement_suggestions=self._generate_improvement_suggestions(
+                    content, clarity_score, coherence_score, completeness_score,
+                    accuracy_score, engagement_score, quality_issues
+                )
+            ))
+        return results
+    
+    def batch_features(self, contents: Sequence[Union[str, TokenizedDocument, TextMetrics]],
+                       structure_analyses: Sequence[Union[ContentStructure, Dict[str, Any]]],
+                       style_analyses: Sequence[Union[StyleAnalysis, Dict[str, Any]]],
+                       purpose_analyses: Sequence[Union[PurposeAnalysis, Dict[str, Any]]]) -> np.ndarray:
+        """Extract the scoring features of many documents.
+        
+        Returns a float matrix with one row per document and the columns
+        named in ``BATCH_FEATURES``. The lexicon counts are the product of a
+        document x term presence matrix and a term x category membership
+        matrix.
+        """
+        metrics = [as_metrics(content) for content in contents]
+        if not len(metrics) == len(structure_analyses) == len(style_analyses) == len(purpose_analyses):
+            raise ValueError("Every document needs a structure, style and purpose analysis")
+        
+        matcher = get_lexicon_matcher()
+        categories = len(SCORED_CATEGORIES)
+        # Terms of each scored category, then each expected element (with multiplicity)
+        membership = np.zeros((len(matcher.term_ids), categories + 2), dtype=np.int64)
+        for column, category in enumerate(SCORED_CATEGORIES):
+            membership[list(matcher.categories[category]), column] = 1
+        for column, elements in ((categories, ESSENTIAL_ELEMENTS), (categories + 1, INSTRUCTIONAL_ELEMENTS)):
+            for element in elements:
+                term_id = matcher.term_ids.get(matcher.normalize(element))
+                if term_id is not None:
+                    membership[term_id, column] += 1
+        
+        present = np.zeros((len(metrics), len(matcher.term_ids)), dtype=np.int64)
+        for row, content in enumerate(metrics):
+            present[row, [term_id for term_id, count in content.lexicon_counts.items() if count]] = 1
+        counts = present @ membership
+        
+        sentence_counts = [content.sentence_count for content in metrics]
+        sentence_lengths = np.fromiter(
+            chain.from_iterable(content.sentence_lengths for content in metrics),
+            dtype=np.int64, count=sum(sentence_counts)
+        )
+        sentence_rows = np.repeat(np.arange(len(metrics)), sentence_counts)
+        
+        purposes = [_field(analysis, 'purpose', 'informational') for analysis in purpose_analyses]
+        word_ranges = np.array(
+            [EXPECTED_WORD_RANGES.get(purpose, DEFAULT_WORD_RANGE) for purpose in purposes],
+            dtype=np.float64
+        ).reshape(len(metrics), 2)
+        
+        features = np.empty((len(metrics), len(BATCH_FEATURES)), dtype=np.float64)
+        features[:, :categories] = counts[:, :categories]
+        column = categories
+        for values in (
+            len(ESSENTIAL_ELEMENTS) - counts[:, categories],
+            len(INSTRUCTIONAL_ELEMENTS) - counts[:, categories + 1],
+            np.bincount(sentence_rows[sentence_lengths > LONG_SENTENCE_LENGTH], minlength=len(metrics)),
+            [content.long_token_count for content in metrics],
+            [content.token_count for content in metrics],
+            [_field(analysis, 'structure_score', 0.5) for analysis in structure_analyses],
+            [_field(analysis, 'engagement_score', 0.5) for analysis in style_analyses],
+            word_ranges[:, 0],
+            word_ranges[:, 1],
+            [purpose in INSTRUCTIONAL_PURPOSES for purpose in purposes],
+        ):
+            features[:, column] = values
+            column += 1
+        return features
+    
+    def _score_features(self, features: np.ndarray) -> Dict[str, np.ndarray]:
+        """Dimension scores and the unrounded overall score of a feature matrix.
+        
+        Every expression mirrors the per-document ``_calculate_*`` methods
+        operation for operation, so the floats are bit-identical.
+        """
+        feature = dict(zip(BATCH_FEATURES, features.T))
+        
+        has_clarity_indicators = feature['clarity.positive'] + feature['clarity.negative'] > 0
+        clarity = np.where(
+            has_clarity_indicators,
+            _clip_scores(
+                _indicator_scores(feature['clarity.positive'], feature['clarity.negative'])
+                - np.minimum(20, feature['long_sentences'] * 5)
+                - np.minimum(15, feature['long_tokens'] * 2)
+            ),
+            75.0
+        )
+        
+        coherence = _clip_scores(
+            (_indicator_scores(feature['coherence.positive'], feature['coherence.negative'])
+             + feature['structure_score'] * 100) / 2
+            + np.minimum(10, feature['coherence.flow'] * 2)
+            + np.minimum(10, feature['coherence.transition'] * 2)
+        )
+        
+        words = feature['tokens']
+        min_expected = feature['min_expected_words']
+        max_expected = feature['max_expected_words']
+        completeness_base = _indicator_scores(feature['completeness.positive'], feature['completeness.negative'])
+        completeness_base = np.where(
+            words < min_expected,
+            completeness_base - (min_expected - words) / min_expected * 30,
+            np.where(
+                words > max_expected,
+                completeness_base - np.minimum(20, (words - max_expected) / max_expected * 10),
+                completeness_base
+            )
+        )
+        missing_elements = feature['missing_essential'] + feature['instructional'] * feature['missing_instructional']
+        completeness = _clip_scores(completeness_base - missing_elements * 10)
+        
+        accuracy = _clip_scores(
+            _indicator_scores(feature['accuracy.positive'], feature['accuracy.negative'])
+            + np.minimum(15, feature['accuracy.citation'] * 3)
+            - np.minimum(20, feature['accuracy.hedging'] * 2)
+        )
+        
+        engagement = _clip_scores(
+            (_indicator_scores(feature['engagement.positive'], feature['engagement.negative'])
+             + feature['style_engagement'] * 100) / 2
+            + np.minimum(15, feature['engagement.interactive'] * 3)
+            + np.minimum(10, feature['engagement.story'] * 2)
+        )
+        
+        weights = DIMENSION_WEIGHTS
+        overall = (
+            clarity * weights['clarity'] +
+            coherence * weights['coherence'] +
+            completeness * weights['completeness'] +
+            accuracy * weights['accuracy'] +
+            engagement * weights['engagement']
+        )
+        
+        return {
+            'clarity': clarity,
+            'coherence': coherence,
+            'completeness': completeness,
+            'accuracy': accuracy,
+            'engagement': engagement,
+            'overall': overall,
+        }
+    
+    def _calculate_clarity_score(self, content: TextMetrics) -> float:
         """Calculate clarity score based on content analysis."""
-        content_lower = content.lower()
+        matches = content.lexicon
         
         # Count positive and negative clarity indicators
-        positive_count = sum(1 for indicator in self.clarity_indicators['positive'] 
-                           if indicator in content_lower)
-        negative_count = sum(1 for indicator in self.clarity_indicators['negative'] 
-                           if indicator in content_lower)
+        positive_count = matches.distinct('clarity.positive')
+        negative_count = matches.distinct('clarity.negative')
         
         # Calculate clarity score
         total_indicators = positive_count + negative_count
@@ -126,27 +341,25 @@ class QualityScorer:
         
         # Adjust based on content characteristics
         # Check for long sentences (clarity issue)
-        sentences = re.split(r'[.!?]+', content)
-        long_sentences = sum(1 for s in sentences if len(s.split()) > 25)
+        long_sentences = sum(1 for length in content.sentence_lengths if length > LONG_SENTENCE_LENGTH)
         if long_sentences > 0:
             clarity_score -= min(20, long_sentences * 5)
         
         # Check for complex vocabulary (clarity issue)
-        complex_words = sum(1 for word in content.split() if len(word) > 12)
+        complex_words = content.long_token_count
         if complex_words > 0:
             clarity_score -= min(15, complex_words * 2)
         
         return max(0.0, min(100.0, clarity_score))
     
-    def _calculate_coherence_score(self, content: str, structure_analysis: Dict[str, Any]) -> float:
+    def _calculate_coherence_score(self, content: TextMetrics,
+                                    structure_analysis: Union[ContentStructure, Dict[str, Any]]) -> float:
         """Calculate coherence score based on content structure and flow."""
-        content_lower = content.lower()
+        matches = content.lexicon
         
         # Count positive and negative coherence indicators
-        positive_count = sum(1 for indicator in self.coherence_indicators['positive'] 
-                           if indicator in content_lower)
-        negative_count = sum(1 for indicator in self.coherence_indicators['negative'] 
-                           if indicator in content_lower)
+        positive_count = matches.distinct('coherence.positive')
+        negative_count = matches.distinct('coherence.negative')
         
         # Base coherence score
         total_indicators = positive_count + negative_count
@@ -157,31 +370,28 @@ class QualityScorer:
             base_score = coherence_ratio * 100
         
         # Adjust based on structure analysis
-        structure_score = structure_analysis.get('structure_score', 0.5) * 100
+        structure_score = _field(structure_analysis, 'structure_score', 0.5) * 100
         
         # Check for logical flow indicators
-        flow_indicators = ['first', 'second', 'third', 'next', 'then', 'finally', 'lastly']
-        flow_count = sum(1 for indicator in flow_indicators if indicator in content_lower)
+        flow_count = matches.distinct('coherence.flow')
         flow_bonus = min(10, flow_count * 2)
         
         # Check for transition words
-        transition_words = ['however', 'moreover', 'furthermore', 'additionally', 'in addition']
-        transition_count = sum(1 for word in transition_words if word in content_lower)
+        transition_count = matches.distinct('coherence.transition')
         transition_bonus = min(10, transition_count * 2)
         
         coherence_score = (base_score + structure_score) / 2 + flow_bonus + transition_bonus
         
         return max(0.0, min(100.0, coherence_score))
     
-    def _calculate_completeness_score(self, content: str, purpose_analysis: Dict[str, Any]) -> float:
+    def _calculate_completeness_score(self, content: TextMetrics,
+                                    purpose_analysis: Union[PurposeAnalysis, Dict[str, Any]]) -> float:
         """Calculate completeness score based on content coverage."""
-        content_lower = content.lower()
+        matches = content.lexicon
         
         # Count positive and negative completeness indicators
-        positive_count = sum(1 for indicator in self.completeness_indicators['positive'] 
-                           if indicator in content_lower)
-        negative_count = sum(1 for indicator in self.completeness_indicators['negative'] 
-                           if indicator in content_lower)
+        positive_count = matches.distinct('completeness.positive')
+        negative_count = matches.distinct('completeness.negative')
         
         # Base completeness score
         total_indicators = positive_count + negative_count
@@ -192,20 +402,10 @@ class QualityScorer:
             base_score = completeness_ratio * 100
         
         # Adjust based on content length and purpose
-        word_count = len(content.split())
-        purpose = purpose_analysis.get('purpose', 'informational')
-        
-        # Expected word count ranges by purpose
-        expected_ranges = {
-            'tutorial': (500, 2000),
-            'educational': (800, 3000),
-            'review': (600, 2500),
-            'technical': (1000, 4000),
-            'informational': (400, 2000),
-            'entertainment': (300, 1500)
-        }
+        word_count = content.token_count
+        purpose = _field(purpose_analysis, 'purpose', 'informational')
         
-        min_expected, max_expected = expected_ranges.get(purpose, (400, 2000))
+        min_expected, max_expected = EXPECTED_WORD_RANGES.get(purpose, DEFAULT_WORD_RANGE)
         
         if word_count < min_expected:
             # Penalize for being too short
@@ -217,26 +417,24 @@ class QualityScorer:
             base_score -= min(20, length_penalty)
         
         # Check for essential content elements
-        essential_elements = ['introduction', 'conclusion', 'summary']
-        if purpose in ['educational', 'tutorial', 'technical']:
-            essential_elements.extend(['example', 'explanation', 'step'])
+        essential_elements = list(ESSENTIAL_ELEMENTS)
+        if purpose in INSTRUCTIONAL_PURPOSES:
+            essential_elements.extend(INSTRUCTIONAL_ELEMENTS)
         
-        missing_elements = sum(1 for element in essential_elements if element not in content_lower)
+        missing_elements = sum(1 for element in essential_elements if not matches.has(element))
         element_penalty = missing_elements * 10
         
         completeness_score = base_score - element_penalty
         
         return max(0.0, min(100.0, completeness_score))
     
-    def _calculate_accuracy_score(self, content: str) -> float:
+    def _calculate_accuracy_score(self, content: TextMetrics) -> float:
         """Calculate accuracy score based on content analysis."""
-        content_lower = content.lower()
+        matches = content.lexicon
         
         # Count positive and negative accuracy indicators
-        positive_count = sum(1 for indicator in self.accuracy_indicators['positive'] 
-                           if indicator in content_lower)
-        negative_count = sum(1 for indicator in self.accuracy_indicators['negative'] 
-                           if indicator in content_lower)
+        positive_count = matches.distinct('accuracy.positive')
+        negative_count = matches.distinct('accuracy.negative')
         
         # Base accuracy score
         total_indicators = positive_count + negative_count
@@ -247,28 +445,25 @@ class QualityScorer:
             base_score = accuracy_ratio * 100
         
         # Check for citation and reference indicators
-        citation_indicators = ['according to', 'research shows', 'study', 'source', 'reference']
-        citation_count = sum(1 for indicator in citation_indicators if indicator in content_lower)
+        citation_count = matches.distinct('accuracy.citation')
         citation_bonus = min(15, citation_count * 3)
         
         # Check for hedging language (indicates uncertainty)
-        hedging_words = ['maybe', 'perhaps', 'possibly', 'might', 'could', 'seems', 'appears']
-        hedging_count = sum(1 for word in hedging_words if word in content_lower)
+        hedging_count = matches.distinct('accuracy.hedging')
         hedging_penalty = min(20, hedging_count * 2)
         
         accuracy_score = base_score + citation_bonus - hedging_penalty
         
         return max(0.0, min(100.0, accuracy_score))
     
-    def _calculate_engagement_score(self, content: str, style_analysis: Dict[str, Any]) -> float:
+    def _calculate_engagement_score(self, content: TextMetrics,
+                                    style_analysis: Union[StyleAnalysis, Dict[str, Any]]) -> float:
         """Calculate engagement score based on content and style analysis."""
-        content_lower = content.lower()
+        matches = content.lexicon
         
         # Count positive and negative engagement indicators
-        positive_count = sum(1 for indicator in self.engagement_indicators['positive'] 
-                           if indicator in content_lower)
-        negative_count = sum(1 for indicator in self.engagement_indicators['negative'] 
-                           if indicator in content_lower)
+        positive_count = matches.distinct('engagement.positive')
+        negative_count = matches.distinct('engagement.negative')
         
         # Base engagement score
         total_indicators = positive_count + negative_count
@@ -279,16 +474,14 @@ class QualityScorer:
             base_score = engagement_ratio * 100
         
         # Adjust based on style analysis
-        style_engagement = style_analysis.get('engagement_score', 0.5) * 100
+        style_engagement = _field(style_analysis, 'engagement_score', 0.5) * 100
         
         # Check for interactive elements
-        interactive_elements = ['question', 'think about', 'consider', 'imagine', 'suppose']
-        interactive_count = sum(1 for element in interactive_elements if element in content_lower)
+        interactive_count = matches.distinct('engagement.interactive')
         interactive_bonus = min(15, interactive_count * 3)
         
         # Check for storytelling elements
-        story_elements = ['story', 'example', 'case study', 'scenario', 'situation']
-        story_count = sum(1 for element in story_elements if element in content_lower)
+        story_count = matches.distinct('engagement.story')
         story_bonus = min(10, story_count * 2)
         
         engagement_score = (base_score + style_engagement) / 2 + interactive_bonus + story_bonus
@@ -298,14 +491,7 @@ class QualityScorer:
     def _calculate_overall_score(self, clarity: float, coherence: float, 
                                 completeness: float, accuracy: float, engagement: float) -> float:
         """Calculate overall quality score as weighted average."""
-        # Weights for different quality dimensions
-        weights = {
-            'clarity': 0.25,
-            'coherence': 0.20,
-            'completeness': 0.20,
-            'accuracy': 0.25,
-            'engagement': 0.10
-        }
+        weights = DIMENSION_WEIGHTS
         
         overall_score = (
             clarity * weights['clarity'] +
@@ -317,7 +503,7 @@ class QualityScorer:
         
         return round(overall_score, 1)
     
-    def _identify_quality_issues(self, content: str, clarity: float, coherence: float,
+    def _identify_quality_issues(self, content: TextMetrics, clarity: float, coherence: float,
                                 completeness: float, accuracy: float, engagement: float) -> List[str]:
         """Identify specific quality issues in the content."""
         issues = []
@@ -353,21 +539,22 @@ class QualityScorer:
             issues.append("Content could be more engaging and interactive")
         
         # Content-specific issues
-        if len(content.split()) < 200:
+        word_count = content.token_count
+        if word_count < 200:
             issues.append("Content is too short and may lack sufficient detail")
-        elif len(content.split()) > 5000:
+        elif word_count > 5000:
             issues.append("Content is very long and may lose reader attention")
         
         # Check for common writing issues
-        if content.count('!') > content.count('.') * 0.3:
+        if content.exclamation_count > content.period_count * 0.3:
             issues.append("Overuse of exclamation marks may seem unprofessional")
         
-        if content.count('?') == 0:
+        if content.question_count == 0:
             issues.append("No questions found - consider adding interactive elements")
         
         return issues
     
-    def _generate_improvement_suggestions(self, content: str, clarity: float, coherence: float,
+    def _generate_improvement_suggestions(self, content: TextMetrics, clarity: float, coherence: float,
                                         completeness: float, accuracy: float, engagement: float,
                                         issues: List[str]) -> List[str]:
         """Generate specific improvement suggestions."""
@@ -404,10 +591,10 @@ class QualityScorer:
             suggestions.append("Use varied sentence structures to maintain interest")
         
         # General improvements
-        if len(content.split()) < 500:
+        if content.token_count < 500:
             suggestions.append("Expand content with more detailed explanations")
         
-        if len(content.split()) > 3000:
+        if content.token_count > 3000:
             suggestions.append("Consider breaking content into multiple articles")
         
         return suggestions
@@ -2,9 +2,13 @@
 Question generator for generating purpose-based questions for content analysis.
 """
 
-import re
-from typing import List, Dict, Any
-from .models import PurposeAnalysis
+from functools import partial
+from typing import List, Union
+from .models import PurposeAnalysis, build_result
+from .tokenizer import TokenizedDocument
+from .lexicon import AUDIENCE_INDICATORS, CONTENT_TYPE_INDICATORS
+from .features import FeatureGraph
+from .metrics import TextMetrics, as_metrics
 
 
 class QuestionGenerator:
@@ -75,36 +79,49 @@ class QuestionGenerator:
             ]
         }
         
-        # Content type detection patterns
-        self.content_patterns = {
-            'tutorial': [
-                r'step\s*by\s*step', r'how\s*to', r'tutorial', r'guide', r'walkthrough',
-                r'instructions', r'procedure', r'process', r'steps', r'follow'
-            ],
-            'review': [
-                r'review', r'evaluation', r'assessment', r'analysis', r'comparison',
-                r'pros?\s*and\s*cons?', r'advantages?\s*and\s*disadvantages?', r'rating'
-            ],
-            'technical': [
-                r'technical', r'implementation', r'code', r'programming', r'development',
-                r'architecture', r'design', r'algorithm', r'framework', r'api'
-            ],
-            'educational': [
-                r'learn', r'education', r'teaching', r'learning', r'course', r'lesson',
-                r'concept', r'principle', r'theory', r'understanding', r'knowledge'
-            ],
-            'entertainment': [
-                r'fun', r'entertaining', r'story', r'anecdote', r'humor', r'joke',
-                r'interesting', r'fascinating', r'amazing', r'incredible'
-            ]
-        }
+        # Content type detection terms (matched through the shared lexicon automaton)
+        self.content_patterns = CONTENT_TYPE_INDICATORS
+        
+        self.features = self._build_features()
+    
+    def _build_features(self) -> FeatureGraph:
+        """Declare how each purpose feature is derived (each is computed once)."""
+        graph = FeatureGraph()
+        graph.add('content_type', self._detect_content_type, ['content'])
+        graph.add('actual_purpose', self._resolve_purpose, ['purpose', 'content_type'])
+        graph.add('purpose_questions', self._build_questions,
+                  ['content', 'actual_purpose', 'target_audience'])
+        graph.add('purpose_alignment', self._calculate_alignment, ['content_type', 'actual_purpose'])
+        graph.add('audience_appropriateness', self._analyze_audience_appropriateness,
+                  ['content', 'target_audience'])
+        graph.add('purpose_notes', self._generate_purpose_notes, [
+            'actual_purpose', 'target_audience', 'purpose_alignment',
+            'audience_appropriateness', 'content_type'
+        ])
+        graph.add_model('purpose_analysis', partial(build_result, PurposeAnalysis), {
+            'purpose': 'actual_purpose',
+            'target_audience': 'target_audience',
+            'content_type': 'content_type',
+            'purpose_alignment': 'purpose_alignment',
+            'audience_appropriateness': 'audience_appropriateness',
+            'purpose_questions': 'purpose_questions',
+            'purpose_notes': 'purpose_notes',
+        })
+        return graph
     
-    def generate_questions(self, content: str, purpose: str, target_audience: str) -> List[str]:
+    def generate_questions(self, content: Union[str, TokenizedDocument, TextMetrics], purpose: str,
+                           target_audience: str) -> List[str]:
         """Generate purpose-based questions for content analysis."""
+        content = as_metrics(content)
+        
         # Determine content type if not specified
         if purpose == 'auto':
             purpose = self._detect_content_type(content)
         
+        return self._build_questions(content, purpose, target_audience)
+    
+    def _build_questions(self, content: TextMetrics, purpose: str, target_audience: str) -> List[str]:
+        """Build the question list for a resolved purpose."""
         # Get base questions for the purpose
         base_questions = self.purpose_questions.get(purpose, self.purpose_questions['informational'])
         
@@ -121,15 +138,14 @@ class QuestionGenerator:
         unique_questions = list(dict.fromkeys(all_questions))
         return unique_questions[:15]  # Limit to 15 questions
     
-    def _detect_content_type(self, content: str) -> str:
+    def _detect_content_type(self, content: TextMetrics) -> str:
         """Detect content type based on content analysis."""
-        content_lower = content.lower()
+        matches = content.lexicon
         
         # Count matches for each content type
         type_scores = {}
-        for content_type, patterns in self.content_patterns.items():
-            score = sum(len(re.findall(pattern, content_lower)) for pattern in patterns)
-            type_scores[content_type] = score
+        for content_type in self.content_patterns:
+            type_scores[content_type] = matches.count(f'content_type.{content_type}')
         
         # Return the content type with highest score
         if type_scores:
@@ -137,6 +153,10 @@ class QuestionGenerator:
         else:
             return 'informational'
     
+    def _resolve_purpose(self, purpose: str, content_type: str) -> str:
+        """Resolve an 'auto' purpose to the detected content type."""
+        return content_type if purpose == 'auto' else purpose
+    
     def _generate_audience_questions(self, target_audience: str) -> List[str]:
         """Generate audience-specific questions."""
         audience_questions = {
@@ -180,40 +200,44 @@ class QuestionGenerator:
         
         return audience_questions.get(target_audience.lower(), [])
     
-    def _generate_content_specific_questions(self, content: str, purpose: str) -> List[str]:
+    def _generate_content_specific_questions(self, content: TextMetrics, purpose: str) -> List[str]:
         """Generate questions specific to the content characteristics."""
         questions = []
+        markers = content.markers
         
         # Analyze content length
-        word_count = len(content.split())
+        word_count = content.token_count
         if word_count < 500:
             questions.append("Is the content comprehensive enough for the topic?")
         elif word_count > 3000:
             questions.append("Is the content appropriately concise and focused?")
         
         # Analyze content structure
-        if '#' in content:
+        if '#' in markers:
             questions.append("How well does the content structure guide the reader?")
         
         # Analyze code presence
-        if '```' in content:
+        if '```' in markers:
             questions.append("How well do the code examples illustrate the concepts?")
         
         # Analyze links and references
-        if '[' in content and '](' in content:
+        if '[' in markers and '](' in markers:
             questions.append("How well do the references support the content?")
         
         # Analyze lists and bullet points
-        if any(marker in content for marker in ['- ', '* ', '+ ']):
+        if any(marker in markers for marker in ['- ', '* ', '+ ']):
             questions.append("How well do the lists organize and present information?")
         
         return questions
     
-    def analyze_purpose_alignment(self, content: str, stated_purpose: str) -> float:
+    def analyze_purpose_alignment(self, content: Union[str, TokenizedDocument, TextMetrics], stated_purpose: str) -> float:
         """Analyze how well content aligns with stated purpose."""
         # Detect actual content type
-        detected_type = self._detect_content_type(content)
-        
+        detected_type = self._detect_content_type(as_metrics(content))
+        return self._calculate_alignment(detected_type, stated_purpose)
+    
+    def _calculate_alignment(self, detected_type: str, stated_purpose: str) -> float:
+        """Score how well the detected content type matches the stated purpose."""
         # Calculate alignment score
         if detected_type == stated_purpose:
             return 1.0
@@ -235,76 +259,24 @@ class QuestionGenerator:
         
         return type2 in related_types.get(type1, []) or type1 in related_types.get(type2, [])
     
-    def generate_purpose_analysis(self, content: str, purpose: str, target_audience: str) -> PurposeAnalysis:
+    def generate_purpose_analysis(self, content: Union[str, TokenizedDocument, TextMetrics], purpose: str,
+                                  target_audience: str) -> PurposeAnalysis:
         """Generate comprehensive purpose analysis."""
-        # Determine actual purpose if auto-detection is requested
-        actual_purpose = purpose
-        if purpose == "auto":
-            actual_purpose = self._detect_content_type(content)
-        
-        # Generate questions
-        purpose_questions = self.generate_questions(content, actual_purpose, target_audience)
-        
-        # Analyze purpose alignment
-        purpose_alignment = self.analyze_purpose_alignment(content, actual_purpose)
-        
-        # Determine content type
-        content_type = self._detect_content_type(content)
-        
-        # Analyze audience appropriateness
-        audience_appropriateness = self._analyze_audience_appropriateness(content, target_audience)
-        
-        # Generate purpose notes
-        purpose_notes = self._generate_purpose_notes(content, actual_purpose, target_audience, purpose_alignment)
-        
-        return PurposeAnalysis(
-            purpose=actual_purpose,
-            target_audience=target_audience,
-            content_type=content_type,
-            purpose_alignment=purpose_alignment,
-            audience_appropriateness=audience_appropriateness,
-            purpose_questions=purpose_questions,
-            purpose_notes=purpose_notes
-        )
+        return self.features.evaluate({
+            'content': as_metrics(content),
+            'purpose': purpose,
+            'target_audience': target_audience
+        })['purpose_analysis']
     
-    def _analyze_audience_appropriateness(self, content: str, target_audience: str) -> float:
+    def _analyze_audience_appropriateness(self, content: TextMetrics, target_audience: str) -> float:
         """Analyze how appropriate the content is for the target audience."""
-        content_lower = content.lower()
-        
-        # Define audience-specific indicators
-        audience_indicators = {
-            'beginners': [
-                'introduction', 'basics', 'fundamentals', 'getting started', 'first time',
-                'simple', 'easy', 'basic', 'overview', 'prerequisites'
-            ],
-            'intermediate': [
-                'advanced', 'intermediate', 'experienced', 'deep dive', 'detailed',
-                'implementation', 'practical', 'hands-on', 'real-world'
-            ],
-            'advanced': [
-                'expert', 'advanced', 'complex', 'sophisticated', 'optimization',
-                'architecture', 'design patterns', 'best practices', 'performance'
-            ],
-            'developers': [
-                'code', 'programming', 'development', 'implementation', 'api',
-                'framework', 'library', 'debugging', 'testing', 'deployment'
-            ],
-            'managers': [
-                'strategy', 'business', 'management', 'leadership', 'team',
-                'project', 'planning', 'budget', 'timeline', 'stakeholder'
-            ],
-            'students': [
-                'learning', 'education', 'study', 'academic', 'research',
-                'theory', 'concept', 'principle', 'analysis', 'evaluation'
-            ]
-        }
-        
-        indicators = audience_indicators.get(target_audience.lower(), [])
+        audience = target_audience.lower()
+        indicators = AUDIENCE_INDICATORS.get(audience, [])
         if not indicators:
             return 0.5  # Neutral score for unknown audience
         
         # Count indicator matches
-        matches = sum(1 for indicator in indicators if indicator in content_lower)
+        matches = content.lexicon.distinct(f'audience.{audience}')
         max_matches = len(indicators)
         
         if max_matches == 0:
@@ -314,7 +286,8 @@ class QuestionGenerator:
         appropriateness = min(1.0, matches / max_matches * 2)  # Scale to 0-1
         return round(appropriateness, 3)
     
-    def _generate_purpose_notes(self, content: str, purpose: str, target_audience: str, alignment: float) -> List[str]:
+    def _generate_purpose_notes(self, purpose: str, target_audience: str, alignment: float,
+                                audience_score: float, detected_type: str) -> List[str]:
         """Generate notes about purpose analysis."""
         notes = []
         
@@ -327,7 +300,6 @@ class QuestionGenerator:
             notes.append("Content has weak alignment with stated purpose")
         
         # Audience appropriateness notes
-        audience_score = self._analyze_audience_appropriateness(content, target_audience)
         if audience_score >= 0.8:
             notes.append("Content is highly appropriate for target audience")
         elif audience_score >= 0.6:
@@ -336,7 +308,6 @@ class QuestionGenerator:
             notes.append("Content may not be well-suited for target audience")
         
         # Content type notes
-        detected_type = self._detect_content_type(content)
         if detected_type != purpose:
             notes.append(f"Content appears to be {detected_type} rather than {purpose}")
         
@@ -0,0 +1,91 @@
+"""
+Readability formulas computed from per-word syllable counts.
+
+Syllables are counted per word (not per text) with a bounded cache of
+recently seen words, and the per-word counts of a document are reduced as a
+NumPy array. The formulas only need four additive counts, so they also score
+many documents at once when given arrays of counts.
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple, Tuple, Union
+
+import numpy as np
+
+from .tokenizer import TokenizedDocument
+
+
+# Words seen recently keep their syllable count; common vocabulary stays cached
+SYLLABLE_CACHE_SIZE = 65536
+# Words with at least this many syllables count as polysyllabic (Fog, SMOG)
+POLYSYLLABLE_MIN = 3
+
+_VOWEL_GROUPS = re.compile(r'[aeiouy]+')
+
+Counts = Union[int, np.ndarray]
+
+
+class ReadabilityScores(NamedTuple):
+    """Readability scores of a text (or arrays of scores for many texts)."""
+    flesch_reading_ease: float
+    flesch_kincaid_grade: float
+    gunning_fog: float
+    smog_index: float
+
+    def as_dict(self) -> dict:
+        return {name: round(float(value), 2) for name, value in self._asdict().items()}
+
+
+@lru_cache(maxsize=SYLLABLE_CACHE_SIZE)
+def count_syllables(word: str) -> int:
+    """Approximate the syllables of one lowercase word."""
+    count = len(_VOWEL_GROUPS.findall(word))
+    # Silent trailing 'e'
+    if word.endswith('e'):
+        count -= 1
+    return max(1, count)
+
+
+def syllable_counts(document: TokenizedDocument) -> np.ndarray:
+    """Syllables of every word of a document, in order."""
+    return np.fromiter(
+        (count_syllables(word) for word in document.words(lower=True)),
+        dtype=np.int32,
+        count=document.word_count,
+    )
+
+
+def count_document_syllables(document: TokenizedDocument) -> Tuple[int, int]:
+    """Return the syllable and polysyllabic word counts of a document."""
+    counts = syllable_counts(document)
+    return int(counts.sum()), int(np.count_nonzero(counts >= POLYSYLLABLE_MIN))
+
+
+def readability_scores(word_count: Counts, sentence_count: Counts, syllable_count: Counts,
+                       polysyllable_count: Counts) -> ReadabilityScores:
+    """Compute Flesch, Flesch-Kincaid, Gunning Fog and SMOG in one pass.
+
+    Counts may be scalars or equally shaped arrays (one entry per document).
+    Texts without words or sentences score 0 everywhere.
+    """
+    words = np.asarray(word_count, dtype=np.float64)
+    sentences = np.asarray(sentence_count, dtype=np.float64)
+    syllables = np.asarray(syllable_count, dtype=np.float64)
+    polysyllables = np.asarray(polysyllable_count, dtype=np.float64)
+
+    valid = (words > 0) & (sentences > 0)
+    words_per_sentence = np.divide(words, sentences, out=np.zeros_like(words), where=valid)
+    syllables_per_word = np.divide(syllables, words, out=np.zeros_like(words), where=valid)
+    polysyllable_ratio = np.divide(polysyllables, words, out=np.zeros_like(words), where=valid)
+    polysyllables_per_sentence = np.divide(polysyllables, sentences, out=np.zeros_like(words), where=valid)
+
+    flesch = np.clip(206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word, 0.0, 100.0)
+    grade = np.maximum(0.0, 0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59)
+    fog = 0.4 * (words_per_sentence + 100.0 * polysyllable_ratio)
+    smog = 1.043 * np.sqrt(polysyllables_per_sentence * 30.0) + 3.1291
+
+    scores = [np.where(valid, score, 0.0) for score in (flesch, grade, fog, smog)]
+    if words.ndim == 0:
+        return ReadabilityScores(*(float(score) for score in scores))
+    return ReadabilityScores(*scores)
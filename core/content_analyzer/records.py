@@ -0,0 +1,73 @@
+"""
+Compact records for the parser's per-element outputs.
+
+Headings, links, images and code blocks are slotted objects instead of one
+dict each. They read like the dicts they replace (``link['url']``, ``in``,
+iteration over the keys, equality with a dict), so callers indexing by key
+keep working; ``as_dict`` converts at the serialization boundary.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional
+
+
+class Record(Mapping):
+    """Slotted record with read-only mapping access to its fields."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+    def __reduce__(self):
+        return type(self), tuple(getattr(self, name) for name in self.__slots__)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Heading(Record):
+    """A heading: its level (1-6), text and position among the headings and paragraphs."""
+
+    __slots__ = ('level', 'text', 'line_number')
+
+    def __init__(self, level: int, text: str, line_number: int):
+        self.level = level
+        self.text = text
+        self.line_number = line_number
+
+
+class Link(Record):
+    __slots__ = ('text', 'url')
+
+    def __init__(self, text: str, url: str):
+        self.text = text
+        self.url = url
+
+
+class Image(Record):
+    __slots__ = ('alt_text', 'url')
+
+    def __init__(self, alt_text: str, url: str):
+        self.alt_text = alt_text
+        self.url = url
+
+
+class CodeBlock(Record):
+    __slots__ = ('language', 'code')
+
+    def __init__(self, language: Optional[str], code: str):
+        self.language = language
+        self.code = code
@@ -0,0 +1,253 @@
+"""
+Section-level measurement so a revised article only re-measures the sections
+that changed.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TypeVar, Union
+
+from .markup import Token
+from .metrics import TextMetrics
+from .tokenizer import TokenizedDocument, iter_lines
+
+
+_TERMINATORS = '.!?'
+
+# Markdown markers a token kind stands for (the question generator reads raw markers)
+TOKEN_MARKERS = {
+    'heading': ('#',),
+    'code_block': ('```',),
+    'list_item': ('- ',),
+    'link': ('[', ']('),
+    'image': ('[', ']('),
+}
+
+SectionT = TypeVar('SectionT')
+
+
+def iter_sections(chunks: Iterable[str]) -> Iterator[str]:
+    """Group text into sections that can be measured independently.
+
+    ``chunks`` are consecutive pieces of the text that each end at a line
+    boundary: the whole text, lines read from a file, or the ``raw`` text of
+    streamed parser blocks. Only the current section is held in memory.
+
+    A section ends at a blank line that follows a sentence terminator outside
+    a code fence, so no word, sentence or lexicon term spans two sections.
+    Joining the sections gives back the text exactly.
+    """
+    pending: List[str] = []
+    after_blank = False
+    closed = False
+    in_code_block = False
+
+    for chunk in chunks:
+        for line in iter_lines(chunk):
+            stripped = line.strip()
+            if not stripped:
+                after_blank = True
+            else:
+                if after_blank and closed and pending:
+                    yield ''.join(pending)
+                    pending = []
+                after_blank = False
+                if line.startswith('```'):
+                    in_code_block = not in_code_block
+                closed = not in_code_block and stripped[-1] in _TERMINATORS
+            pending.append(line)
+
+    yield ''.join(pending)
+
+
+def iter_token_sections(tokens: Iterable[Token]) -> Iterator[List[Token]]:
+    """Group a token stream (e.g. from ``lex_html``) into independently measurable sections.
+
+    A section ends before a block that follows a prose block ending with a
+    sentence terminator, the rule ``iter_sections`` applies to markdown.
+    """
+    pending: List[Token] = []
+    closed = False
+
+    for token in tokens:
+        if token.kind not in ('link', 'image'):
+            if closed and pending:
+                yield pending
+                pending = []
+            closed = token.kind != 'code_block' and token.text[-1:] in tuple(_TERMINATORS)
+        pending.append(token)
+
+    if pending:
+        yield pending
+
+
+def split_sections(text: str) -> List[str]:
+    """Split text into independently measurable sections (see ``iter_sections``)."""
+    return list(iter_sections([text]))
+
+
+def section_key(section: str) -> bytes:
+    """Hash of a section's text, used as its cache key."""
+    return hashlib.blake2b(section.encode('utf-8'), digest_size=16).digest()
+
+
+def token_section_key(section: Sequence[Token]) -> bytes:
+    """Hash of a token section's kinds and texts, used as its cache key."""
+    return section_key('\0'.join(f'{token.kind}\1{token.text}' for token in section))
+
+
+@dataclass
+class SectionMetrics:
+    """Raw markdown and prose metrics of one section or of merged sections."""
+    raw: TextMetrics
+    prose: TextMetrics
+    sections: int = 1
+    reused: int = 0
+
+    @classmethod
+    def merge(cls, parts: Iterable['SectionMetrics']) -> 'SectionMetrics':
+        merged = cls(TextMetrics(), TextMetrics(), sections=0)
+        for part in parts:
+            merged.add(part)
+        return merged
+
+    def add(self, other: 'SectionMetrics') -> 'SectionMetrics':
+        """Accumulate the metrics of the following section, in place."""
+        self.raw.add(other.raw)
+        self.prose.add(other.prose)
+        self.sections += other.sections
+        self.reused += other.reused
+        return self
+
+
+class SectionCache:
+    """Thread-safe LRU of section metrics keyed by section hash.
+
+    Entries depend on the style analyzer that measured them (its technical
+    vocabulary), so a cache should not be shared between differently
+    configured analyzers.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, SectionMetrics]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: bytes) -> Optional[SectionMetrics]:
+        with self._lock:
+            metrics = self._entries.get(key)
+            if metrics is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return metrics
+
+    def put(self, key: bytes, metrics: SectionMetrics) -> None:
+        with self._lock:
+            self._entries[key] = metrics
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+            }
+
+
+def measure_section(section: str, style_analyzer: Any) -> SectionMetrics:
+    """Measure one section's raw text and its prose."""
+    return SectionMetrics(
+        raw=TextMetrics.from_document(TokenizedDocument.from_text(section)),
+        prose=style_analyzer.measure(section),
+    )
+
+
+def measure_token_section(section: Sequence[Token], style_analyzer: Any) -> SectionMetrics:
+    """Measure one token section: the text of all its blocks, and of its prose blocks.
+
+    Each block is followed by a blank line, as in the text ``lex_html``
+    builds. The raw markers are those the tokens stand for.
+    """
+    blocks = [token for token in section if token.kind not in ('link', 'image')]
+    raw = TextMetrics.from_document(TokenizedDocument.from_text(
+        ''.join(token.text + '\n\n' for token in blocks)
+    ))
+    raw.markers = frozenset(marker for token in section for marker in TOKEN_MARKERS.get(token.kind, ()))
+    prose = ''.join(token.text + '\n\n' for token in blocks if token.kind != 'code_block')
+    return SectionMetrics(raw=raw, prose=style_analyzer.measure_prose(prose))
+
+
+def _measure_cached(sections: Iterable[SectionT], measure: Callable[[SectionT], SectionMetrics],
+                    key: Callable[[SectionT], bytes], cache: Optional[SectionCache],
+                    checkpoint: Optional[Callable[[], None]] = None) -> SectionMetrics:
+    """Measure sections, reusing cached ones, and merge them.
+
+    ``checkpoint`` is called before each section, e.g. to stop a timed out run.
+    """
+    merged = SectionMetrics(TextMetrics(), TextMetrics(), sections=0)
+    for section in sections:
+        if checkpoint is not None:
+            checkpoint()
+        if cache is None:
+            merged.add(measure(section))
+            continue
+
+        section_id = key(section)
+        metrics = cache.get(section_id)
+        if metrics is None:
+            metrics = measure(section)
+            cache.put(section_id, metrics)
+            merged.add(metrics)
+        else:
+            merged.add(metrics)
+            merged.reused += 1
+
+    return merged
+
+
+def measure_sections(content: Union[str, Iterable[str]], style_analyzer: Any,
+                     cache: Optional[SectionCache] = None,
+                     checkpoint: Optional[Callable[[], None]] = None) -> SectionMetrics:
+    """Measure every section, reusing cached sections, and merge them.
+
+    ``content`` is either the text or an iterable of line-aligned chunks (see
+    ``iter_sections``), e.g. an open file or streamed block ``raw`` texts.
+    """
+    chunks = [content] if isinstance(content, str) else content
+    return _measure_cached(
+        iter_sections(chunks),
+        lambda section: measure_section(section, style_analyzer),
+        section_key,
+        cache,
+        checkpoint,
+    )
+
+
+def measure_token_sections(tokens: Iterable[Token], style_analyzer: Any,
+                           cache: Optional[SectionCache] = None,
+                           checkpoint: Optional[Callable[[], None]] = None) -> SectionMetrics:
+    """Measure a token stream (HTML input) section by section, reusing cached sections."""
+    return _measure_cached(
+        iter_token_sections(tokens),
+        lambda section: measure_token_section(section, style_analyzer),
+        token_section_key,
+        cache,
+        checkpoint,
+    )
@@ -2,28 +2,32 @@
 Content structure analyzer for analyzing headings, sections, and content metrics.
 """
 
-import re
-from typing import Dict, Any, List
-from .models import ContentStructure
+from typing import Dict, Any, List, Optional, Union
+from .models import ContentStructure, build_result
+from .tokenizer import TokenizedDocument
+from .metrics import TextMetrics, as_metrics
 
 
 class ContentStructureAnalyzer:
     """Analyzer for content structure and metrics."""
     
     def __init__(self):
-        self.sentence_end_pattern = re.compile(r'[.!?]+')
-        self.word_pattern = re.compile(r'\b\w+\b')
-        self.complex_word_pattern = re.compile(r'\b\w{7,}\b')
         self.avg_words_per_sentence = 15  # Industry standard
     
-    def analyze_structure(self, parsed_content: Dict[str, Any]) -> ContentStructure:
-        """Analyze content structure and generate metrics."""
-        content = parsed_content['content']
+    def analyze_structure(self, parsed_content: Dict[str, Any],
+                          metrics: Optional[TextMetrics] = None) -> ContentStructure:
+        """Analyze content structure and generate metrics.
+        
+        ``metrics`` (raw text metrics, e.g. merged from cached sections) is
+        measured from the parsed content when not given.
+        """
         structure = parsed_content['structure']
+        if metrics is None:
+            metrics = as_metrics(parsed_content.get('document') or parsed_content['content'])
         
         # Calculate basic metrics
-        total_words = self._count_words(content)
-        total_sentences = self._count_sentences(content)
+        total_words = self._count_words(metrics)
+        total_sentences = self._count_sentences(metrics)
         total_paragraphs = len(structure['paragraphs'])
         
         # Extract headings
@@ -36,12 +40,13 @@ class ContentStructureAnalyzer:
         reading_time_minutes = self._calculate_reading_time(total_words)
         
         # Calculate complexity score
-        complexity_score = self._calculate_complexity_score(content, total_words, total_sentences)
+        complexity_score = self._calculate_complexity_score(metrics, total_words, total_sentences)
         
         # Calculate structure score
         structure_score = self._calculate_structure_score(structure)
         
-        return ContentStructure(
+        return build_result(
+            ContentStructure,
             total_words=total_words,
             total_sentences=total_sentences,
             total_paragraphs=total_paragraphs,
@@ -52,23 +57,15 @@ class ContentStructureAnalyzer:
             structure_score=structure_score
         )
     
-    def _count_words(self, content: str) -> int:
+    def _count_words(self, content: Union[str, TokenizedDocument, TextMetrics]) -> int:
         """Count words in content."""
         # Count words directly from content (keeping markdown formatting)
-        words = self.word_pattern.findall(content)
-        # Filter out empty strings
-        words = [word for word in words if word.strip()]
-        return len(words)
+        return as_metrics(content).word_count
     
-    def _count_sentences(self, content: str) -> int:
+    def _count_sentences(self, content: Union[str, TokenizedDocument, TextMetrics]) -> int:
         """Count sentences in content."""
         # Count sentences directly from content (keeping markdown formatting)
-        sentences = self.sentence_end_pattern.split(content)
-        # Filter out empty sentences
-        sentences = [s.strip() for s in sentences if s.strip()]
-        return len(sentences)
-    
-
+        return as_metrics(content).sentence_count
     
     def _analyze_sections(self, structure: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Analyze content sections based on headings."""
@@ -134,7 +131,8 @@ class ContentStructureAnalyzer:
         words_per_minute = 225
         return round(word_count / words_per_minute, 1)
     
-    def _calculate_complexity_score(self, content: str, total_words: int, total_sentences: int) -> float:
+    def _calculate_complexity_score(self, content: Union[str, TokenizedDocument, TextMetrics],
+                                    total_words: int, total_sentences: int) -> float:
         """Calculate content complexity score (0-1)."""
         if total_words == 0 or total_sentences == 0:
             return 0.0
@@ -143,7 +141,7 @@ class ContentStructureAnalyzer:
         avg_sentence_length = total_words / total_sentences
         
         # Calculate percentage of complex words (7+ characters)
-        complex_words = len(self.complex_word_pattern.findall(content))
+        complex_words = as_metrics(content).complex_word_count
         complex_word_ratio = complex_words / total_words if total_words > 0 else 0
         
         # Calculate complexity score based on multiple factors
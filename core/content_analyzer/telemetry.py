@@ -0,0 +1,121 @@
+"""
+Process-wide latency histograms of the analysis pipeline stages.
+
+Every analysis records how long each stage took and how large its input was
+in ``AnalysisResults.metadata``; the histograms aggregate those timings by
+stage and document size bucket for monitoring.
+"""
+
+import bisect
+import threading
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+from .models import AnalysisResults
+
+
+# Upper bounds (inclusive) of the latency buckets, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Document size buckets: (label, maximum word count)
+SIZE_BUCKETS = (
+    ('<1k', 1000),
+    ('1k-5k', 5000),
+    ('5k-20k', 20000),
+    ('20k-100k', 100000),
+    ('>100k', None),
+)
+
+
+def size_bucket(words: int) -> str:
+    """Label of the size bucket a document with ``words`` words falls into."""
+    for label, limit in SIZE_BUCKETS:
+        if limit is None or words <= limit:
+            return label
+    return SIZE_BUCKETS[-1][0]
+
+
+class LatencyHistogram:
+    """Cumulative-style latency histogram (counts per upper bound, sum, count)."""
+
+    __slots__ = ('bounds', 'counts', 'count', 'total_seconds', 'max_seconds')
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        # One count per bound plus the overflow (+Inf) bucket
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        buckets['+Inf'] = self.count
+        return {
+            'count': self.count,
+            'sum_seconds': round(self.total_seconds, 6),
+            'max_seconds': round(self.max_seconds, 6),
+            'buckets': buckets,
+        }
+
+
+class StageLatency:
+    """Thread-safe histograms keyed by (stage, size bucket)."""
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, words: int, seconds: float) -> None:
+        key = (stage, size_bucket(words))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram(self.bounds)
+            histogram.observe(seconds)
+
+    def observe_timings(self, timings: Mapping[str, float], words: int) -> None:
+        """Record the stage timings of one analysis."""
+        for stage, seconds in timings.items():
+            self.observe(stage, words, seconds)
+
+    def observe_results(self, results: AnalysisResults) -> None:
+        """Record the stage timings stored in analysis results (not cache hits)."""
+        metadata = results.metadata
+        if metadata.get('cache_hit') or 'stage_timings' not in metadata:
+            return
+        self.observe_timings(metadata['stage_timings'], metadata.get('input', {}).get('words', 0))
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Histograms as ``{stage: {size_bucket: histogram}}``."""
+        with self._lock:
+            snapshot: Dict[str, Dict[str, Any]] = {}
+            for (stage, bucket), histogram in sorted(self._histograms.items()):
+                snapshot.setdefault(stage, {})[bucket] = histogram.to_dict()
+            return snapshot
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+
+# Histograms of every analyzer in this process
+stage_latency = StageLatency()
+
+
+def get_stage_latency(stage: Optional[str] = None) -> Dict[str, Any]:
+    """Snapshot of the process-wide stage latency histograms."""
+    snapshot = stage_latency.snapshot()
+    if stage is not None:
+        return {stage: snapshot.get(stage, {})}
+    return snapshot
@@ -0,0 +1,226 @@
+"""
+Single-pass tokenizer producing a compact document shared by all analyzers.
+"""
+
+import re
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+
+# Block kinds recorded by the parser (stored in a compact byte array)
+BLOCK_PARAGRAPH = 0
+BLOCK_HEADING = 1
+BLOCK_LIST_ITEM = 2
+BLOCK_CODE = 3
+BLOCK_BLOCKQUOTE = 4
+
+# One alternation covers every token class the analyzers care about:
+# 1 = word, 2 = sentence terminator run, 3 = paragraph break, 4 = other symbols
+_TOKEN_PATTERN = re.compile(r'(\w+)|([.!?]+)|(\n\s*\n)|([^\w\s.!?]+)')
+_WORD, _TERMINATOR, _PARAGRAPH_BREAK = 1, 2, 3
+
+
+class TokenizedDocument:
+    """Offset arrays for the words, sentences, paragraphs and blocks of a text.
+
+    Sentence semantics match ``re.split(r'[.!?]+', text)`` with empty segments
+    dropped, words match ``\\b\\w+\\b`` and tokens match ``str.split()``, so
+    analyzers can read counts without re-tokenizing the text.
+    """
+
+    __slots__ = (
+        'text',
+        'word_starts',
+        'word_ends',
+        'sentence_starts',
+        'sentence_ends',
+        'sentence_lengths',
+        'segment_count',
+        'token_lengths',
+        'paragraph_starts',
+        'paragraph_ends',
+        'block_starts',
+        'block_ends',
+        'block_kinds',
+        'derived',
+        '_lower',
+    )
+
+    def __init__(self, text: str):
+        self.text = text
+        self.word_starts = array('l')
+        self.word_ends = array('l')
+        self.sentence_starts = array('l')
+        self.sentence_ends = array('l')
+        # Number of whitespace-separated tokens in each sentence
+        self.sentence_lengths = array('l')
+        # Number of raw segments produced by splitting on terminators
+        self.segment_count = 1
+        # Length of every whitespace-separated token
+        self.token_lengths = array('l')
+        self.paragraph_starts = array('l')
+        self.paragraph_ends = array('l')
+        self.block_starts = array('l')
+        self.block_ends = array('l')
+        self.block_kinds = array('b')
+        # Per-document cache for values derived from the tokens (lexicon matches, etc.)
+        self.derived: Dict[str, Any] = {}
+        self._lower: Optional[str] = None
+
+    @classmethod
+    def from_text(cls, text: str,
+                  blocks: Optional[Iterable[Tuple[int, int, int]]] = None) -> 'TokenizedDocument':
+        """Tokenize text in a single scan."""
+        document = cls(text)
+        word_starts = document.word_starts
+        word_ends = document.word_ends
+        token_lengths = document.token_lengths
+
+        token_start = token_end = -1
+        sentence_start = sentence_end = -1
+        sentence_pieces = 0
+        piece_end = -1
+        paragraph_start = paragraph_end = -1
+        terminators = 0
+
+        for match in _TOKEN_PATTERN.finditer(text):
+            kind = match.lastindex
+            start, end = match.span()
+
+            if kind == _PARAGRAPH_BREAK:
+                if paragraph_start >= 0:
+                    document.paragraph_starts.append(paragraph_start)
+                    document.paragraph_ends.append(paragraph_end)
+                    paragraph_start = -1
+                continue
+
+            # Adjacent non-whitespace matches belong to the same token
+            if start != token_end:
+                if token_start >= 0:
+                    token_lengths.append(token_end - token_start)
+                token_start = start
+            token_end = end
+
+            if paragraph_start < 0:
+                paragraph_start = start
+            paragraph_end = end
+
+            if kind == _TERMINATOR:
+                terminators += 1
+                if sentence_start >= 0:
+                    document.sentence_starts.append(sentence_start)
+                    document.sentence_ends.append(sentence_end)
+                    document.sentence_lengths.append(sentence_pieces)
+                    sentence_start = -1
+                piece_end = -1
+                continue
+
+            if kind == _WORD:
+                word_starts.append(start)
+                word_ends.append(end)
+
+            if sentence_start < 0:
+                sentence_start = start
+                sentence_pieces = 0
+            if start != piece_end:
+                sentence_pieces += 1
+            piece_end = end
+            sentence_end = end
+
+        if token_start >= 0:
+            token_lengths.append(token_end - token_start)
+        if sentence_start >= 0:
+            document.sentence_starts.append(sentence_start)
+            document.sentence_ends.append(sentence_end)
+            document.sentence_lengths.append(sentence_pieces)
+        if paragraph_start >= 0:
+            document.paragraph_starts.append(paragraph_start)
+            document.paragraph_ends.append(paragraph_end)
+        document.segment_count = terminators + 1
+
+        if blocks:
+            for start, end, kind in blocks:
+                document.block_starts.append(start)
+                document.block_ends.append(end)
+                document.block_kinds.append(kind)
+
+        return document
+
+    @property
+    def lower(self) -> str:
+        """Lowercased text, computed once."""
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def word_count(self) -> int:
+        return len(self.word_starts)
+
+    @property
+    def sentence_count(self) -> int:
+        return len(self.sentence_starts)
+
+    @property
+    def token_count(self) -> int:
+        return len(self.token_lengths)
+
+    @property
+    def paragraph_count(self) -> int:
+        return len(self.paragraph_starts)
+
+    def count_words(self, min_length: int) -> int:
+        """Count words with at least ``min_length`` characters."""
+        return sum(1 for start, end in zip(self.word_starts, self.word_ends)
+                   if end - start >= min_length)
+
+    def words(self, lower: bool = False) -> List[str]:
+        """Return the word tokens of the document."""
+        text = self.text
+        if lower:
+            # Lowercase per word; lowercasing the whole text can shift offsets
+            return [text[start:end].lower() for start, end in zip(self.word_starts, self.word_ends)]
+        return [text[start:end] for start, end in zip(self.word_starts, self.word_ends)]
+
+    def sentences(self) -> List[str]:
+        """Return the stripped text of every sentence."""
+        text = self.text
+        return [text[start:end] for start, end in zip(self.sentence_starts, self.sentence_ends)]
+
+    def paragraphs(self) -> List[str]:
+        """Return the text of every blank-line separated paragraph."""
+        text = self.text
+        return [text[start:end] for start, end in zip(self.paragraph_starts, self.paragraph_ends)]
+
+    def blocks(self, kind: Optional[int] = None) -> List[str]:
+        """Return the text of parser blocks, optionally filtered by kind."""
+        text = self.text
+        return [
+            text[start:end]
+            for start, end, block_kind in zip(self.block_starts, self.block_ends, self.block_kinds)
+            if kind is None or block_kind == kind
+        ]
+
+
+def as_document(content: Union[str, TokenizedDocument]) -> TokenizedDocument:
+    """Return a tokenized document for either raw text or an existing document."""
+    if isinstance(content, TokenizedDocument):
+        return content
+    return TokenizedDocument.from_text(content)
+
+
+def iter_lines(text: str) -> Iterator[str]:
+    """Yield the lines of a text, each keeping its trailing newline.
+
+    Only ``\\n`` ends a line (like ``str.split('\\n')``, unlike ``splitlines``),
+    which matches how lines are read from a text-mode file.
+    """
+    start = 0
+    while True:
+        end = text.find('\n', start)
+        if end < 0:
+            if start < len(text):
+                yield text[start:]
+            return
+        yield text[start:end + 1]
+        start = end + 1
@@ -0,0 +1,92 @@
+"""
+Hashed vocabulary lookup for matching term lists against the token stream.
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple, Union
+
+from .tokenizer import TokenizedDocument
+
+
+DATA_DIR = Path(__file__).parent / 'data'
+TECHNICAL_VOCABULARY_PATH = DATA_DIR / 'technical_vocabulary.txt'
+
+_TERM_WORD_PATTERN = re.compile(r'\w+')
+
+
+class Vocabulary:
+    """Set of single-word terms plus a first-word index of multi-word terms.
+
+    Matching walks the document's words once; at each position the longest
+    multi-word term wins and its words are consumed, so terms never overlap.
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        self.words = set()
+        self.phrases: Dict[str, List[Tuple[str, ...]]] = {}
+
+        for term in terms:
+            words = tuple(_TERM_WORD_PATTERN.findall(term.lower()))
+            if len(words) == 1:
+                self.words.add(words[0])
+            elif words:
+                candidates = self.phrases.setdefault(words[0], [])
+                if words not in candidates:
+                    candidates.append(words)
+
+        for candidates in self.phrases.values():
+            candidates.sort(key=len, reverse=True)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> 'Vocabulary':
+        """Load a vocabulary with one term per line ('#' starts a comment line)."""
+        with open(path, 'r', encoding='utf-8') as f:
+            terms = [line.strip() for line in f]
+        return cls(term for term in terms if term and not term.startswith('#'))
+
+    def __len__(self) -> int:
+        return len(self.words) + sum(len(candidates) for candidates in self.phrases.values())
+
+    def __contains__(self, term: str) -> bool:
+        words = tuple(_TERM_WORD_PATTERN.findall(term.lower()))
+        if len(words) == 1:
+            return words[0] in self.words
+        return words in self.phrases.get(words[0], []) if words else False
+
+    def count(self, document: TokenizedDocument) -> int:
+        """Count non-overlapping term occurrences in the document's words."""
+        words = document.words(lower=True)
+        vocabulary, phrases = self.words, self.phrases
+        count = 0
+        index = 0
+        total = len(words)
+
+        while index < total:
+            word = words[index]
+            candidates = phrases.get(word)
+            if candidates:
+                for phrase in candidates:
+                    end = index + len(phrase)
+                    if end <= total and tuple(words[index:end]) == phrase:
+                        count += 1
+                        index = end
+                        break
+                else:
+                    if word in vocabulary:
+                        count += 1
+                    index += 1
+                continue
+
+            if word in vocabulary:
+                count += 1
+            index += 1
+
+        return count
+
+
+@lru_cache(maxsize=None)
+def get_technical_vocabulary() -> Vocabulary:
+    """Return the bundled technical vocabulary, loaded once per process."""
+    return Vocabulary.from_file(TECHNICAL_VOCABULARY_PATH)
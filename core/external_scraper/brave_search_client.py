@@ -12,12 +12,22 @@ from urllib.parse import urlparse, quote_plus
 
 from .models import ScrapingError
 from .rate_limiter import RateLimiter, RateLimit
+from .rate_limit_backends import RateLimitBackend
 
 logger = logging.getLogger(__name__)
 
 
 class BraveSearchResult:
-    """Result from Brave Search API."""
+    """Result from Brave Search API.
+    
+    Slotted, as search batches create many of these; ``to_dict`` converts a
+    result for serialization.
+    """
+    
+    __slots__ = (
+        'title', 'url', 'description', 'published_date', 'language',
+        'family_friendly', 'type', 'age', 'rank'
+    )
     
     def __init__(self, data: Dict[str, Any]):
         self.title = data.get('title', '')
@@ -29,18 +39,23 @@ class BraveSearchResult:
         self.type = data.get('type', 'web')
         self.age = data.get('age')
         self.rank = data.get('rank', 0)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the result to a dict."""
+        return {name: getattr(self, name) for name in self.__slots__}
 
 
 class BraveSearchClient:
     """Client for Brave Search API."""
     
-    def __init__(self, api_key: str, base_url: str = "https://api.search.brave.com"):
+    def __init__(self, api_key: str, base_url: str = "https://api.search.brave.com",
+                 rate_limit_backend: Optional[RateLimitBackend] = None):
         self.api_key = api_key
         self.base_url = base_url.rstrip('/')
         self.session: Optional[aiohttp.ClientSession] = None
         
         # Rate limiting: 30 requests per minute for free tier
-        self.rate_limiter = RateLimiter(RateLimit(requests_per_minute=30))
+        self.rate_limiter = RateLimiter(RateLimit(requests_per_minute=30), rate_limit_backend)
         
         # Default headers
         self.headers = {
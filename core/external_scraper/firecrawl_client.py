@@ -12,6 +12,8 @@ from urllib.parse import urlparse
 
 from .models import ScrapingError, ScrapingResult, ContentType, ContentMetadata
 from .rate_limiter import RateLimiter, RateLimit
+from .rate_limit_backends import RateLimitBackend
+from .response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -19,13 +21,18 @@ logger = logging.getLogger(__name__)
 class FirecrawlClient:
     """Client for Firecrawl MCP web scraping service."""
     
-    def __init__(self, api_key: str, base_url: str = "https://api.firecrawl.dev"):
+    def __init__(self, api_key: str, base_url: str = "https://api.firecrawl.dev",
+                 rate_limit_backend: Optional[RateLimitBackend] = None,
+                 response_cache: Optional[ResponseCache] = None):
         self.api_key = api_key
         self.base_url = base_url.rstrip('/')
         self.session: Optional[aiohttp.ClientSession] = None
         
         # Rate limiting: 60 requests per minute
-        self.rate_limiter = RateLimiter(RateLimit(requests_per_minute=60))
+        self.rate_limiter = RateLimiter(RateLimit(requests_per_minute=60), rate_limit_backend)
+        
+        # Cached responses, served until they expire
+        self.response_cache = response_cache
         
         # Default headers
         self.headers = {
@@ -55,9 +62,6 @@ class FirecrawlClient:
         start_time = datetime.now()
         
         try:
-            # Apply rate limiting
-            await self.rate_limiter.acquire("firecrawl")
-            
             # Prepare request payload
             payload = {
                 "url": url,
@@ -74,6 +78,15 @@ class FirecrawlClient:
             if options:
                 payload["pageOptions"].update(options)
             
+            # Serve a cached page without spending quota
+            if self.response_cache:
+                data = await self.response_cache.get(url, payload["pageOptions"])
+                if data is not None:
+                    return await self._process_scraping_response(data, url, start_time)
+            
+            # Apply rate limiting
+            await self.rate_limiter.acquire("firecrawl")
+            
             # Make request
             async with self.session.post(
                 f"{self.base_url}/scrape",
@@ -81,6 +94,8 @@ class FirecrawlClient:
             ) as response:
                 if response.status == 200:
                     data = await response.json()
+                    if self.response_cache and data.get('markdown'):
+                        await self.response_cache.put(url, payload["pageOptions"], data)
                     return await self._process_scraping_response(data, url, start_time)
                 else:
                     error_text = await response.text()
@@ -276,6 +291,12 @@ class FirecrawlClient:
         """Get current rate limit status."""
         return self.rate_limiter.get_stats("firecrawl")
     
+    def get_cache_status(self) -> Dict[str, Any]:
+        """Get response cache statistics."""
+        if not self.response_cache:
+            return {'enabled': False}
+        return self.response_cache.get_stats()
+    
     def is_url_supported(self, url: str) -> bool:
         """Check if a URL is supported by Firecrawl."""
         try:
@@ -74,7 +74,11 @@ class ScrapingConfig(BaseModel):
     rate_limit_requests_per_minute: int = Field(default=60, description="Requests per minute limit")
     max_retries: int = Field(default=3, description="Maximum retry attempts for failed requests")
     timeout_seconds: int = Field(default=30, description="Request timeout in seconds")
-    delay_between_requests: float = Field(default=1.0, description="Delay between requests in seconds")
+    delay_between_requests: float = Field(default=1.0, description="Delay between requests to the same host in seconds")
+    max_concurrent_requests: int = Field(default=5, ge=1, description="Number of URLs fetched concurrently")
+    max_requests_per_host: int = Field(default=2, ge=1, description="Concurrent requests allowed per host")
+    domain_delays: Dict[str, float] = Field(default={}, description="Per-domain delay overriding delay_between_requests")
+    domain_concurrency: Dict[str, int] = Field(default={}, description="Per-domain concurrency overriding max_requests_per_host")
     user_agent: str = Field(
         default="BlogReviewer/1.0 (https://github.com/blog-reviewer; contact@example.com)",
         description="User agent string for requests"
@@ -0,0 +1,345 @@
+"""
+Per-host politeness for scraping jobs.
+
+``HostScheduler`` hands a job's URLs to its workers host by host. Each host
+gets at most a configured number of requests in flight and a minimum delay
+between request starts: the configured delay or the site's robots.txt
+``Crawl-delay``, whichever is longer. Fetching robots.txt counts as a
+request to the host like any other. Hosts take turns, so a job that mixes
+many sites keeps every worker busy while no single site gets more than its
+share.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, Deque, Dict, Iterable, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import aiohttp
+
+from .models import ScrapingConfig
+
+logger = logging.getLogger(__name__)
+
+
+# How long fetched robots.txt rules are reused
+ROBOTS_CACHE_TTL = 24 * 3600
+ROBOTS_CACHE_SIZE = 1024
+ROBOTS_TIMEOUT_SECONDS = 10
+# How often idle hosts are dropped from the scheduler's state
+HOST_PRUNE_INTERVAL = 60.0
+# Upper bound for a robots.txt Crawl-delay, so one site cannot stall a job
+MAX_CRAWL_DELAY = 60.0
+
+
+def url_host(url: str) -> Tuple[str, str]:
+    """Return the ``(host, origin)`` of a URL; the host includes the port."""
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    return host, f"{parsed.scheme}://{host}"
+
+
+def _domain_setting(host: str, settings: Dict[str, float], default):
+    """Setting of the most specific configured domain that ``host`` belongs to."""
+    hostname = host.split(':', 1)[0]
+    best = None
+    for domain in settings:
+        domain_name = domain.lower()
+        if hostname == domain_name or hostname.endswith('.' + domain_name):
+            if best is None or len(domain_name) > len(best):
+                best = domain_name
+                value = settings[domain]
+    return default if best is None else value
+
+
+class RobotsCache:
+    """robots.txt rules per origin, fetched once and reused for ``ttl`` seconds.
+
+    At most ``max_entries`` origins are kept, least recently used first out.
+    Sites without a readable robots.txt (missing, erroring or unreachable)
+    get rules that allow everything. ``fetch`` is called with the origin and
+    the user agent the rules will be checked for.
+    """
+
+    def __init__(
+        self,
+        user_agent: str = ScrapingConfig.model_fields['user_agent'].default,
+        ttl: float = ROBOTS_CACHE_TTL,
+        fetch: Optional[Callable[[str, str], Awaitable[Optional[str]]]] = None,
+        max_entries: int = ROBOTS_CACHE_SIZE
+    ):
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.fetch = fetch or self._fetch_robots
+        self.max_entries = max_entries
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._entries: "OrderedDict[str, Tuple[float, RobotFileParser]]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def peek(self, origin: str) -> Optional[RobotFileParser]:
+        """Cached rules of an origin, or None if they are not loaded or expired."""
+        entry = self._entries.get(origin)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            return None
+        self._entries.move_to_end(origin)
+        return entry[1]
+
+    async def get(self, origin: str, user_agent: Optional[str] = None) -> RobotFileParser:
+        """Rules of an origin, fetching robots.txt as ``user_agent`` at most once at a time."""
+        rules = self.peek(origin)
+        if rules is not None:
+            self.hits += 1
+            return rules
+
+        loading = self._loading.get(origin)
+        if loading is not None:
+            return await asyncio.shield(loading)
+
+        self.misses += 1
+        loading = self._loading[origin] = asyncio.get_running_loop().create_future()
+        try:
+            rules = await self._load(origin, user_agent or self.user_agent)
+        except BaseException:
+            loading.cancel()
+            raise
+        finally:
+            del self._loading[origin]
+
+        self._entries[origin] = (time.monotonic(), rules)
+        self._entries.move_to_end(origin)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        loading.set_result(rules)
+        return rules
+
+    async def _load(self, origin: str, user_agent: str) -> RobotFileParser:
+        rules = RobotFileParser(f"{origin}/robots.txt")
+        try:
+            text = await self.fetch(origin, user_agent)
+        except Exception as e:
+            logger.debug(f"Could not fetch robots.txt for {origin}: {e}")
+            text = None
+
+        if text is None:
+            rules.allow_all = True
+        rules.parse((text or "").splitlines())
+        return rules
+
+    async def _fetch_robots(self, origin: str, user_agent: str) -> Optional[str]:
+        """Fetch the robots.txt text of an origin, or None if it has none."""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=ROBOTS_TIMEOUT_SECONDS)
+            )
+
+        async with self.session.get(f"{origin}/robots.txt", headers={'User-Agent': user_agent}) as response:
+            if response.status != 200:
+                return None
+            return await response.text(errors='replace')
+
+    async def close(self):
+        """Close the HTTP session used to fetch robots.txt."""
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get cache hit/miss statistics."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+        }
+
+
+class Dispatch(NamedTuple):
+    """A URL handed to a worker; disallowed URLs must not be fetched."""
+    index: int
+    url: str
+    host: str
+    allowed: bool = True
+
+
+class HostQueue:
+    """A job's pending URLs grouped by host, served round-robin."""
+
+    def __init__(self, urls: Iterable[str]):
+        self._pending: "OrderedDict[str, Deque[Tuple[int, str, str]]]" = OrderedDict()
+        for index, url in enumerate(urls):
+            host, origin = url_host(url)
+            self._pending.setdefault(host, deque()).append((index, url, origin))
+
+    def __len__(self) -> int:
+        return sum(len(urls) for urls in self._pending.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._pending)
+
+    def hosts(self) -> Iterable[Tuple[str, str]]:
+        """Hosts with pending URLs and their origins, least recently served first."""
+        return [(host, urls[0][2]) for host, urls in self._pending.items()]
+
+    def pop(self, host: str) -> Tuple[int, str]:
+        """Take the next URL of a host and move the host to the back of the turn order."""
+        urls = self._pending[host]
+        index, url, _ = urls.popleft()
+        if urls:
+            self._pending.move_to_end(host)
+        else:
+            del self._pending[host]
+        return index, url
+
+
+class _HostState:
+    __slots__ = ('active', 'last_start', 'free_at')
+
+    def __init__(self):
+        self.active = 0
+        self.last_start = float('-inf')
+        # When the delay after the last request runs out, for any job's policy
+        self.free_at = float('-inf')
+
+
+class HostScheduler:
+    """Decides which URL a worker fetches next, politely per host.
+
+    The per-host state (requests in flight, last request start) is shared
+    by every job of the scraper, so concurrent jobs do not add up on a site.
+    Hosts without requests in flight whose delay has run out are dropped
+    from it every ``prune_interval`` seconds. The scheduler may be created
+    outside the event loop it is used on.
+    """
+
+    def __init__(self, robots: Optional[RobotsCache] = None, prune_interval: float = HOST_PRUNE_INTERVAL):
+        self.robots = robots or RobotsCache()
+        self.prune_interval = prune_interval
+        self._hosts: Dict[str, _HostState] = {}
+        self._pruned_at = time.monotonic()
+        self._robots_tasks: Dict[str, asyncio.Task] = {}
+        # Created on first use, so it belongs to the loop the scheduler runs on
+        self._condition: Optional[asyncio.Condition] = None
+
+    @property
+    def _changed(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def host_policy(self, host: str, config: ScrapingConfig,
+                    rules: Optional[RobotFileParser] = None) -> Tuple[int, float]:
+        """``(max requests in flight, minimum delay between starts)`` for a host."""
+        concurrency = _domain_setting(host, config.domain_concurrency, config.max_requests_per_host)
+        delay = _domain_setting(host, config.domain_delays, config.delay_between_requests)
+        if rules is not None:
+            crawl_delay = rules.crawl_delay(config.user_agent)
+            if crawl_delay:
+                delay = max(delay, min(float(crawl_delay), MAX_CRAWL_DELAY))
+        return max(1, concurrency), delay
+
+    async def take(self, queue: HostQueue, config: ScrapingConfig) -> Optional[Dispatch]:
+        """Wait for a URL of the queue whose host may be requested now.
+
+        Returns None once the queue is empty. Every allowed dispatch must be
+        followed by ``release(dispatch.host)`` when its request is done.
+        """
+        async with self._changed:
+            while queue:
+                now = time.monotonic()
+                wake_at = None
+                if now - self._pruned_at >= self.prune_interval:
+                    self._prune(now)
+
+                for host, origin in queue.hosts():
+                    rules = None
+                    if config.respect_robots_txt:
+                        rules = self.robots.peek(origin)
+                        if rules is None and origin in self._robots_tasks:
+                            continue
+
+                    state = self._hosts.setdefault(host, _HostState())
+                    concurrency, delay = self.host_policy(host, config, rules)
+                    if state.active >= concurrency:
+                        continue
+                    if state.last_start + delay > now:
+                        wake_at = min(wake_at or float('inf'), state.last_start + delay)
+                        continue
+
+                    if config.respect_robots_txt and rules is None:
+                        # robots.txt is a request to the host like any other
+                        self._start(state, now, delay)
+                        self._load_robots(origin, host, config.user_agent)
+                        continue
+
+                    index, url = queue.pop(host)
+                    if not queue:
+                        # Wake the workers still waiting for this job
+                        self._changed.notify_all()
+                    if rules is not None and not rules.can_fetch(config.user_agent, url):
+                        return Dispatch(index, url, host, allowed=False)
+
+                    self._start(state, now, delay)
+                    return Dispatch(index, url, host)
+
+                timeout = None if wake_at is None else wake_at - now
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        return None
+
+    async def release(self, host: str):
+        """Mark a dispatched request of ``host`` as finished."""
+        async with self._changed:
+            self._hosts[host].active -= 1
+            self._changed.notify_all()
+
+    @staticmethod
+    def _start(state: _HostState, now: float, delay: float):
+        """Record a request to a host starting now."""
+        state.active += 1
+        state.last_start = now
+        state.free_at = max(state.free_at, now + delay)
+
+    def _prune(self, now: float):
+        """Drop the state of hosts that are idle and free to be requested again."""
+        self._pruned_at = now
+        idle = [host for host, state in self._hosts.items() if state.active == 0 and state.free_at <= now]
+        for host in idle:
+            del self._hosts[host]
+
+    def _load_robots(self, origin: str, host: str, user_agent: str):
+        """Fetch an origin's robots.txt in the background, then release the host and wake the workers."""
+        async def load():
+            try:
+                await self.robots.get(origin, user_agent)
+            except Exception as e:
+                logger.warning(f"Failed to load robots.txt for {origin}: {e}")
+            finally:
+                del self._robots_tasks[origin]
+                await self.release(host)
+
+        self._robots_tasks[origin] = asyncio.create_task(load())
+
+    def get_stats(self) -> Dict[str, object]:
+        """Get per-host scheduling statistics."""
+        return {
+            'hosts_tracked': len(self._hosts),
+            'active_requests': sum(state.active for state in self._hosts.values()),
+            'robots_cache': self.robots.get_stats(),
+        }
+
+    async def close(self):
+        for task in list(self._robots_tasks.values()):
+            task.cancel()
+        await self.robots.close()
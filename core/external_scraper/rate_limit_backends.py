@@ -0,0 +1,218 @@
+"""
+Storage backends for the GCRA state of ``RateLimiter``.
+
+A backend atomically reserves the next request slot of a key, keeping one
+theoretical arrival time per key and window. The in-memory backend limits
+one process; the file backend shares the quota between the processes of
+one host; the MongoDB backend shares it between every process and node
+using the same database.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, Sequence, Tuple, Union
+
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+
+# (period in seconds, emission interval, burst tolerance) of a limit window
+Window = Tuple[int, float, float]
+# Theoretical arrival times a reservation left behind, one per window
+Reservation = Tuple[float, ...]
+
+DEFAULT_COLLECTION = "rate_limits"
+
+
+def reserve_slot(state: Dict[str, float], windows: Sequence[Window], now: float) -> Tuple[float, Reservation]:
+    """Reserve the earliest slot every window allows.
+
+    ``state`` maps each window's period (as a string) to the theoretical
+    arrival time of the next request and is updated in place. Returns the
+    seconds until the slot and the arrival times it left, for ``release_slot``.
+    """
+    start = now
+    for period, _, tolerance in windows:
+        start = max(start, state.get(str(period), now) - tolerance)
+
+    for period, interval, _ in windows:
+        state[str(period)] = max(state.get(str(period), now), start) + interval
+
+    return start - now, tuple(state[str(period)] for period, _, _ in windows)
+
+
+def release_slot(state: Dict[str, float], windows: Sequence[Window], reservation: Reservation):
+    """Give back a reservation made by ``reserve_slot``.
+
+    A window only takes its interval back while no later reservation was
+    made in it, so the slots handed out since stay valid.
+    """
+    for (period, interval, _), arrival_time in zip(windows, reservation):
+        if state.get(str(period)) == arrival_time:
+            state[str(period)] = arrival_time - interval
+
+
+class RateLimitBackend(ABC):
+    """Where a rate limiter keeps the arrival times of its keys."""
+
+    name = "base"
+
+    @abstractmethod
+    async def reserve(self, key: str, windows: Sequence[Window]) -> Tuple[float, Reservation]:
+        """Reserve the next slot of a key; returns the seconds until it and the reservation."""
+
+    @abstractmethod
+    async def release(self, key: str, windows: Sequence[Window], reservation: Reservation):
+        """Give back a reservation that will not be used."""
+
+
+class MemoryBackend(RateLimitBackend):
+    """State of the current process only."""
+
+    name = "memory"
+
+    def __init__(self):
+        self.arrival_times: Dict[str, Dict[str, float]] = {}
+
+    async def reserve(self, key: str, windows: Sequence[Window]) -> Tuple[float, Reservation]:
+        return reserve_slot(self.arrival_times.setdefault(key, {}), windows, time.monotonic())
+
+    async def release(self, key: str, windows: Sequence[Window], reservation: Reservation):
+        release_slot(self.arrival_times.get(key, {}), windows, reservation)
+
+
+class FileBackend(RateLimitBackend):
+    """State in a JSON file under an exclusive ``flock``, shared by the processes of a host."""
+
+    name = "file"
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+
+    async def reserve(self, key: str, windows: Sequence[Window]) -> Tuple[float, Reservation]:
+        return await asyncio.to_thread(self._update, key, lambda state: reserve_slot(state, windows, time.time()))
+
+    async def release(self, key: str, windows: Sequence[Window], reservation: Reservation):
+        await asyncio.to_thread(self._update, key, lambda state: release_slot(state, windows, reservation))
+
+    def _update(self, key: str, update: Callable[[Dict[str, Any]], Any]) -> Any:
+        """Apply ``update`` to a key's state while holding the file lock."""
+        # POSIX only, so importing the module still works on Windows
+        import fcntl
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a+", encoding="utf-8") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                handle.seek(0)
+                text = handle.read()
+                try:
+                    state = json.loads(text) if text.strip() else {}
+                except ValueError:
+                    logger.warning(f"Resetting unreadable rate limit state in {self.path}")
+                    state = {}
+
+                result = update(state.setdefault(key, {}))
+
+                handle.seek(0)
+                handle.truncate()
+                json.dump(state, handle)
+                handle.flush()
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+        return result
+
+
+class MongoBackend(RateLimitBackend):
+    """State in a MongoDB collection, one document per key.
+
+    Each reservation is a single ``find_one_and_update`` with an update
+    pipeline, so it is atomic across processes and nodes. Times come from
+    the server clock (``$$NOW``), so the clocks of the nodes do not matter.
+    """
+
+    name = "mongodb"
+
+    def __init__(self, collection: Any = None, collection_name: str = DEFAULT_COLLECTION):
+        self.collection = collection
+        self.collection_name = collection_name
+
+    async def _get_collection(self):
+        if self.collection is None:
+            from core.database.connection import get_database
+            database = await get_database()
+            self.collection = database[self.collection_name]
+        return self.collection
+
+    @staticmethod
+    def reservation_pipeline(windows: Sequence[Window]) -> list:
+        """Update pipeline applying ``reserve_slot`` to a key's document."""
+        def arrival_time(period):
+            return {"$ifNull": [f"$tat_{period}", "$now"]}
+
+        return [
+            {"$set": {"now": {"$divide": [{"$toLong": "$$NOW"}, 1000]}}},
+            {"$set": {"start": {"$max": ["$now"] + [
+                {"$subtract": [arrival_time(period), tolerance]}
+                for period, _, tolerance in windows
+            ]}}},
+            {"$set": {
+                f"tat_{period}": {"$add": [{"$max": [arrival_time(period), "$start"]}, interval]}
+                for period, interval, _ in windows
+            }},
+        ]
+
+    @staticmethod
+    def release_pipeline(windows: Sequence[Window], reservation: Reservation) -> list:
+        """Update pipeline applying ``release_slot`` to a key's document."""
+        return [{"$set": {
+            f"tat_{period}": {"$cond": [
+                {"$eq": [f"$tat_{period}", arrival_time]},
+                {"$subtract": [f"$tat_{period}", interval]},
+                f"$tat_{period}"
+            ]}
+            for (period, interval, _), arrival_time in zip(windows, reservation)
+        }}]
+
+    async def reserve(self, key: str, windows: Sequence[Window]) -> Tuple[float, Reservation]:
+        collection = await self._get_collection()
+        document = await collection.find_one_and_update(
+            {"_id": key},
+            self.reservation_pipeline(windows),
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        reservation = tuple(document[f"tat_{period}"] for period, _, _ in windows)
+        return document["start"] - document["now"], reservation
+
+    async def release(self, key: str, windows: Sequence[Window], reservation: Reservation):
+        collection = await self._get_collection()
+        await collection.update_one({"_id": key}, self.release_pipeline(windows, reservation))
+
+
+def create_rate_limit_backend(spec: Union[str, RateLimitBackend, None] = None) -> RateLimitBackend:
+    """Build a backend from ``memory``, ``file:<path>`` or ``mongodb[:<collection>]``.
+
+    Without a spec the ``RATE_LIMIT_BACKEND`` environment variable is used,
+    defaulting to ``memory``.
+    """
+    if isinstance(spec, RateLimitBackend):
+        return spec
+
+    spec = spec or os.getenv("RATE_LIMIT_BACKEND", "memory")
+    kind, _, argument = spec.partition(":")
+    if kind == "memory":
+        return MemoryBackend()
+    if kind == "file":
+        if not argument:
+            raise ValueError("The file rate limit backend needs a path (file:<path>)")
+        return FileBackend(argument)
+    if kind == "mongodb":
+        return MongoBackend(collection_name=argument or DEFAULT_COLLECTION)
+    raise ValueError(f"Unknown rate limit backend: {spec}")
@@ -4,11 +4,13 @@ Rate limiting utilities for external API requests.
 
 import asyncio
 import time
-from typing import Dict, Optional, Callable, Any
-from datetime import datetime, timedelta
+from collections import deque
+from typing import Dict, Optional, Any, Deque, List, Tuple
 from dataclasses import dataclass
 import logging
 
+from .rate_limit_backends import MemoryBackend, RateLimitBackend, Window
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,110 +20,104 @@ class RateLimit:
     requests_per_minute: int
     requests_per_hour: Optional[int] = None
     requests_per_day: Optional[int] = None
+    # Requests allowed back to back in each window; half its limit by default
+    burst: Optional[int] = None
 
 
 class RateLimiter:
-    """Rate limiter for managing API request rates."""
+    """Rate limiter for managing API request rates.
+    
+    Each limit (per minute, hour and day) is enforced with GCRA: per key and
+    window only the theoretical arrival time of the next request is kept.
+    A window with limit ``n`` and burst ``b`` allows ``b`` requests back to
+    back, then one every ``period / (n - b + 1)`` seconds, so no span of
+    the window's length ever holds more than ``n`` requests. ``acquire``
+    reserves the earliest slot that satisfies every window in O(1) and
+    sleeps until it without holding a lock; waiters are served in arrival
+    order, as each one reserves after the previous one. A waiter cancelled
+    before its slot gives it back if no later request reserved after it.
     
-    def __init__(self, rate_limit: RateLimit):
+    The arrival times live in ``backend``: in memory by default, or in a
+    file or MongoDB to share a provider quota between processes (see
+    ``create_rate_limit_backend``). Statistics cover this process only.
+    """
+    
+    def __init__(self, rate_limit: RateLimit, backend: Optional[RateLimitBackend] = None):
         self.rate_limit = rate_limit
-        self.request_times: Dict[str, list] = {}
-        self.lock = asyncio.Lock()
+        self.backend = backend or MemoryBackend()
+        limits = self._limits()
+        self.windows: List[Window] = [self._window(period, limit) for period, limit in limits]
+        # Request times are kept for the longest window
+        self.log_period = max([60] + [period for period, _ in limits])
+        # Wall-clock times of recent requests per key, for statistics
+        self.request_times: Dict[str, Deque[float]] = {}
+        self.waiting: Dict[str, int] = {}
     
-    async def acquire(self, key: str = "default") -> None:
-        """Acquire permission to make a request."""
-        async with self.lock:
-            current_time = time.time()
-            
-            # Initialize request times for this key
-            if key not in self.request_times:
-                self.request_times[key] = []
-            
-            # Clean old request times
-            self._clean_old_requests(key, current_time)
-            
-            # Check rate limits
-            await self._check_rate_limits(key, current_time)
-            
-            # Record this request
-            self.request_times[key].append(current_time)
+    def _limits(self) -> List[Tuple[int, int]]:
+        """``(period in seconds, limit)`` of every configured window."""
+        limits = [(60, self.rate_limit.requests_per_minute),
+                  (3600, self.rate_limit.requests_per_hour),
+                  (86400, self.rate_limit.requests_per_day)]
+        return [(period, limit) for period, limit in limits if limit]
     
-    def _clean_old_requests(self, key: str, current_time: float) -> None:
-        """Remove old request times that are no longer relevant."""
-        if key not in self.request_times:
-            return
-            
-        request_times = self.request_times[key]
+    def _window(self, period: int, limit: int) -> Window:
+        """GCRA ``(period, emission interval, burst tolerance)`` of a limit.
         
-        # Remove requests older than 1 minute
-        cutoff_time = current_time - 60
-        request_times[:] = [t for t in request_times if t > cutoff_time]
-        
-        # Remove requests older than 1 hour if hourly limit is set
-        if self.rate_limit.requests_per_hour:
-            cutoff_time = current_time - 3600
-            request_times[:] = [t for t in request_times if t > cutoff_time]
-        
-        # Remove requests older than 1 day if daily limit is set
-        if self.rate_limit.requests_per_day:
-            cutoff_time = current_time - 86400
-            request_times[:] = [t for t in request_times if t > cutoff_time]
+        A burst of ``b`` followed by one request per interval puts
+        ``b + (limit - b)`` requests in any span of ``period`` seconds.
+        """
+        burst = min(limit, self.rate_limit.burst or max(1, limit // 2))
+        interval = period / (limit - burst + 1)
+        return period, interval, (burst - 1) * interval
     
-    async def _check_rate_limits(self, key: str, current_time: float) -> None:
-        """Check if rate limits would be exceeded."""
-        request_times = self.request_times[key]
-        
-        # Check per-minute limit
-        minute_ago = current_time - 60
-        requests_in_minute = len([t for t in request_times if t > minute_ago])
+    async def acquire(self, key: str = "default") -> None:
+        """Acquire permission to make a request."""
+        wait_time, reservation = await self.backend.reserve(key, self.windows)
+        current_time = time.time()
+        request_times = self._request_log(key, current_time)
+        request_times.append(current_time + wait_time)
         
-        if requests_in_minute >= self.rate_limit.requests_per_minute:
-            wait_time = 60 - (current_time - request_times[0])
-            if wait_time > 0:
-                logger.info(f"Rate limit exceeded for {key}, waiting {wait_time:.2f} seconds")
+        if wait_time > 0:
+            logger.info(f"Rate limit exceeded for {key}, waiting {wait_time:.2f} seconds")
+            self.waiting[key] = self.waiting.get(key, 0) + 1
+            try:
                 await asyncio.sleep(wait_time)
+            except asyncio.CancelledError:
+                # The request will not be made, so later ones may use its slot
+                await self.backend.release(key, self.windows, reservation)
+                if current_time + wait_time in request_times:
+                    request_times.remove(current_time + wait_time)
+                raise
+            finally:
+                self.waiting[key] -= 1
+    
+    def _request_log(self, key: str, current_time: float) -> Deque[float]:
+        """Request times of a key, without those older than the longest window."""
+        request_times = self.request_times.setdefault(key, deque())
         
-        # Check per-hour limit
-        if self.rate_limit.requests_per_hour:
-            hour_ago = current_time - 3600
-            requests_in_hour = len([t for t in request_times if t > hour_ago])
-            
-            if requests_in_hour >= self.rate_limit.requests_per_hour:
-                wait_time = 3600 - (current_time - request_times[0])
-                if wait_time > 0:
-                    logger.info(f"Hourly rate limit exceeded for {key}, waiting {wait_time:.2f} seconds")
-                    await asyncio.sleep(wait_time)
-        
-        # Check per-day limit
-        if self.rate_limit.requests_per_day:
-            day_ago = current_time - 86400
-            requests_in_day = len([t for t in request_times if t > day_ago])
-            
-            if requests_in_day >= self.rate_limit.requests_per_day:
-                wait_time = 86400 - (current_time - request_times[0])
-                if wait_time > 0:
-                    logger.info(f"Daily rate limit exceeded for {key}, waiting {wait_time:.2f} seconds")
-                    await asyncio.sleep(wait_time)
+        cutoff_time = current_time - self.log_period
+        while request_times and request_times[0] <= cutoff_time:
+            del request_times[0]
+        return request_times
     
     def get_stats(self, key: str = "default") -> Dict[str, Any]:
         """Get rate limiting statistics."""
         current_time = time.time()
-        request_times = self.request_times.get(key, [])
-        
-        # Clean old requests for accurate stats
-        self._clean_old_requests(key, current_time)
+        request_times = self._request_log(key, current_time) if key in self.request_times else ()
         
         minute_ago = current_time - 60
         hour_ago = current_time - 3600
         day_ago = current_time - 86400
         
         return {
-            "requests_in_minute": len([t for t in request_times if t > minute_ago]),
-            "requests_in_hour": len([t for t in request_times if t > hour_ago]),
-            "requests_in_day": len([t for t in request_times if t > day_ago]),
+            "requests_in_minute": sum(1 for t in request_times if t > minute_ago),
+            "requests_in_hour": sum(1 for t in request_times if t > hour_ago),
+            "requests_in_day": sum(1 for t in request_times if t > day_ago),
             "rate_limit_per_minute": self.rate_limit.requests_per_minute,
             "rate_limit_per_hour": self.rate_limit.requests_per_hour,
             "rate_limit_per_day": self.rate_limit.requests_per_day,
+            "waiting_requests": self.waiting.get(key, 0),
+            "backend": self.backend.name,
         }
 
 
@@ -0,0 +1,292 @@
+"""
+Persistent cache of Firecrawl responses.
+
+Responses are keyed by the normalized URL and the scrape options and stored
+zlib-compressed in memory, in a directory or in MongoDB. A cached page is
+served for ``ttl_seconds`` and scraped again after that. Every served entry
+saves one Firecrawl request.
+
+Entries are not revalidated against the site: Firecrawl responses carry no
+ETag or Last-Modified of the page, and fetching them would mean extra
+requests to every scraped site.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+
+# How long an entry is served before the page is scraped again
+DEFAULT_TTL_SECONDS = 24 * 3600
+# How often the file store sweeps out expired entries
+PURGE_INTERVAL_SECONDS = 3600
+DEFAULT_COLLECTION = "scrape_cache"
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+# Query parameters that only track the visitor and never change the page
+TRACKING_PARAMETERS = ('utm_', 'fbclid', 'gclid', 'mc_cid', 'mc_eid')
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL for cache keys.
+
+    Lowercases the scheme and host, drops default ports, fragments and
+    tracking parameters, and sorts the query.
+    """
+    parsed = urlsplit(url.strip())
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or '').lower()
+    if ':' in host:
+        host = f'[{host}]'
+    if parsed.port is not None and DEFAULT_PORTS.get(scheme) != parsed.port:
+        host = f'{host}:{parsed.port}'
+
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not name.lower().startswith(TRACKING_PARAMETERS)
+    )
+    return urlunsplit((scheme, host, parsed.path or '/', urlencode(query), ''))
+
+
+def cache_key(url: str, options: Optional[Dict[str, Any]] = None) -> str:
+    """Cache key of a URL scraped with the given options."""
+    text = f"{normalize_url(url)}\0{json.dumps(options or {}, sort_keys=True, default=str)}"
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=20).hexdigest()
+
+
+class ResponseStore(ABC):
+    """Where compressed cache entries are kept."""
+
+    name = "base"
+
+    @abstractmethod
+    async def load(self, key: str) -> Optional[bytes]:
+        """The payload stored under a key, or None."""
+
+    @abstractmethod
+    async def save(self, key: str, payload: bytes, expires_at: float):
+        """Store a payload until ``expires_at`` (a Unix time)."""
+
+    @abstractmethod
+    async def delete(self, key: str):
+        """Remove a key if it is stored."""
+
+
+class MemoryResponseStore(ResponseStore):
+    """LRU of entries in the current process."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+
+    async def load(self, key: str) -> Optional[bytes]:
+        payload = self._entries.get(key)
+        if payload is not None:
+            self._entries.move_to_end(key)
+        return payload
+
+    async def save(self, key: str, payload: bytes, expires_at: float):
+        self._entries[key] = payload
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+
+class FileResponseStore(ResponseStore):
+    """One compressed file per entry in a directory.
+
+    A file's modification time is set to its expiry, and expired files are
+    deleted at most every ``purge_interval`` seconds when entries are saved.
+    """
+
+    name = "file"
+
+    def __init__(self, directory: Union[str, Path], purge_interval: float = PURGE_INTERVAL_SECONDS):
+        self.directory = Path(directory)
+        self.purge_interval = purge_interval
+        self._purged_at = float('-inf')
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json.z"
+
+    async def load(self, key: str) -> Optional[bytes]:
+        try:
+            return await asyncio.to_thread(self._path(key).read_bytes)
+        except FileNotFoundError:
+            return None
+
+    async def save(self, key: str, payload: bytes, expires_at: float):
+        await asyncio.to_thread(self._write, self._path(key), payload, expires_at)
+        now = time.time()
+        if now - self._purged_at >= self.purge_interval:
+            self._purged_at = now
+            await asyncio.to_thread(self.purge, now)
+
+    @staticmethod
+    def _write(path: Path, payload: bytes, expires_at: float):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_bytes(payload)
+        os.utime(temporary, (expires_at, expires_at))
+        os.replace(temporary, path)
+
+    def purge(self, now: Optional[float] = None) -> int:
+        """Delete the files of expired entries; returns how many were deleted."""
+        now = time.time() if now is None else now
+        deleted = 0
+        for path in self.directory.glob("*/*.json.z"):
+            try:
+                if path.stat().st_mtime <= now:
+                    path.unlink()
+                    deleted += 1
+            except FileNotFoundError:
+                pass
+        return deleted
+
+    async def delete(self, key: str):
+        await asyncio.to_thread(self._path(key).unlink, True)
+
+
+class MongoResponseStore(ResponseStore):
+    """Entries in a MongoDB collection; a TTL index removes expired ones."""
+
+    name = "mongodb"
+
+    def __init__(self, collection: Any = None, collection_name: str = DEFAULT_COLLECTION):
+        self.collection = collection
+        self.collection_name = collection_name
+        self._indexed = False
+
+    async def _get_collection(self):
+        if self.collection is None:
+            from core.database.connection import get_database
+            database = await get_database()
+            self.collection = database[self.collection_name]
+        if not self._indexed:
+            await self.collection.create_index("expires_at", expireAfterSeconds=0)
+            self._indexed = True
+        return self.collection
+
+    async def load(self, key: str) -> Optional[bytes]:
+        collection = await self._get_collection()
+        document = await collection.find_one({"_id": key})
+        return bytes(document["payload"]) if document else None
+
+    async def save(self, key: str, payload: bytes, expires_at: float):
+        collection = await self._get_collection()
+        await collection.replace_one(
+            {"_id": key},
+            {"payload": payload, "expires_at": datetime.fromtimestamp(expires_at, tz=timezone.utc)},
+            upsert=True
+        )
+
+    async def delete(self, key: str):
+        collection = await self._get_collection()
+        await collection.delete_one({"_id": key})
+
+
+class ResponseCache:
+    """Firecrawl responses by URL and options, kept for ``ttl_seconds``."""
+
+    def __init__(self, store: Optional[ResponseStore] = None, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.store = store or MemoryResponseStore()
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+
+    async def get(self, url: str, options: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """The cached response for a URL, or None if it has to be scraped."""
+        entry = await self._load(cache_key(url, options))
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry['data']
+
+    async def put(self, url: str, options: Optional[Dict[str, Any]], data: Dict[str, Any]):
+        """Cache a response."""
+        entry = {
+            'url': normalize_url(url),
+            'data': data,
+            'stored_at': time.time(),
+        }
+        await self._save(cache_key(url, options), entry)
+        self.stored += 1
+
+    async def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            payload = await self.store.load(key)
+            if payload is None:
+                return None
+            entry = json.loads(zlib.decompress(payload))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable scrape cache entry {key}: {e}")
+            return None
+
+        if time.time() - entry['stored_at'] > self.ttl_seconds:
+            await self.store.delete(key)
+            return None
+        return entry
+
+    async def _save(self, key: str, entry: Dict[str, Any]):
+        payload = zlib.compress(json.dumps(entry, default=str).encode('utf-8'))
+        try:
+            await self.store.save(key, payload, entry['stored_at'] + self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Could not write scrape cache entry {key}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss statistics; every hit is a Firecrawl request saved."""
+        lookups = self.hits + self.misses
+        return {
+            'enabled': True,
+            'store': self.store.name,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+            'stored': self.stored,
+            'quota_saved': self.hits,
+        }
+
+
+def create_response_cache(spec: Union[str, ResponseCache, None] = None) -> Optional[ResponseCache]:
+    """Build a cache from ``none``, ``memory``, ``file:<directory>`` or ``mongodb[:<collection>]``.
+
+    Without a spec the ``SCRAPE_CACHE`` environment variable is used,
+    defaulting to ``none`` (no caching).
+    """
+    if isinstance(spec, ResponseCache):
+        return spec
+
+    spec = spec or os.getenv("SCRAPE_CACHE", "none")
+    kind, _, argument = spec.partition(":")
+    if kind == "none":
+        return None
+    if kind == "memory":
+        return ResponseCache(MemoryResponseStore())
+    if kind == "file":
+        if not argument:
+            raise ValueError("The file scrape cache needs a directory (file:<directory>)")
+        return ResponseCache(FileResponseStore(argument))
+    if kind == "mongodb":
+        return ResponseCache(MongoResponseStore(collection_name=argument or DEFAULT_COLLECTION))
+    raise ValueError(f"Unknown scrape cache: {spec}")
@@ -15,7 +15,9 @@ from .models import (
 from .firecrawl_client import FirecrawlClient
 from .brave_search_client import BraveSearchClient
 from .content_processor import ContentProcessor
-from .rate_limiter import DelayedRateLimiter
+from .politeness import HostQueue, HostScheduler
+from .rate_limit_backends import create_rate_limit_backend
+from .response_cache import create_response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +32,11 @@ class ExternalScraper:
         self.firecrawl_client: Optional[FirecrawlClient] = None
         self.brave_search_client: Optional[BraveSearchClient] = None
         self.content_processor = ContentProcessor()
-        self.delay_limiter = DelayedRateLimiter(delay_seconds=1.0)
+        self.scheduler = HostScheduler()
+        # Shared with other processes unless it is the in-memory default
+        self.rate_limit_backend = create_rate_limit_backend(self.config.get('rate_limit_backend'))
+        # Firecrawl responses reused while the pages are unchanged (off unless configured)
+        self.response_cache = create_response_cache(self.config.get('scrape_cache'))
         
         # Active jobs
         self.active_jobs: Dict[str, ScrapingJob] = {}
@@ -43,8 +49,12 @@ class ExternalScraper:
     
     async def initialize(self, firecrawl_api_key: str, brave_search_api_key: str):
         """Initialize the scraper with API keys."""
-        self.firecrawl_client = FirecrawlClient(firecrawl_api_key)
-        self.brave_search_client = BraveSearchClient(brave_search_api_key)
+        self.firecrawl_client = FirecrawlClient(
+            firecrawl_api_key,
+            rate_limit_backend=self.rate_limit_backend,
+            response_cache=self.response_cache
+        )
+        self.brave_search_client = BraveSearchClient(brave_search_api_key, rate_limit_backend=self.rate_limit_backend)
         
         # Initialize clients
         await self.firecrawl_client.__aenter__()
@@ -60,6 +70,8 @@ class ExternalScraper:
         if self.brave_search_client:
             await self.brave_search_client.__aexit__(None, None, None)
         
+        await self.scheduler.close()
+        
         logger.info("External scraper cleaned up")
     
     async def create_scraping_job(
@@ -99,38 +111,11 @@ class ExternalScraper:
         logger.info(f"Starting scraping job {job_id}")
         
         try:
-            # Process URLs in batches
-            batch_size = 5  # Process 5 URLs at a time
-            total_urls = len(job.urls)
+            await self._run_pipeline(job)
             
-            for i in range(0, total_urls, batch_size):
-                batch_urls = job.urls[i:i + batch_size]
-                
-                # Scrape batch
-                batch_results = await self._scrape_urls_batch(batch_urls, job.config)
-                
-                # Process results
-                for result in batch_results:
-                    if result.errors:
-                        job.failed_urls += 1
-                        job.errors.extend(result.errors)
-                    else:
-                        job.successful_urls += 1
-                    
-                    job.results.append(result)
-                    job.processed_urls += 1
-                
-                # Update progress
-                progress = job.processed_urls / job.total_urls
-                job.progress = progress
-                
-                # Call progress callback
-                if self.progress_callback:
-                    self.progress_callback(job_id, progress)
-                
-                # Apply delay between batches
-                if i + batch_size < total_urls:
-                    await asyncio.sleep(job.config.delay_between_requests)
+            if job.status == ScrapingStatus.CANCELLED:
+                logger.info(f"Stopped cancelled scraping job {job_id} after {job.processed_urls} URLs")
+                return job
             
             # Mark job as completed
             job.status = ScrapingStatus.COMPLETED
@@ -153,24 +138,100 @@ class ExternalScraper:
         
         return job
     
-    async def _scrape_urls_batch(self, urls: List[str], config: ScrapingConfig) -> List[ScrapingResult]:
-        """Scrape a batch of URLs."""
+    async def _run_pipeline(self, job: ScrapingJob):
+        """Scrape the job's URLs with long-lived workers.
+        
+        Workers take URLs from the host scheduler, which serves the job's
+        hosts in turn and keeps each one within its concurrency and delay
+        limits, so a slow page or a slow site only holds up its own worker.
+        Fetched pages go to a single consumer that validates them and updates
+        the job while the workers keep fetching. Results are appended to
+        ``job.results`` as they complete and put in the order of the job's
+        URLs once all are in.
+        """
         if not self.firecrawl_client:
             raise RuntimeError("Firecrawl client not initialized")
         
-        # Apply delay between requests
-        await self.delay_limiter.acquire("scraping")
+        workers = max(1, min(job.config.max_concurrent_requests, len(job.urls)))
+        pending = HostQueue(job.urls)
+        fetched: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+        # Results by URL index; job.results may already hold entries from before this run
+        slots: List[Optional[ScrapingResult]] = [None] * len(job.urls)
+        first = len(job.results)
+        
+        async def fetch():
+            while job.status != ScrapingStatus.CANCELLED:
+                dispatch = await self.scheduler.take(pending, job.config)
+                if dispatch is None:
+                    break
+                if not dispatch.allowed:
+                    result = self._create_error_result(dispatch.url, "robots_txt", "Disallowed by robots.txt")
+                elif job.status == ScrapingStatus.CANCELLED:
+                    await self.scheduler.release(dispatch.host)
+                    break
+                else:
+                    try:
+                        result = await self.firecrawl_client.scrape_url(dispatch.url)
+                    except Exception as e:
+                        result = self._create_error_result(dispatch.url, "exception", f"Unexpected error: {str(e)}")
+                    finally:
+                        await self.scheduler.release(dispatch.host)
+                await fetched.put((dispatch.index, result))
+            await fetched.put(None)
+        
+        async def process():
+            running = workers
+            while running:
+                item = await fetched.get()
+                if item is None:
+                    running -= 1
+                    continue
+                index, result = item
+                result = await self._process_scraping_result(result, job.config)
+                slots[index] = result
+                self._record_result(job, result)
+        
+        tasks = [asyncio.create_task(process())]
+        tasks.extend(asyncio.create_task(fetch()) for _ in range(workers))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
         
-        # Scrape URLs concurrently
-        results = await self.firecrawl_client.scrape_multiple_urls(urls)
+        job.results[first:] = [result for result in slots if result is not None]
+    
+    def _record_result(self, job: ScrapingJob, result: ScrapingResult):
+        """Count a processed result and report the job's progress."""
+        if result.errors:
+            job.failed_urls += 1
+            job.errors.extend(result.errors)
+        else:
+            job.successful_urls += 1
         
-        # Process and validate results
-        processed_results = []
-        for result in results:
-            processed_result = await self._process_scraping_result(result, config)
-            processed_results.append(processed_result)
+        job.results.append(result)
+        job.processed_urls += 1
+        job.progress = job.processed_urls / job.total_urls
         
-        return processed_results
+        if self.progress_callback:
+            self.progress_callback(job.job_id, job.progress)
+    
+    def _create_error_result(self, url: str, error_type: str, message: str) -> ScrapingResult:
+        """Create a failed result for a URL that was not scraped."""
+        return ScrapingResult(
+            url=url,
+            content_type=ContentType.WEBPAGE,
+            content="",
+            metadata=ContentMetadata(),
+            scraping_time=0.0,
+            content_hash="",
+            errors=[ScrapingError(
+                error_type=error_type,
+                message=message,
+                url=url,
+                retry_count=0
+            )]
+        )
     
     async def _process_scraping_result(self, result: ScrapingResult, config: ScrapingConfig) -> ScrapingResult:
         """Process and validate a scraping result."""
@@ -343,10 +404,13 @@ class ExternalScraper:
         # Add rate limit status
         if self.firecrawl_client:
             status['firecrawl_rate_limit'] = await self.firecrawl_client.get_rate_limit_status()
+            status['firecrawl_cache'] = self.firecrawl_client.get_cache_status()
         
         if self.brave_search_client:
             status['brave_search_rate_limit'] = await self.brave_search_client.get_rate_limit_status()
         
+        status['politeness'] = self.scheduler.get_stats()
+        
         return status
     
     def clear_job_history(self, older_than_days: int = 7):
@@ -0,0 +1,224 @@
+"""
+Benchmark the content analyzer stages on synthetic corpora.
+
+Usage:
+    python -m tests.benchmarks.bench_content_analyzer               # compare to baseline
+    python -m tests.benchmarks.bench_content_analyzer --update      # record a new baseline
+    python -m tests.benchmarks.bench_content_analyzer --quick       # small documents only
+
+Each stage is timed on its own (best of ``--repeats`` runs) and measured once
+more under tracemalloc for its peak memory, so tracing does not skew the
+timings. The run exits with status 1 when a stage is slower, or peaks higher,
+than the baseline by more than ``--threshold``. Re-record the baseline with
+``--update`` after a change that is meant to move the numbers.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from core.content_analyzer.parser import ContentParser
+from core.content_analyzer.question_generator import QuestionGenerator
+from core.content_analyzer.quality_scorer import QualityScorer
+from core.content_analyzer.metrics import TextMetrics
+from core.content_analyzer.sections import SectionMetrics, split_sections
+from core.content_analyzer.structure_analyzer import ContentStructureAnalyzer
+from core.content_analyzer.style_analyzer import StyleAnalyzer
+from core.content_analyzer.tokenizer import TokenizedDocument
+
+from .corpus import DEFAULT_CORPUS, QUICK_CORPUS, CorpusSpec, generate_document
+
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+# Best-of-N timings of the small documents vary by up to 2x between runs
+DEFAULT_THRESHOLD = 1.0
+# Differences below these floors are noise, whatever the ratio
+MIN_TIME_DELTA_SECONDS = 0.002
+MIN_MEMORY_DELTA_BYTES = 256 * 1024
+
+STAGES = (
+    "parser",
+    "tokenizer",
+    "style_metrics",
+    "structure_analyzer",
+    "style_analyzer",
+    "question_generator",
+    "quality_scorer",
+)
+
+
+def stage_calls(content: str) -> List[tuple]:
+    """Build the stage callables for one document, in pipeline order.
+
+    Each stage reads the output of the earlier stages, so the callables
+    share a dict of results.
+    """
+    parser = ContentParser()
+    structure_analyzer = ContentStructureAnalyzer()
+    style_analyzer = StyleAnalyzer()
+    question_generator = QuestionGenerator()
+    quality_scorer = QualityScorer()
+    state: Dict[str, Any] = {}
+
+    def parse():
+        state["parsed"] = parser.parse_content(content, tokenize=False)
+
+    # The two halves of measure_sections, without a section cache so every run measures everything
+    def tokenize():
+        state["sections"] = split_sections(state["parsed"]["content"])
+        state["raw"] = [
+            TextMetrics.from_document(TokenizedDocument.from_text(section)) for section in state["sections"]
+        ]
+
+    def measure_style():
+        prose = [style_analyzer.measure(section) for section in state["sections"]]
+        state["metrics"] = SectionMetrics.merge(map(SectionMetrics, state["raw"], prose))
+
+    def structure():
+        state["structure"] = structure_analyzer.analyze_structure(state["parsed"], state["metrics"].raw)
+
+    def style():
+        state["style"] = style_analyzer.analyze_metrics(state["metrics"].prose)
+
+    def purpose():
+        state["purpose"] = question_generator.generate_purpose_analysis(
+            state["metrics"].raw, "auto", "general"
+        )
+
+    def quality():
+        quality_scorer.assess_quality(
+            state["metrics"].raw, state["structure"], state["style"], state["purpose"]
+        )
+
+    return list(zip(STAGES, (parse, tokenize, measure_style, structure, style, purpose, quality)))
+
+
+def _best_time(call: Callable[[], None], repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_memory(call: Callable[[], None]) -> int:
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        call()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_document(spec: CorpusSpec, repeats: int = 3) -> Dict[str, Any]:
+    """Time and measure every stage on one synthetic document."""
+    content = generate_document(spec)
+    words = len(content.split())
+    stages = {}
+    total = 0.0
+
+    for name, call in stage_calls(content):
+        seconds = _best_time(call, repeats)
+        total += seconds
+        stages[name] = {
+            "seconds": round(seconds, 6),
+            "words_per_second": round(words / seconds) if seconds else None,
+            "peak_memory_bytes": _peak_memory(call),
+        }
+
+    return {
+        "words": words,
+        "characters": len(content),
+        "total_seconds": round(total, 6),
+        "words_per_second": round(words / total) if total else None,
+        "stages": stages,
+    }
+
+
+def run_benchmarks(corpus: Sequence[CorpusSpec] = DEFAULT_CORPUS, repeats: int = 3) -> Dict[str, Any]:
+    """Benchmark every document of a corpus."""
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeats": repeats,
+        "documents": {spec.name: benchmark_document(spec, repeats) for spec in corpus},
+    }
+
+
+def find_regressions(results: Dict[str, Any], baseline: Dict[str, Any],
+                     threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """Describe every stage slower or more memory hungry than the baseline."""
+    regressions = []
+    for document, measured in results["documents"].items():
+        expected = baseline.get("documents", {}).get(document)
+        if expected is None:
+            continue
+        for stage, current in measured["stages"].items():
+            previous = expected["stages"].get(stage)
+            if previous is None:
+                continue
+
+            seconds, baseline_seconds = current["seconds"], previous["seconds"]
+            if (seconds > baseline_seconds * (1 + threshold)
+                    and seconds - baseline_seconds > MIN_TIME_DELTA_SECONDS):
+                regressions.append(
+                    f"{document}/{stage}: {seconds * 1000:.1f} ms "
+                    f"(baseline {baseline_seconds * 1000:.1f} ms)"
+                )
+
+            peak, baseline_peak = current["peak_memory_bytes"], previous["peak_memory_bytes"]
+            if (peak > baseline_peak * (1 + threshold)
+                    and peak - baseline_peak > MIN_MEMORY_DELTA_BYTES):
+                regressions.append(
+                    f"{document}/{stage}: peak {peak / 1024:.0f} KiB "
+                    f"(baseline {baseline_peak / 1024:.0f} KiB)"
+                )
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the content analyzer stages.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--update", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--quick", action="store_true", help="only benchmark the small documents")
+    parser.add_argument("--repeats", type=int, default=3, help="runs per stage (best is kept)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown ratio before failing (1.0 = twice as slow)")
+    parser.add_argument("--output", type=Path, help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(QUICK_CORPUS if args.quick else DEFAULT_CORPUS, args.repeats)
+
+    for document, measured in results["documents"].items():
+        stages = ", ".join(
+            f"{stage} {values['seconds'] * 1000:.1f} ms" for stage, values in measured["stages"].items()
+        )
+        print(f"{document} ({measured['words']} words, {measured['words_per_second']} words/s): {stages}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.update:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update to record one")
+        return 0
+
+    regressions = find_regressions(results, json.loads(args.baseline.read_text()), args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
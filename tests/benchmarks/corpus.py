@@ -0,0 +1,99 @@
+"""
+Deterministic synthetic markdown corpora for benchmarks.
+
+The same spec and seed always produce the same document, so timings taken on
+different revisions measure the same input.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import List
+
+
+_VOCABULARY = (
+    "the a an and or but if then because therefore however first next finally "
+    "python code function class module api database server client request response "
+    "data model analysis content article reader writer example tutorial guide step "
+    "install configure deploy test debug optimize performance memory latency cache "
+    "simple clear important essential practical useful complex advanced basic "
+    "we you it they this that these those is are was were be been being have has "
+    "run build write read learn understand explain show use make create improve "
+    "quickly carefully easily often usually sometimes never always really very"
+).split()
+
+_LANGUAGES = ("python", "javascript", "bash", "")
+_TERMINATORS = (".", ".", ".", ".", "!", "?")
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """Size and block mix of one synthetic document.
+
+    Densities are the probability that the next block is a heading, a list or
+    a code block; the remaining blocks are paragraphs.
+    """
+    name: str
+    words: int
+    heading_density: float = 0.1
+    list_density: float = 0.1
+    code_density: float = 0.05
+    seed: int = 0
+
+
+# Sizes from a short post to a book chapter, with prose-, list- and code-heavy mixes
+DEFAULT_CORPUS = [
+    CorpusSpec("prose-500", 500, heading_density=0.05, list_density=0.02, code_density=0.0),
+    CorpusSpec("mixed-2k", 2000),
+    CorpusSpec("lists-5k", 5000, heading_density=0.15, list_density=0.4, code_density=0.02),
+    CorpusSpec("code-10k", 10000, heading_density=0.1, list_density=0.05, code_density=0.3),
+    CorpusSpec("mixed-25k", 25000),
+    CorpusSpec("prose-100k", 100000, heading_density=0.03, list_density=0.03, code_density=0.01),
+]
+
+# Small subset for quick local runs
+QUICK_CORPUS = DEFAULT_CORPUS[:3]
+
+# Long documents for memory profiling
+LONG_CORPUS = [spec for spec in DEFAULT_CORPUS if spec.words >= 10000]
+
+
+def _sentence(rng: random.Random) -> List[str]:
+    words = rng.choices(_VOCABULARY, k=rng.randint(6, 24))
+    words[0] = words[0].capitalize()
+    if rng.random() < 0.1:
+        words[rng.randrange(len(words))] = "[docs](https://example.com/docs)"
+    return words
+
+
+def generate_document(spec: CorpusSpec) -> str:
+    """Generate a markdown document of roughly ``spec.words`` words."""
+    rng = random.Random(f"{spec.name}:{spec.words}:{spec.seed}")
+    blocks = [f"# {' '.join(rng.choices(_VOCABULARY, k=4)).title()}"]
+    words = 4
+
+    while words < spec.words:
+        roll = rng.random()
+        if roll < spec.heading_density:
+            title = rng.choices(_VOCABULARY, k=rng.randint(2, 6))
+            blocks.append(f"{'#' * rng.randint(2, 4)} {' '.join(title).title()}")
+            words += len(title)
+        elif roll < spec.heading_density + spec.list_density:
+            items = []
+            for _ in range(rng.randint(2, 6)):
+                item = _sentence(rng)[:rng.randint(3, 10)]
+                items.append(f"{rng.choice('-*+')} {' '.join(item)}")
+                words += len(item)
+            blocks.append("\n".join(items))
+        elif roll < spec.heading_density + spec.list_density + spec.code_density:
+            lines = [f"{rng.choice(_VOCABULARY)} = {rng.randint(0, 999)}" for _ in range(rng.randint(2, 12))]
+            blocks.append(f"```{rng.choice(_LANGUAGES)}\n" + "\n".join(lines) + "\n```")
+            words += 2 * len(lines)
+        else:
+            sentences = []
+            for _ in range(rng.randint(2, 7)):
+                sentence = _sentence(rng)
+                sentences.append(" ".join(sentence) + rng.choice(_TERMINATORS))
+                words += len(sentence)
+            blocks.append(" ".join(sentences))
+
+    return "\n\n".join(blocks) + "\n"
@@ -0,0 +1,193 @@
+"""
+Profile the memory of the content analyzer stages on long documents.
+
+Usage:
+    python -m tests.benchmarks.memory_content_analyzer               # compare to baseline
+    python -m tests.benchmarks.memory_content_analyzer --update      # record a new baseline
+    python -m tests.benchmarks.memory_content_analyzer --top 5       # show allocation sites
+
+Every stage runs once, in pipeline order, under tracemalloc. For each stage
+the harness reports its peak (the most memory allocated at any point of the
+stage, relative to the start of the stage) and its retained allocations (what
+is still allocated once the stage returned, i.e. its output plus anything it
+leaked or cached). ``validate_content`` and the whole ``analyze_content``
+pipeline are profiled the same way.
+
+One untraced warm-up run per document comes first, so process-wide caches
+(syllable counts, the lexicon automaton) are not attributed to a stage.
+"""
+
+import argparse
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from core.content_analyzer.analyzer import ContentAnalyzer
+
+from .bench_content_analyzer import MIN_MEMORY_DELTA_BYTES, stage_calls
+from .corpus import LONG_CORPUS, CorpusSpec, generate_document
+
+
+BASELINE_PATH = Path(__file__).with_name("memory_baseline.json")
+# Allocations are deterministic, so a much smaller margin than for timings
+DEFAULT_THRESHOLD = 0.10
+TRACEBACK_FRAMES = 8
+
+MEASURES = ("peak_bytes", "retained_bytes")
+
+
+def _profile_calls(calls: Sequence[tuple], top: int = 0) -> Dict[str, Dict[str, Any]]:
+    """Run the calls in order under tracemalloc and measure each one."""
+    profiles = {}
+    tracemalloc.start(TRACEBACK_FRAMES if top else 1)
+    try:
+        for name, call in calls:
+            before = tracemalloc.take_snapshot() if top else None
+            start_bytes = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            call()
+            current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+            profile: Dict[str, Any] = {
+                "peak_bytes": peak_bytes - start_bytes,
+                "retained_bytes": current_bytes - start_bytes,
+            }
+            if top:
+                profile["top_retained"] = _top_retained(before, tracemalloc.take_snapshot(), top)
+            profiles[name] = profile
+    finally:
+        tracemalloc.stop()
+    return profiles
+
+
+def _top_retained(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, top: int) -> List[str]:
+    """Source lines that allocated the most memory still held after a call."""
+    excluded = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    differences = after.filter_traces(excluded).compare_to(before.filter_traces(excluded), "lineno")
+    return [
+        f"{difference.traceback[0].filename}:{difference.traceback[0].lineno} "
+        f"{difference.size_diff / 1024:+.0f} KiB"
+        for difference in differences[:top]
+        if difference.size_diff > 0
+    ]
+
+
+def _pipeline_calls(content: str) -> List[tuple]:
+    """The stage calls followed by validation and the full pipeline."""
+    analyzer = ContentAnalyzer(executor_mode="inline")
+    results: Dict[str, Any] = {}
+
+    def validate():
+        results["validation"] = analyzer.validate_content(content)
+
+    def analyze():
+        results["analysis"] = analyzer.analyze_content_sync(content)
+
+    return stage_calls(content) + [("validate_content", validate), ("analyze_content", analyze)]
+
+
+def _run_all(calls: Sequence[tuple]) -> None:
+    for _, call in calls:
+        call()
+
+
+def profile_document(spec: CorpusSpec, top: int = 0,
+                     make_calls: Callable[[str], List[tuple]] = _pipeline_calls) -> Dict[str, Any]:
+    """Profile the memory of every stage on one synthetic document."""
+    content = generate_document(spec)
+    _run_all(make_calls(content))
+
+    stages = _profile_calls(make_calls(content), top)
+    characters = len(content)
+    for profile in stages.values():
+        profile["peak_bytes_per_character"] = round(profile["peak_bytes"] / characters, 2)
+
+    return {
+        "words": len(content.split()),
+        "characters": characters,
+        "stages": stages,
+    }
+
+
+def run_profiles(corpus: Sequence[CorpusSpec] = LONG_CORPUS, top: int = 0) -> Dict[str, Any]:
+    """Profile every document of a corpus."""
+    return {
+        "python": sys.version.split()[0],
+        "documents": {spec.name: profile_document(spec, top) for spec in corpus},
+    }
+
+
+def find_memory_regressions(results: Dict[str, Any], baseline: Dict[str, Any],
+                            threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """Describe every stage that peaks or retains more memory than the baseline."""
+    regressions = []
+    for document, measured in results["documents"].items():
+        expected = baseline.get("documents", {}).get(document)
+        if expected is None:
+            continue
+        for stage, current in measured["stages"].items():
+            previous = expected["stages"].get(stage)
+            if previous is None:
+                continue
+            for measure in MEASURES:
+                value, baseline_value = current[measure], previous[measure]
+                if (value > max(baseline_value, 0) * (1 + threshold)
+                        and value - baseline_value > MIN_MEMORY_DELTA_BYTES):
+                    regressions.append(
+                        f"{document}/{stage}: {measure} {value / 1024:.0f} KiB "
+                        f"(baseline {baseline_value / 1024:.0f} KiB)"
+                    )
+    return regressions
+
+
+def _strip_details(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Results without the allocation sites, which depend on the checkout path."""
+    for measured in results["documents"].values():
+        for profile in measured["stages"].values():
+            profile.pop("top_retained", None)
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Profile the memory of the content analyzer stages.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--update", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--top", type=int, default=0, help="show the N largest retained allocation sites")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed growth ratio before failing (0.10 = 10%%)")
+    parser.add_argument("--output", type=Path, help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = run_profiles(LONG_CORPUS, args.top)
+
+    for document, measured in results["documents"].items():
+        print(f"{document} ({measured['words']} words, {measured['characters']} characters)")
+        for stage, profile in measured["stages"].items():
+            print(f"  {stage:<20} peak {profile['peak_bytes'] / 1024:>9.0f} KiB  "
+                  f"retained {profile['retained_bytes'] / 1024:>9.0f} KiB  "
+                  f"({profile['peak_bytes_per_character']} B/char)")
+            for site in profile.get("top_retained", []):
+                print(f"      {site}")
+
+    results = _strip_details(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.update:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update to record one")
+        return 0
+
+    regressions = find_memory_regressions(results, json.loads(args.baseline.read_text()), args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Tests for the benchmark corpus and regression check (not the timings themselves).
+"""
+
+from tests.benchmarks.bench_content_analyzer import (
+    STAGES, benchmark_document, find_regressions
+)
+from tests.benchmarks.corpus import CorpusSpec, DEFAULT_CORPUS, generate_document
+
+
+SMALL = CorpusSpec("small", 300, heading_density=0.2, list_density=0.2, code_density=0.2)
+
+
+class TestCorpus:
+    """Test cases for the synthetic corpus."""
+
+    def test_deterministic(self):
+        """Test that a spec always generates the same document."""
+        assert generate_document(SMALL) == generate_document(SMALL)
+        assert generate_document(SMALL) != generate_document(CorpusSpec("small", 300, seed=1))
+
+    def test_size_and_blocks(self):
+        """Test that documents reach their size and contain every block type."""
+        content = generate_document(SMALL)
+
+        assert len(content.split()) >= SMALL.words
+        assert "\n## " in content or "\n### " in content
+        assert "```" in content
+        assert "\n- " in content or "\n* " in content or "\n+ " in content
+
+    def test_default_corpus_sizes(self):
+        """Test that the default corpus spans 500 to 100k words."""
+        sizes = [spec.words for spec in DEFAULT_CORPUS]
+
+        assert min(sizes) == 500
+        assert max(sizes) == 100000
+
+
+class TestRegressions:
+    """Test cases for the baseline comparison."""
+
+    def test_benchmark_document(self):
+        """Test that every stage is timed and measured."""
+        result = benchmark_document(SMALL, repeats=1)
+
+        assert list(result["stages"]) == list(STAGES)
+        assert all(stage["peak_memory_bytes"] > 0 for stage in result["stages"].values())
+
+    def test_find_regressions(self):
+        """Test that only slowdowns beyond the threshold and noise floor fail."""
+        def results(parser_seconds, style_peak):
+            return {"documents": {"doc": {"stages": {
+                "parser": {"seconds": parser_seconds, "peak_memory_bytes": 1000},
+                "style_analyzer": {"seconds": 0.001, "peak_memory_bytes": style_peak},
+            }}}}
+
+        baseline = results(0.100, 1_000_000)
+
+        assert find_regressions(results(0.110, 1_100_000), baseline) == []
+        assert find_regressions(results(0.001, 1_000_000), results(0.0001, 1_000_000)) == []
+        assert find_regressions(results(0.190, 1_900_000), baseline) == []
+        regressions = find_regressions(results(0.250, 2_500_000), baseline)
+        assert len(regressions) == 2
+        assert regressions[0].startswith("doc/parser")
@@ -0,0 +1,54 @@
+"""
+Tests for the memory profiling harness (not the measured sizes themselves).
+"""
+
+from tests.benchmarks.bench_content_analyzer import STAGES
+from tests.benchmarks.corpus import LONG_CORPUS, CorpusSpec
+from tests.benchmarks.memory_content_analyzer import find_memory_regressions, profile_document
+
+
+SMALL = CorpusSpec("small", 300, heading_density=0.2, list_density=0.2, code_density=0.2)
+
+
+class TestProfile:
+    """Test cases for profiling one document."""
+
+    def test_profile_document(self):
+        """Test that every stage, validation and the full pipeline are measured."""
+        result = profile_document(SMALL)
+
+        assert list(result["stages"]) == list(STAGES) + ["validate_content", "analyze_content"]
+        for profile in result["stages"].values():
+            assert profile["peak_bytes"] > 0
+            assert profile["peak_bytes"] >= profile["retained_bytes"]
+
+    def test_retained_output(self):
+        """Test that the parser's output counts as retained and allocation sites are reported."""
+        parser = profile_document(SMALL, top=3)["stages"]["parser"]
+
+        assert parser["retained_bytes"] > 0
+        assert any("content_analyzer" in site for site in parser["top_retained"])
+
+    def test_long_corpus(self):
+        """Test that the profiled documents are long."""
+        assert min(spec.words for spec in LONG_CORPUS) >= 10000
+        assert max(spec.words for spec in LONG_CORPUS) >= 25000
+
+
+class TestMemoryRegressions:
+    """Test cases for the baseline comparison."""
+
+    def test_find_memory_regressions(self):
+        """Test that growth beyond the threshold and noise floor fails, for peak and retained."""
+        def results(peak, retained):
+            return {"documents": {"doc": {"stages": {
+                "parser": {"peak_bytes": peak, "retained_bytes": retained},
+            }}}}
+
+        baseline = results(4_000_000, 1_000_000)
+
+        assert find_memory_regressions(results(4_200_000, 1_050_000), baseline) == []
+        assert find_memory_regressions(results(10_000, 5_000), results(1_000, 500)) == []
+        regressions = find_memory_regressions(results(6_000_000, 2_000_000), baseline)
+        assert len(regressions) == 2
+        assert regressions[0].startswith("doc/parser: peak_bytes")
@@ -3,7 +3,7 @@ Tests for the ContentAnalyzer class.
 """
 
 import pytest
-from core.content_analyzer.analyzer import ContentAnalyzer, ContentAnalysisError
+from core.content_analyzer.analyzer import ContentAnalyzer, ContentAnalysisError, ContentAnalysisTimeout
 
 
 class TestContentAnalyzer:
@@ -292,7 +292,7 @@ More content here.
         assert 'docx' in formats
         
         assert formats['markdown']['supported'] is True
-        assert formats['html']['supported'] is False
+        assert formats['html']['supported'] is True
         assert formats['docx']['supported'] is False
         
         assert 'Headers (H1-H6)' in formats['markdown']['features']
@@ -391,3 +391,207 @@ The time complexity of this algorithm is O(n log n).
         
         assert str(error) == "Test error message"
         assert error.processing_time == 1.5
+    
+    def test_invalid_executor_mode(self):
+        """Test that unknown executor modes are rejected."""
+        with pytest.raises(ValueError):
+            ContentAnalyzer(executor_mode="fibers")
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("executor_mode", ["inline", "thread", "process"])
+    async def test_executor_modes_produce_same_results(self, executor_mode, sample_content):
+        """Test that every executor mode runs the same pipeline."""
+        async with ContentAnalyzer(executor_mode=executor_mode) as analyzer:
+            result = await analyzer.analyze_content(sample_content, content_id="doc-1")
+        
+        expected = ContentAnalyzer(executor_mode="inline").analyze_content_sync(
+            sample_content, content_id="doc-1"
+        )
+        # Stage timings vary between runs
+        exclude = {'analysis_timestamp': True, 'processing_time_seconds': True, 'metadata': {'stage_timings'}}
+        assert result.model_dump(exclude=exclude) == expected.model_dump(exclude=exclude)
+    
+    def test_trusted_results_match_validated(self, sample_content, monkeypatch):
+        """Test that results built without validation equal validated ones."""
+        analyzer = ContentAnalyzer(executor_mode="inline")
+        trusted = analyzer.analyze_content_sync(sample_content)
+        monkeypatch.setattr("core.content_analyzer.models.VALIDATE_INTERNAL_RESULTS", True)
+        validated = analyzer.analyze_content_sync(sample_content)
+        
+        exclude = {'analysis_timestamp': True, 'processing_time_seconds': True, 'metadata': True}
+        assert trusted.model_dump_json(exclude=exclude) == validated.model_dump_json(exclude=exclude)
+    
+    def test_quality_scorer_reads_typed_results(self, sample_content):
+        """Test that the quality scorer gives the same metrics for models and dicts."""
+        analyzer = ContentAnalyzer(executor_mode="inline")
+        result = analyzer.analyze_content_sync(sample_content)
+        
+        stages = (result.content_structure, result.style_analysis, result.purpose_analysis)
+        typed = analyzer.quality_scorer.assess_quality(sample_content, *stages)
+        dicts = analyzer.quality_scorer.assess_quality(sample_content, *(stage.model_dump() for stage in stages))
+        
+        assert typed == dicts
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("executor_mode", ["inline", "thread"])
+    async def test_analyze_content_timeout(self, executor_mode, sample_content):
+        """Test that an expired timeout raises ContentAnalysisTimeout."""
+        async with ContentAnalyzer(executor_mode=executor_mode) as analyzer:
+            with pytest.raises(ContentAnalysisTimeout):
+                await analyzer.analyze_content(sample_content, timeout=0)
+    
+    @pytest.mark.asyncio
+    async def test_thread_pool_is_shared(self, sample_content):
+        """Test that thread mode analyzers share one pool that outlives them."""
+        first = ContentAnalyzer()
+        second = ContentAnalyzer()
+        assert first._get_executor() is second._get_executor()
+        assert ContentAnalyzer(max_workers=1)._get_executor() is not first._get_executor()
+        
+        async with first:
+            await first.analyze_content(sample_content)
+        
+        result = await second.analyze_content(sample_content)
+        assert result.content_structure.total_words > 0
+    
+    @pytest.mark.asyncio
+    async def test_process_timeout_terminates_pool(self, sample_content):
+        """Test that a timed out call in process mode stops the worker pool."""
+        async with ContentAnalyzer(executor_mode="process", max_workers=1) as analyzer:
+            with pytest.raises(ContentAnalysisTimeout):
+                await analyzer.analyze_content(sample_content, timeout=0)
+            assert analyzer._executor is None
+            
+            # A fresh pool is created for the next call
+            result = await analyzer.analyze_content(sample_content)
+            assert result.content_structure.total_words > 0
+        assert analyzer._executor is None
+    
+    @pytest.mark.asyncio
+    async def test_thread_cancellation_stops_pipeline(self, analyzer, sample_content):
+        """Test that a cancellation event stops the pipeline between stages."""
+        import threading
+        
+        cancel_event = threading.Event()
+        cancel_event.set()
+        
+        with pytest.raises(ContentAnalysisError, match="cancelled"):
+            analyzer.analyze_content_sync(sample_content, cancel_event=cancel_event)
+    
+    def test_cancellation_checked_inside_stages(self, analyzer, sample_content):
+        """Test that parsing and section measurement check for cancellation as they go."""
+        import threading
+        
+        class CountingEvent(threading.Event):
+            """An event that reports being set from its ``set_after``-th check on."""
+            def __init__(self, set_after=None):
+                super().__init__()
+                self.checks = 0
+                self.set_after = set_after
+            
+            def is_set(self):
+                self.checks += 1
+                return self.set_after is not None and self.checks >= self.set_after
+        
+        never = CountingEvent()
+        analyzer.analyze_content_sync(sample_content, cancel_event=never)
+        assert never.checks > len(analyzer.stages.features) * 2
+        
+        # The third check is the second token of the parse stage
+        during_parse = CountingEvent(set_after=3)
+        with pytest.raises(ContentAnalysisError, match="cancelled"):
+            analyzer.analyze_content_sync(sample_content, cancel_event=during_parse)
+        assert during_parse.checks == 3
+    
+    @pytest.mark.asyncio
+    async def test_process_timeout_spares_other_calls(self, sample_content):
+        """Test that a timed out process call does not kill other in-flight calls."""
+        import asyncio
+        
+        async with ContentAnalyzer(executor_mode="process", max_workers=1) as analyzer:
+            other = asyncio.ensure_future(analyzer.analyze_content(sample_content))
+            await asyncio.sleep(0)
+            pool = analyzer._executor
+            with pytest.raises(ContentAnalysisTimeout):
+                await analyzer.analyze_content(sample_content, timeout=0)
+            
+            # Later calls get a new pool; the retired one finishes the other call first
+            assert analyzer._executor is None
+            result = await other
+            assert result.content_structure.total_words > 0
+            assert pool not in analyzer._retired_pools
+            assert pool not in analyzer._pool_calls
+    
+    def test_process_workers_mirror_section_cache(self, monkeypatch):
+        """Test that process workers get a section cache the size of the analyzer's."""
+        from core.content_analyzer import analyzer as analyzer_module
+        from core.content_analyzer.sections import SectionCache
+        
+        analyzer = ContentAnalyzer(executor_mode="process", section_cache=SectionCache(max_entries=7))
+        pool = analyzer._new_process_pool(1)
+        pool.shutdown()
+        
+        monkeypatch.setattr(analyzer_module, "_worker_analyzer", None)
+        analyzer_module._init_worker(*pool._initargs)
+        assert analyzer_module._worker_analyzer.section_cache.max_entries == 7
+
+
+class TestContentAnalyzerBatch:
+    """Test cases for ContentAnalyzer.analyze_batch."""
+    
+    @pytest.fixture
+    def documents(self):
+        """A small corpus of markdown documents."""
+        return [
+            f"# Post {i}\n\nThis is post number {i}. It has a few sentences. " * (i + 1)
+            for i in range(6)
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_analyze_batch_inline_ordered(self, documents):
+        """Test that ordered batches yield results in input order."""
+        analyzer = ContentAnalyzer(executor_mode="inline")
+        batch = analyzer.analyze_batch(documents, chunksize=2)
+        
+        items = await batch.collect()
+        
+        assert [item.index for item in items] == list(range(len(documents)))
+        assert all(item.ok for item in items)
+        assert batch.stats.completed == len(documents)
+        assert batch.stats.total_words == sum(item.result.content_structure.total_words for item in items)
+    
+    @pytest.mark.asyncio
+    async def test_analyze_batch_process_pool(self, documents, tmp_path):
+        """Test fan-out of content strings and file paths to a process pool."""
+        file_path = tmp_path / "post.md"
+        file_path.write_text(documents[0])
+        analyzer = ContentAnalyzer(executor_mode="thread")
+        
+        batch = analyzer.analyze_batch(documents + [file_path], ordered=False, chunksize=3, max_workers=2)
+        items = await batch.collect()
+        
+        assert sorted(item.index for item in items) == list(range(len(documents) + 1))
+        file_item = next(item for item in items if item.index == len(documents))
+        assert file_item.content_id == str(file_path)
+        assert file_item.result.content_structure.total_words == \
+            next(item for item in items if item.index == 0).result.content_structure.total_words
+        
+        stats = batch.stats.to_dict()
+        assert stats['completed'] == len(documents) + 1
+        assert stats['documents_per_second'] > 0
+    
+    @pytest.mark.asyncio
+    async def test_analyze_batch_reports_failures(self, documents):
+        """Test that per-document failures are reported without stopping the batch."""
+        analyzer = ContentAnalyzer(executor_mode="inline")
+        
+        items = await analyzer.analyze_batch(["", documents[0]]).collect()
+        
+        assert not items[0].ok
+        assert isinstance(items[0].error, ContentAnalysisError)
+        assert items[1].ok
+    
+    def test_analyze_batch_invalid_chunksize(self, documents):
+        """Test that chunks must contain at least one document."""
+        with pytest.raises(ValueError):
+            ContentAnalyzer(executor_mode="inline").analyze_batch(documents, chunksize=0)
@@ -0,0 +1,130 @@
+"""
+Tests for the two-tier analysis result cache.
+"""
+
+import time
+import pytest
+from datetime import datetime, timedelta, UTC
+from core.content_analyzer.analyzer import ContentAnalyzer
+from core.content_analyzer.cache import AnalysisCache, make_cache_key
+
+
+class FakeCollection:
+    """Minimal in-memory stand-in for a motor collection."""
+
+    def __init__(self):
+        self.documents = {}
+        self.indexes = []
+
+    async def find_one(self, query):
+        return self.documents.get(query["_id"])
+
+    async def replace_one(self, query, document, upsert=False):
+        self.documents[query["_id"]] = document
+
+    async def create_index(self, key, **kwargs):
+        self.indexes.append((key, kwargs))
+
+
+class TestAnalysisCache:
+    """Test cases for AnalysisCache."""
+
+    CONTENT = "# Title\n\nThis is a short article. It has two sentences."
+
+    @pytest.fixture
+    def analyzer(self):
+        """Create an inline analyzer with an in-process cache."""
+        return ContentAnalyzer(executor_mode="inline", cache=AnalysisCache(max_entries=2))
+
+    def test_cache_key_normalization(self):
+        """Test that whitespace-only differences share a key but parameters do not."""
+        key = make_cache_key("Hello world.\n", "auto", "general")
+
+        assert make_cache_key("Hello world.  \r\n\r\n", "auto", "General") == key
+        assert make_cache_key("Hello  world.", "auto", "general") != key
+        assert make_cache_key("Hello world.", "tutorial", "general") != key
+
+    @pytest.mark.asyncio
+    async def test_memory_hit(self, analyzer):
+        """Test that a repeated analysis is served from memory."""
+        first = await analyzer.analyze_content(self.CONTENT, content_id="a")
+        second = await analyzer.analyze_content(self.CONTENT, content_id="b")
+
+        assert second.content_id == "b"
+        assert second.metadata["cache_hit"] is True
+        assert second.quality_metrics == first.quality_metrics
+        stats = analyzer.get_cache_stats()
+        assert stats["memory_hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_hits_are_independent_copies(self, analyzer):
+        """Test that modifying returned results does not change the cached entry."""
+        first = await analyzer.analyze_content(self.CONTENT)
+        first.style_analysis.readability_score = -1.0
+        first.content_structure.headings.clear()
+
+        second = await analyzer.analyze_content(self.CONTENT)
+        second.style_analysis.readability_score = -2.0
+        third = await analyzer.analyze_content(self.CONTENT)
+
+        assert third.style_analysis.readability_score >= 0
+        assert third.content_structure.headings
+        assert analyzer.get_cache_stats()["memory_hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, analyzer):
+        """Test that the least recently used entry is evicted."""
+        for suffix in ("one", "two", "three"):
+            await analyzer.analyze_content(f"{self.CONTENT} {suffix}.")
+
+        await analyzer.analyze_content(f"{self.CONTENT} one.")
+
+        stats = analyzer.get_cache_stats()
+        assert stats["evictions"] == 2
+        assert stats["size"] == 2
+        assert stats["memory_hits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self, analyzer, monkeypatch):
+        """Test that expired memory entries are recomputed."""
+        await analyzer.analyze_content(self.CONTENT)
+
+        clock = time.monotonic() + analyzer.cache.ttl_seconds + 1
+        monkeypatch.setattr("core.content_analyzer.cache.time.monotonic", lambda: clock)
+        await analyzer.analyze_content(self.CONTENT)
+
+        assert analyzer.get_cache_stats()["misses"] == 2
+
+    @pytest.mark.asyncio
+    async def test_shared_tier(self):
+        """Test that a second process finds results in the shared collection."""
+        collection = FakeCollection()
+        db = {"analysis_cache": collection}
+        writer = ContentAnalyzer(executor_mode="inline", cache=AnalysisCache(db=db))
+        reader = ContentAnalyzer(executor_mode="inline", cache=AnalysisCache(db=db))
+
+        original = await writer.analyze_content(self.CONTENT)
+        shared = await reader.analyze_content(self.CONTENT)
+        await reader.analyze_content(self.CONTENT)
+
+        # Each cache creates the TTL index on first use of the collection
+        assert collection.indexes == [("created_at", {"expireAfterSeconds": 3600})] * 2
+        assert shared.quality_metrics == original.quality_metrics
+        assert reader.get_cache_stats()["shared_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_shared_tier_expired_entry(self):
+        """Test that stale shared entries are ignored before MongoDB removes them."""
+        collection = FakeCollection()
+        cache = AnalysisCache(db={"analysis_cache": collection})
+        analyzer = ContentAnalyzer(executor_mode="inline", cache=cache)
+
+        await analyzer.analyze_content(self.CONTENT)
+        for document in collection.documents.values():
+            document["created_at"] = datetime.now(UTC) - timedelta(hours=2)
+        cache.clear()
+        await analyzer.analyze_content(self.CONTENT)
+
+        assert cache.get_stats()["misses"] == 2
@@ -0,0 +1,103 @@
+"""
+Tests for the lazy feature graph.
+"""
+
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from core.content_analyzer.features import FeatureGraph
+from core.content_analyzer.question_generator import QuestionGenerator
+
+
+def build_graph(calls):
+    """Graph of x -> double -> (plus_one, square) -> total."""
+    def record(name, compute):
+        def wrapper(*args):
+            calls.append(name)
+            return compute(*args)
+        return wrapper
+
+    graph = FeatureGraph()
+    graph.add('double', record('double', lambda x: x * 2), ['x'])
+    graph.add('plus_one', record('plus_one', lambda d: d + 1), ['double'])
+    graph.add('square', record('square', lambda d: d * d), ['double'])
+    graph.add('total', record('total', lambda a, b: a + b), ['plus_one', 'square'])
+    return graph
+
+
+class TestFeatureGraph:
+    """Test cases for FeatureGraph."""
+
+    def test_lazy_and_memoized(self):
+        """Test that features are computed on demand and only once."""
+        calls = []
+        values = build_graph(calls).evaluate({'x': 3})
+
+        assert calls == []
+        assert values['total'] == 43
+        assert values['square'] == 36
+        assert sorted(calls) == ['double', 'plus_one', 'square', 'total']
+
+    def test_schedule_levels(self):
+        """Test that independent features share a level."""
+        levels = build_graph([]).schedule(['total'], known=['x'])
+
+        assert levels[0] == ['double']
+        assert sorted(levels[1]) == ['plus_one', 'square']
+        assert levels[2] == ['total']
+
+    def test_missing_input(self):
+        """Test that an unknown dependency is reported."""
+        with pytest.raises(KeyError):
+            build_graph([]).evaluate({})['total']
+
+    def test_cycle(self):
+        """Test that dependency cycles are rejected."""
+        graph = FeatureGraph()
+        graph.add('a', lambda b: b, ['b'])
+        graph.add('b', lambda a: a, ['a'])
+
+        with pytest.raises(ValueError):
+            graph.schedule(['a'])
+
+    def test_concurrent_compute(self):
+        """Test that computing with an executor gives the same values."""
+        calls = []
+        values = build_graph(calls).evaluate({'x': 3})
+        checkpoints = []
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = values.compute(['total'], executor=executor,
+                                    checkpoint=lambda: checkpoints.append(1))
+
+        assert result == {'total': 43}
+        assert len(calls) == 4
+        assert len(checkpoints) == 3
+
+    def test_add_model(self):
+        """Test that models are built from renamed features."""
+        graph = FeatureGraph()
+        graph.add_model('pair', dict, {'left': 'a', 'right': 'b'})
+
+        assert graph.evaluate({'a': 1, 'b': 2})['pair'] == {'left': 1, 'right': 2}
+
+
+class TestPurposeFeatures:
+    """Test that purpose analysis computes shared features once."""
+
+    def test_content_type_detected_once(self, monkeypatch):
+        generator = QuestionGenerator()
+        calls = []
+        detect = generator._detect_content_type
+
+        def counting_detect(content):
+            calls.append(1)
+            return detect(content)
+
+        monkeypatch.setattr(generator, '_detect_content_type', counting_detect)
+        generator.features = generator._build_features()
+        analysis = generator.generate_purpose_analysis(
+            "# Guide\n\nStep 1: install it. Step 2: run it.", "auto", "general"
+        )
+
+        assert len(calls) == 1
+        assert analysis.purpose == analysis.content_type
@@ -0,0 +1,65 @@
+"""
+Tests for frontmatter splitting and loading.
+"""
+
+import pytest
+from core.content_analyzer.frontmatter import MetadataCache, split_frontmatter
+from core.content_analyzer.parser import ContentParser
+
+
+class TestSplitFrontmatter:
+    """Test cases for split_frontmatter."""
+
+    def test_yaml(self):
+        """Test that YAML frontmatter and the blank lines after it are split off."""
+        assert split_frontmatter("---\ntitle: A\n---\n\n\n# Body\n") == ('yaml', 'title: A', '# Body\n')
+
+    def test_toml(self):
+        assert split_frontmatter('+++\ntitle = "A"\n+++\nBody\n') == ('toml', 'title = "A"', 'Body\n')
+
+    def test_json(self):
+        """Test that JSON frontmatter keeps its braces."""
+        assert split_frontmatter('{\n  "title": "A"\n}\nBody\n') == ('json', '{\n  "title": "A"\n}', 'Body\n')
+
+    def test_crlf(self):
+        assert split_frontmatter("---\r\ntitle: A\r\n---\r\nBody") == ('yaml', 'title: A\r', 'Body')
+
+    @pytest.mark.parametrize("content", [
+        "# No frontmatter\n",
+        "---\ntitle: A\n",
+        "---\ntitle: A\n---",
+        "--- title\n---\n",
+    ])
+    def test_no_frontmatter(self, content):
+        """Test that incomplete frontmatter leaves the content untouched."""
+        assert split_frontmatter(content) == (None, '', content)
+
+
+class TestMetadataLoading:
+    """Test cases for loading metadata through the parser and cache."""
+
+    @pytest.mark.parametrize("content", [
+        '+++\ntitle = "Test"\ntags = ["a", "b"]\n+++\n\n# Body\n',
+        '{\n  "title": "Test",\n  "tags": ["a", "b"]\n}\n\n# Body\n',
+    ])
+    def test_toml_and_json(self, content):
+        """Test that TOML and JSON frontmatter give the same metadata as YAML."""
+        result = ContentParser().parse_content(content)
+
+        assert result['metadata'] == {'title': 'Test', 'tags': ['a', 'b']}
+        assert result['content'] == '# Body\n'
+
+    def test_invalid_json(self):
+        """Test that invalid JSON frontmatter gives no metadata."""
+        assert ContentParser().parse_content('{\n  "title":\n}\nBody\n')['metadata'] == {}
+
+    def test_cache_reuses_parsed_metadata(self):
+        """Test that identical frontmatter is parsed once and callers get copies."""
+        cache = MetadataCache(max_entries=2)
+        first = cache.load("title: A\ntags: [x]")
+        first['tags'].append('mutated')
+        second = cache.load("title: A\ntags: [x]")
+
+        assert second == {'title': 'A', 'tags': ['x']}
+        assert cache.get_stats()['hits'] == 1
+        assert cache.load("title: A", 'yaml') != cache.load('title = "B"', 'toml')
@@ -0,0 +1,191 @@
+"""
+Tests for native HTML input.
+"""
+
+import pytest
+from core.content_analyzer.analyzer import ContentAnalyzer
+from core.content_analyzer.cache import make_cache_key
+from core.content_analyzer.html_parser import lex_html
+from core.content_analyzer.parser import ContentParser
+from core.content_analyzer.sections import SectionCache, measure_token_sections
+from core.content_analyzer.style_analyzer import StyleAnalyzer
+from core.content_analyzer.tokenizer import TokenizedDocument
+
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <title>Python  Guide</title>
+  <meta name="description" content="Learn Python">
+  <meta name="keywords" content="python, tutorial">
+  <script>var tracking = true;</script>
+</head>
+<body>
+  <nav><a href="/">Home</a></nav>
+  <article>
+    <h1>Getting <em>Started</em></h1>
+    <p>This tutorial explains how to install Python. See the
+       <a href="https://python.org">official site</a> first.</p>
+    <img src="logo.png" alt="Python logo">
+    <h2>Steps</h2>
+    <ol><li>Download the installer.</li><li>Run it <ul><li>as admin</li></ul></li></ol>
+    <pre><code class="language-bash">python --version
+pip list</code></pre>
+    <blockquote><p>Simple is better.</p><p>Readability counts.</p></blockquote>
+    <p>In conclusion<br>it is easy.</p>
+  </article>
+  <footer>Copyright</footer>
+</body>
+</html>"""
+
+
+class TestLexHtml:
+    """Test cases for lex_html."""
+
+    def test_blocks(self):
+        """Test that block elements become block tokens in document order."""
+        page = lex_html(PAGE)
+        blocks = [(token.kind, token.text) for token in page.tokens if token.kind not in ('link', 'image')]
+
+        assert blocks == [
+            ('heading', 'Getting Started'),
+            ('paragraph', 'This tutorial explains how to install Python. See the official site first.'),
+            ('heading', 'Steps'),
+            ('list_item', 'Download the installer.'),
+            ('list_item', 'Run it'),
+            ('list_item', 'as admin'),
+            ('code_block', 'python --version\npip list'),
+            ('blockquote', 'Simple is better.\nReadability counts.'),
+            ('paragraph', 'In conclusion\nit is easy.'),
+        ]
+
+    def test_offsets(self):
+        """Test that token offsets point into the extracted text."""
+        page = lex_html(PAGE)
+
+        for token in page.tokens:
+            if token.kind == 'image':
+                assert token.start == token.end
+            else:
+                assert page.text[token.start:token.end] == token.text
+        assert page.text.endswith('it is easy.\n\n')
+
+    def test_inline_and_metadata(self):
+        """Test links, images, code language and head metadata."""
+        page = lex_html(PAGE)
+        kinds = {token.kind: token for token in page.tokens}
+
+        assert (kinds['link'].text, kinds['link'].url) == ('official site', 'https://python.org')
+        assert (kinds['image'].text, kinds['image'].url) == ('Python logo', 'logo.png')
+        assert kinds['code_block'].language == 'bash'
+        assert page.metadata == {
+            'language': 'en',
+            'title': 'Python Guide',
+            'description': 'Learn Python',
+            'keywords': ['python', 'tutorial'],
+        }
+
+    def test_many_links_in_one_block(self):
+        """Test that each link's text is read from its own parts of the block."""
+        links = " ".join(f'<a href="/{i}">link {i}</a>' for i in range(3000))
+        page = lex_html(f"<p>See {links} and <a href='/last'>the  <br>end</a></p>")
+        link_tokens = [token for token in page.tokens if token.kind == 'link']
+
+        assert len(link_tokens) == 3001
+        assert (link_tokens[1234].text, link_tokens[1234].url) == ('link 1234', '/1234')
+        assert link_tokens[-1].text == 'the\nend'
+        for token in link_tokens:
+            assert page.text[token.start:token.end].strip() == token.text
+
+    def test_skipped_content(self):
+        """Test that scripts, navigation and footers are not content."""
+        text = lex_html(PAGE).text
+
+        assert 'tracking' not in text
+        assert 'Home' not in text
+        assert 'Copyright' not in text
+
+    def test_fragment_and_comments(self):
+        """Test that fragments parse and text after comments is kept."""
+        page = lex_html("Intro text <!-- note --> continues<div>Inside</div>")
+
+        assert [token.text for token in page.tokens] == ['Intro text continues', 'Inside']
+
+
+class TestParseHtml:
+    """Test cases for ContentParser.parse_html."""
+
+    def test_outputs(self):
+        """Test that HTML yields the same output keys as markdown."""
+        parser = ContentParser()
+        result = parser.parse_html(PAGE)
+
+        assert set(parser.parse_content("# Title\n\nText.")) <= set(result)
+        assert result['format'] == 'html'
+        assert [heading['text'] for heading in result['structure']['headings']] == ['Getting Started', 'Steps']
+        assert result['links'] == [
+            {'text': 'official site', 'url': 'https://python.org'},
+            {'text': 'Python logo', 'url': 'logo.png'},
+        ]
+        assert result['images'] == [{'alt_text': 'Python logo', 'url': 'logo.png'}]
+        assert result['code_blocks'] == [{'language': 'bash', 'code': 'python --version\npip list'}]
+        assert isinstance(result['document'], TokenizedDocument)
+
+    @pytest.mark.parametrize("html", ["", "   ", "<html><body><script>x</script></body></html>"])
+    def test_empty(self, html):
+        with pytest.raises(ValueError):
+            ContentParser().parse_html(html)
+
+
+class TestHtmlAnalysis:
+    """Test cases for analyzing HTML with ContentAnalyzer."""
+
+    def test_token_sections_match_whole_text(self):
+        """Test that section metrics merge into the metrics of the whole text."""
+        page = lex_html(PAGE)
+        style_analyzer = StyleAnalyzer()
+        cache = SectionCache()
+        merged = measure_token_sections(page.tokens, style_analyzer, cache)
+        whole = TokenizedDocument.from_text(page.text)
+
+        assert merged.sections > 1
+        assert merged.raw.word_count == whole.word_count
+        assert list(merged.raw.sentence_lengths) == list(whole.sentence_lengths)
+        assert merged.raw.markers == {'#', '```', '- ', '[', ']('}
+        assert measure_token_sections(page.tokens, style_analyzer, cache).reused == merged.sections
+
+    def test_prose_excludes_code(self):
+        """Test that code block text counts as raw text but not prose."""
+        page = lex_html("<p>Run this.</p><pre>alpha beta gamma</pre>")
+        metrics = measure_token_sections(page.tokens, StyleAnalyzer())
+
+        assert metrics.raw.word_count == 5
+        assert metrics.prose.word_count == 2
+
+    @pytest.mark.asyncio
+    async def test_analyze_html(self):
+        """Test that HTML analyzes like the equivalent markdown."""
+        analyzer = ContentAnalyzer(executor_mode='inline')
+        html = await analyzer.analyze_content(PAGE, content_format='html')
+        markdown = await analyzer.analyze_content(
+            "# Getting Started\n\n"
+            "This tutorial explains how to install Python. See the official site first.\n\n"
+            "## Steps\n\n- Download the installer.\n- Run it\n- as admin\n\n"
+            "```\npython --version\npip list\n```\n\n"
+            "> Simple is better.\n> Readability counts.\n\n"
+            "In conclusion\nit is easy.\n"
+        )
+
+        assert html.content_structure.headings == markdown.content_structure.headings
+        assert html.content_structure.total_paragraphs == markdown.content_structure.total_paragraphs
+        assert html.style_analysis.tone == markdown.style_analysis.tone
+
+    @pytest.mark.asyncio
+    async def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            await ContentAnalyzer(executor_mode='inline').analyze_content("text", content_format='docx')
+
+    def test_cache_key_includes_format(self):
+        """Test that HTML and markdown keys differ while markdown keys are unchanged."""
+        assert make_cache_key("x", "auto", "general") == make_cache_key("x", "auto", "general", "markdown")
+        assert make_cache_key("x", "auto", "general") != make_cache_key("x", "auto", "general", "html")
@@ -0,0 +1,64 @@
+"""
+Tests for the shared lexicon matcher.
+"""
+
+import pytest
+from core.content_analyzer.lexicon import (
+    LexiconMatcher, get_lexicon_matcher, match_lexicons
+)
+from core.content_analyzer.tokenizer import TokenizedDocument
+
+
+class TestLexiconMatcher:
+    """Test cases for LexiconMatcher."""
+
+    @pytest.fixture
+    def matcher(self):
+        """Create a matcher with overlapping and multi-word terms."""
+        return LexiconMatcher({
+            'casual': ['pro', 'cool'],
+            'phrases': ['as a result', 'result', 'a result of'],
+            'plural': ['pros and cons'],
+        })
+
+    def test_word_boundaries(self, matcher):
+        """Test that terms never match inside other words."""
+        document = TokenizedDocument.from_text("The process was cool, very cool.")
+        matches = matcher.match(document)
+
+        assert matches.count('casual') == 2
+        assert matches.distinct('casual') == 1
+        assert not matches.has('pro')
+
+    def test_overlapping_multi_word_terms(self, matcher):
+        """Test that overlapping terms are all reported."""
+        document = TokenizedDocument.from_text("It failed as a result of the bug.")
+        matches = matcher.match(document)
+
+        assert matches.has('as a result')
+        assert matches.has('a result of')
+        assert matches.has('result')
+        assert matches.distinct('phrases') == 3
+
+    def test_case_insensitive(self, matcher):
+        """Test that matching ignores case."""
+        matches = matcher.match(TokenizedDocument.from_text("Pros and Cons"))
+
+        assert matches.count('plural') == 1
+
+    def test_phrases_do_not_cross_sentences(self, matcher):
+        """Test that multi-word terms stop at sentence terminators."""
+        matches = matcher.match(TokenizedDocument.from_text("We did it as a. Result came."))
+
+        assert not matches.has('as a result')
+        assert matches.has('result')
+
+    def test_shared_matcher(self):
+        """Test that the process-wide matcher is built once and memoized per document."""
+        assert get_lexicon_matcher() is get_lexicon_matcher()
+
+        document = TokenizedDocument.from_text("Furthermore, this is therefore formal.")
+        matches = match_lexicons(document)
+
+        assert match_lexicons(document) is matches
+        assert matches.distinct('tone.formal') == 2
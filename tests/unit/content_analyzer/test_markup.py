@@ -0,0 +1,64 @@
+"""
+Tests for line classification and the single-pass markdown stripper.
+"""
+
+import time
+import pytest
+from core.content_analyzer.markup import classify_line, strip_markdown
+
+
+class TestClassifyLine:
+    """Test cases for classify_line."""
+
+    @pytest.mark.parametrize("line, kind", [
+        ("", "blank"),
+        ("   ", "blank"),
+        ("```python", "code_block"),
+        ("> quote", "blockquote"),
+        ("- item", "list_item"),
+        ("  12. item", "list_item"),
+        ("## Heading", "heading"),
+        ("###nospace", "paragraph"),
+        ("Plain text.", "paragraph"),
+    ])
+    def test_kinds(self, line, kind):
+        assert classify_line(line)[0] == kind
+
+
+class TestStripMarkdown:
+    """Test cases for strip_markdown."""
+
+    def test_block_markers(self):
+        """Test that block markers are removed and code blocks dropped."""
+        source = "# Title\n\n> Quoted text\n> - nested item\n\n1. First\n- Second\n\n```python\nx = 1\n```\nAfter.\n"
+
+        assert strip_markdown(source).text == "Title\n\nQuoted text\nnested item\n\nFirst\nSecond\n\nAfter.\n"
+
+    def test_inline_markup(self):
+        """Test that inline markup keeps only its text."""
+        source = "Some **bold**, *italic*, `code`, [a link](http://a.com) and ![alt](x.png)."
+
+        assert strip_markdown(source).text == "Some bold, italic, code, a link and alt."
+
+    def test_unclosed_markup_is_kept(self):
+        """Test that unclosed fences and delimiters stay as text."""
+        assert strip_markdown("Intro.\n```\nnot closed\n").text == "Intro.\n```\nnot closed\n"
+        assert strip_markdown("[not a link] and `tick").text == "[not a link] and `tick"
+
+    def test_offset_map(self):
+        """Test that every prose character maps back to the same source character."""
+        source = "## Head\n\n- **Bold** [link](u) text\n\n```\ncode\n```\n> *end*\n"
+        plain = strip_markdown(source)
+
+        for index, char in enumerate(plain.text):
+            assert source[plain.source_offset(index)] == char
+        start = plain.text.index("link")
+        assert plain.source_span(start, start + 4) == (source.index("link"), source.index("link") + 4)
+
+    def test_linear_on_pathological_input(self):
+        """Test that unmatched delimiters do not make the scan quadratic."""
+        started = time.perf_counter()
+        for source in ("[a" * 20000, "*a" * 20000, "`" * 40000):
+            strip_markdown(source)
+
+        assert time.perf_counter() - started < 2.0
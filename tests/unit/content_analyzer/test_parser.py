@@ -253,7 +253,8 @@ console.log("Hello");
         code_blocks = result['code_blocks']
         
         assert len(code_blocks) == 2
-        assert code_blocks[0]['language'] == 'unknown'
+        assert code_blocks[0]['language'] == 'python'
+        assert code_blocks[1]['language'] == 'javascript'
         assert "def hello():" in code_blocks[0]['code']
         assert "console.log" in code_blocks[1]['code']
     
@@ -341,3 +342,111 @@ This is test content.
         
         result = parser.parse_content(content, source)
         assert result['source'] == source
+    
+    def test_lex_token_stream(self, parser):
+        """Test that the lexer emits typed block and inline tokens with offsets."""
+        content = "## Intro\n\nSee [docs](https://docs.example.com) and ![logo](logo.png).\n\n```python\nx = [1](2)\n```\n"
+        tokens = list(parser.lex(content))
+        
+        assert [token.kind for token in tokens] == ['heading', 'paragraph', 'link', 'image', 'code_block']
+        heading, _, link, image, code = tokens
+        assert heading.level == 2 and heading.text == 'Intro'
+        assert content[link.start:link.end] == '[docs](https://docs.example.com)'
+        assert (image.text, image.url) == ('logo', 'logo.png')
+        assert content[image.start:image.end] == '![logo](logo.png)'
+        assert code.language == 'python' and code.text == 'x = [1](2)'
+    
+    def test_links_not_lexed_in_code(self, parser):
+        """Test that link syntax inside code blocks is not reported as a link."""
+        result = parser.parse_content("Text [a](b).\n\n```\n[c](d)\n```\n")
+        
+        assert result['links'] == [{'text': 'a', 'url': 'b'}]
+    
+    def test_lex_unmatched_brackets_linear(self, parser):
+        """Test that unmatched brackets do not make link lexing quadratic."""
+        result = parser.parse_content("[" * 50000 + "](" * 50000)
+        
+        assert result['links'] == []
+    
+    def test_stream_file_blocks(self, parser, tmp_path, sample_markdown):
+        """Test streaming a file block by block."""
+        file_path = tmp_path / "stream.md"
+        file_path.write_text(sample_markdown)
+        
+        blocks = list(parser.stream_file(str(file_path)))
+        structure = parser.parse_content(sample_markdown)['structure']
+        
+        assert blocks[0]['type'] == 'metadata'
+        assert blocks[0]['metadata']['title'] == 'Test Article'
+        assert [b['text'] for b in blocks if b['type'] == 'heading'] == [
+            h['text'] for h in structure['headings']
+        ]
+        assert [b['text'] for b in blocks if b['type'] == 'list_item'] == structure['lists']
+        code = next(b for b in blocks if b['type'] == 'code_block')
+        assert code['language'] == 'python'
+        assert code['text'] == structure['code_blocks'][0]
+        section = next(b for b in blocks if b['type'] == 'paragraph' and b['links'])
+        assert section['links'][0] == {'text': 'link', 'url': 'https://example.com'}
+        assert section['images'][0]['url'] == 'image.jpg'
+        assert ''.join(b['raw'] for b in blocks) == sample_markdown
+    
+    def test_stream_file_measures_like_parse_file(self, parser, tmp_path, sample_markdown):
+        """Test that streamed blocks can be measured incrementally."""
+        from core.content_analyzer.sections import measure_sections
+        from core.content_analyzer.style_analyzer import StyleAnalyzer
+        
+        file_path = tmp_path / "stream.md"
+        file_path.write_text(sample_markdown)
+        style_analyzer = StyleAnalyzer()
+        
+        streamed = measure_sections(
+            (b['raw'] for b in parser.stream_file(str(file_path)) if b['type'] != 'metadata'),
+            style_analyzer
+        )
+        parsed = measure_sections(parser.parse_file(str(file_path))['content'], style_analyzer)
+        
+        assert streamed.raw.word_count == parsed.raw.word_count
+        assert streamed.raw.sentence_lengths == parsed.raw.sentence_lengths
+        assert streamed.prose.sentence_lengths == parsed.prose.sentence_lengths
+    
+    def test_stream_file_without_frontmatter(self, parser, tmp_path):
+        """Test streaming a file whose first line is not frontmatter."""
+        file_path = tmp_path / "plain.md"
+        file_path.write_text("---\nnot closed\n\nText.\n")
+        
+        blocks = list(parser.stream_file(str(file_path)))
+        
+        assert all(b['type'] != 'metadata' for b in blocks)
+        assert ''.join(b['raw'] for b in blocks) == "---\nnot closed\n\nText.\n"
+    
+    def test_stream_file_not_found(self, parser):
+        """Test streaming a non-existent file."""
+        with pytest.raises(ValueError, match="File not found"):
+            list(parser.stream_file("nonexistent.md"))
+
+
+class TestRecords:
+    """Test cases for the slotted parser records."""
+    
+    def test_records_read_like_dicts(self):
+        """Test that records index, compare and convert like the dicts they replace."""
+        result = ContentParser().parse_content("# Title\n\nSee [a](b) and ![logo](c.png).\n\n```\nx\n```\n")
+        heading = result['structure']['headings'][0]
+        
+        assert heading == {'level': 1, 'text': 'Title', 'line_number': 0}
+        assert heading.level == 1 and heading['text'] == 'Title'
+        assert result['links'] == [{'text': 'a', 'url': 'b'}, {'text': 'logo', 'url': 'c.png'}]
+        assert result['images'][0].as_dict() == {'alt_text': 'logo', 'url': 'c.png'}
+        assert dict(result['code_blocks'][0]) == {'language': 'unknown', 'code': 'x'}
+        with pytest.raises(KeyError):
+            heading['missing']
+    
+    def test_records_are_compact(self):
+        """Test that records have no per-instance dict and survive pickling."""
+        import pickle
+        from core.content_analyzer.records import Link
+        
+        link = Link('text', 'https://example.com')
+        
+        assert not hasattr(link, '__dict__')
+        assert pickle.loads(pickle.dumps(link)) == link
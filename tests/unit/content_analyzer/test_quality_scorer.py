@@ -0,0 +1,71 @@
+"""
+Tests for the quality scorer.
+"""
+
+import pytest
+from core.content_analyzer.models import ContentStructure, StyleAnalysis
+from core.content_analyzer.quality_scorer import BATCH_FEATURES, QualityScorer
+from tests.benchmarks.corpus import CorpusSpec, generate_document
+
+
+PURPOSES = ['tutorial', 'educational', 'review', 'technical', 'informational', 'entertainment', 'unknown']
+
+EXTRA_TEXT = [
+    "",
+    "In summary, this is clear and simple. However, maybe it could be better.",
+    "According to research, for example, the study shows a story. Consider this question!",
+    "Introduction: first, step one. Next, an explanation. Finally, the conclusion.",
+]
+
+
+@pytest.fixture
+def batch():
+    contents, structures, styles, purposes = [], [], [], []
+    for index in range(28):
+        words = (0, 40, 350, 900, 2600, 4500, 6000)[index % 7]
+        content = generate_document(CorpusSpec(f"doc{index}", words, seed=index)) if words else ""
+        contents.append(content + "\n" + EXTRA_TEXT[index % len(EXTRA_TEXT)])
+        structures.append({'structure_score': index / 28} if index % 3 else {})
+        styles.append({'engagement_score': (28 - index) / 28})
+        purposes.append({'purpose': PURPOSES[index % len(PURPOSES)]})
+    return contents, structures, styles, purposes
+
+
+class TestAssessBatch:
+    """Test cases for QualityScorer.assess_batch."""
+
+    def test_identical_to_per_document(self, batch):
+        """Test that batch scores match assess_quality exactly, not approximately."""
+        scorer = QualityScorer()
+        results = scorer.assess_batch(*batch)
+
+        assert len(results) == len(batch[0])
+        for result, analyses in zip(results, zip(*batch)):
+            assert result.model_dump() == scorer.assess_quality(*analyses).model_dump()
+
+    def test_typed_analyses(self):
+        """Test that typed stage results are read like their dict form."""
+        scorer = QualityScorer()
+        structure = ContentStructure.model_construct(structure_score=0.9)
+        style = StyleAnalysis.model_construct(engagement_score=0.2)
+        typed = scorer.assess_batch(["Short text."], [structure], [style], [{'purpose': 'review'}])
+        plain = scorer.assess_batch(
+            ["Short text."], [{'structure_score': 0.9}], [{'engagement_score': 0.2}], [{'purpose': 'review'}]
+        )
+
+        assert typed[0] == plain[0]
+
+    def test_feature_matrix(self, batch):
+        """Test the shape of the feature matrix."""
+        features = QualityScorer().batch_features(*batch)
+
+        assert features.shape == (len(batch[0]), len(BATCH_FEATURES))
+        assert features[:, BATCH_FEATURES.index('tokens')].max() >= 6000
+
+    def test_empty_batch(self):
+        assert QualityScorer().assess_batch([], [], [], []) == []
+
+    def test_mismatched_lengths(self):
+        """Test that every document needs all three analyses."""
+        with pytest.raises(ValueError):
+            QualityScorer().assess_batch(["text"], [], [{}], [{}])
@@ -0,0 +1,74 @@
+"""
+Tests for the readability formulas.
+"""
+
+import numpy as np
+import pytest
+from core.content_analyzer.readability import (
+    count_document_syllables, count_syllables, readability_scores
+)
+from core.content_analyzer.style_analyzer import StyleAnalyzer
+from core.content_analyzer.tokenizer import TokenizedDocument
+
+
+class TestSyllables:
+    """Test cases for per-word syllable counting."""
+
+    @pytest.mark.parametrize("word, expected", [
+        ("cat", 1), ("table", 1), ("python", 2), ("readability", 5), ("the", 1), ("42", 1),
+    ])
+    def test_count_syllables(self, word, expected):
+        """Test syllable estimates for single words."""
+        assert count_syllables(word) == expected
+
+    def test_counts_per_word(self):
+        """Test that every word counts separately, not the text as one word."""
+        document = TokenizedDocument.from_text("Make the cake. Readability matters!")
+
+        assert count_document_syllables(document) == (1 + 1 + 1 + 5 + 2, 1)
+
+
+class TestReadabilityScores:
+    """Test cases for readability_scores."""
+
+    def test_known_values(self):
+        """Test the formulas against hand-computed values."""
+        scores = readability_scores(100, 5, 150, 10)
+
+        assert scores.flesch_reading_ease == pytest.approx(206.835 - 1.015 * 20 - 84.6 * 1.5)
+        assert scores.flesch_kincaid_grade == pytest.approx(0.39 * 20 + 11.8 * 1.5 - 15.59)
+        assert scores.gunning_fog == pytest.approx(0.4 * (20 + 10))
+        assert scores.smog_index == pytest.approx(1.043 * np.sqrt(60) + 3.1291)
+
+    def test_empty_text(self):
+        """Test that texts without words or sentences score zero."""
+        assert readability_scores(0, 0, 0, 0).as_dict() == {
+            'flesch_reading_ease': 0.0,
+            'flesch_kincaid_grade': 0.0,
+            'gunning_fog': 0.0,
+            'smog_index': 0.0,
+        }
+
+    def test_batch_matches_single(self):
+        """Test that scoring arrays of counts matches scoring each document."""
+        counts = [(100, 5, 150, 10), (0, 0, 0, 0), (40, 1, 90, 12)]
+        batch = readability_scores(*(np.array(column) for column in zip(*counts)))
+
+        for index, row in enumerate(counts):
+            single = readability_scores(*row)
+            for name in single._fields:
+                assert getattr(batch, name)[index] == pytest.approx(getattr(single, name))
+
+
+class TestStyleReadability:
+    """Test that style analysis reports every readability formula."""
+
+    def test_style_analysis_metrics(self):
+        analysis = StyleAnalyzer().analyze_style("The cat sat on the mat. It was happy.")
+
+        assert set(analysis.readability_metrics) == {
+            'flesch_reading_ease', 'flesch_kincaid_grade', 'gunning_fog', 'smog_index'
+        }
+        assert analysis.readability_score == pytest.approx(
+            analysis.readability_metrics['flesch_reading_ease'], abs=0.01
+        )
@@ -0,0 +1,107 @@
+"""
+Tests for section-level measurement and incremental re-analysis.
+"""
+
+import pytest
+from core.content_analyzer.analyzer import ContentAnalyzer
+from core.content_analyzer.metrics import TextMetrics
+from core.content_analyzer.sections import SectionCache, measure_sections, split_sections
+from core.content_analyzer.style_analyzer import StyleAnalyzer
+from core.content_analyzer.tokenizer import TokenizedDocument
+
+
+ARTICLE = """# Getting Started
+
+Python is great. It is therefore used by many teams!
+
+## Installation
+
+First, download the installer. Then run it, step by step.
+
+```python
+print("no split.")
+
+x = 1
+```
+
+- Install the package
+- Verify it works
+
+## Conclusion
+
+In summary, you don't need much. Why wait?
+"""
+
+
+class TestSplitSections:
+    """Test cases for split_sections."""
+
+    def test_sections_rejoin_to_text(self):
+        """Test that joining the sections gives back the text."""
+        sections = split_sections(ARTICLE)
+
+        assert ''.join(sections) == ARTICLE
+        assert len(sections) == 3
+
+    def test_no_split_inside_code_fence(self):
+        """Test that blank lines inside code fences never end a section."""
+        for section in split_sections(ARTICLE):
+            assert section.count('```') % 2 == 0
+
+    def test_no_split_after_open_sentence(self):
+        """Test that a heading without a terminator stays with its paragraph."""
+        assert split_sections("# Title\n\nBody text.\n") == ["# Title\n\nBody text.\n"]
+
+
+class TestMeasureSections:
+    """Test cases for merged section metrics."""
+
+    def test_merged_raw_metrics_match_whole_document(self):
+        """Test that merging section metrics reproduces whole-document counts."""
+        merged = measure_sections(ARTICLE, StyleAnalyzer()).raw
+        whole = TextMetrics.from_document(TokenizedDocument.from_text(ARTICLE))
+
+        assert merged.word_count == whole.word_count
+        assert merged.sentence_lengths == whole.sentence_lengths
+        assert merged.token_count == whole.token_count
+        assert merged.markers == whole.markers
+        assert +merged.lexicon_counts == +whole.lexicon_counts
+
+    def test_cache_reuses_unchanged_sections(self):
+        """Test that only edited sections are measured again."""
+        cache = SectionCache()
+        style_analyzer = StyleAnalyzer()
+        measure_sections(ARTICLE, style_analyzer, cache)
+
+        edited = ARTICLE.replace("Why wait?", "Why wait any longer?")
+        metrics = measure_sections(edited, style_analyzer, cache)
+
+        assert metrics.sections == 3
+        assert metrics.reused == 2
+        assert cache.get_stats()['hits'] == 2
+
+    def test_checkpoint_runs_before_each_section(self):
+        """Test that the checkpoint is called once per section."""
+        calls = []
+        metrics = measure_sections(ARTICLE, StyleAnalyzer(), checkpoint=lambda: calls.append(1))
+
+        assert len(calls) == metrics.sections == 3
+
+
+class TestIncrementalAnalysis:
+    """Test cases for incremental re-analysis in ContentAnalyzer."""
+
+    @pytest.mark.asyncio
+    async def test_revision_matches_fresh_analysis(self):
+        """Test that re-analyzing a revision gives the same results as from scratch."""
+        analyzer = ContentAnalyzer(executor_mode="inline")
+        await analyzer.analyze_content(ARTICLE)
+
+        edited = ARTICLE.replace("Python is great.", "Python is a versatile language.")
+        incremental = await analyzer.analyze_content(edited)
+        fresh = await ContentAnalyzer(executor_mode="inline").analyze_content(edited)
+
+        exclude = {'analysis_timestamp', 'processing_time_seconds', 'metadata'}
+        assert incremental.model_dump(exclude=exclude) == fresh.model_dump(exclude=exclude)
+        assert (incremental.metadata['sections'], incremental.metadata['sections_reused']) == (3, 2)
+        assert (fresh.metadata['sections'], fresh.metadata['sections_reused']) == (3, 0)
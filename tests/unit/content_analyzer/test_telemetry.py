@@ -0,0 +1,72 @@
+"""
+Tests for stage timings and latency histograms.
+"""
+
+import pytest
+from core.content_analyzer.analyzer import ContentAnalyzer
+from core.content_analyzer.telemetry import LatencyHistogram, StageLatency, size_bucket, stage_latency
+
+
+CONTENT = "# Title\n\nThis is a short article. It has two sentences."
+STAGES = {
+    'parsed_content', 'metrics', 'content_structure', 'style_analysis',
+    'purpose_analysis', 'quality_metrics'
+}
+
+
+class TestHistograms:
+    """Test cases for the histogram primitives."""
+
+    def test_size_bucket(self):
+        """Test document size bucketing."""
+        assert size_bucket(0) == '<1k'
+        assert size_bucket(1000) == '<1k'
+        assert size_bucket(1001) == '1k-5k'
+        assert size_bucket(10 ** 6) == '>100k'
+
+    def test_latency_histogram(self):
+        """Test that bucket counts are cumulative."""
+        histogram = LatencyHistogram(bounds=(0.01, 0.1))
+        for seconds in (0.005, 0.05, 0.05, 3.0):
+            histogram.observe(seconds)
+
+        data = histogram.to_dict()
+        assert data['buckets'] == {'0.01': 1, '0.1': 3, '+Inf': 4}
+        assert data['count'] == 4
+        assert data['max_seconds'] == 3.0
+
+    def test_stage_latency(self):
+        """Test that observations are keyed by stage and size bucket."""
+        latency = StageLatency()
+        latency.observe_timings({'parse': 0.002, 'style': 0.02}, words=3000)
+        latency.observe('parse', 50, 0.001)
+
+        snapshot = latency.snapshot()
+        assert set(snapshot) == {'parse', 'style'}
+        assert set(snapshot['parse']) == {'<1k', '1k-5k'}
+
+
+class TestAnalyzerTimings:
+    """Test cases for per-stage timings recorded by ContentAnalyzer."""
+
+    @pytest.mark.asyncio
+    async def test_metadata_timings(self):
+        """Test that results report per-stage durations and input sizes."""
+        result = await ContentAnalyzer(executor_mode="inline").analyze_content(CONTENT)
+
+        assert set(result.metadata['stage_timings']) == STAGES
+        assert all(seconds >= 0 for seconds in result.metadata['stage_timings'].values())
+        assert result.metadata['input'] == {'characters': len(CONTENT), 'words': 10}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("executor_mode", ["inline", "thread"])
+    async def test_histograms_recorded(self, executor_mode):
+        """Test that analyses feed the process-wide histograms."""
+        stage_latency.reset()
+        async with ContentAnalyzer(executor_mode=executor_mode) as analyzer:
+            await analyzer.analyze_content(CONTENT)
+            await analyzer.analyze_content(CONTENT)
+
+        histograms = analyzer.get_stage_latency()
+        assert set(histograms) == STAGES
+        assert histograms['style_analysis']['<1k']['count'] == 2
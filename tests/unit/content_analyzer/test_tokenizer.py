@@ -0,0 +1,82 @@
+"""
+Tests for the TokenizedDocument class.
+"""
+
+import re
+import pytest
+from core.content_analyzer.parser import ContentParser
+from core.content_analyzer.tokenizer import (
+    TokenizedDocument, as_document, BLOCK_HEADING, BLOCK_LIST_ITEM, BLOCK_CODE
+)
+
+
+class TestTokenizedDocument:
+    """Test cases for TokenizedDocument."""
+
+    @pytest.fixture
+    def sample_text(self):
+        """Sample text mixing markdown, punctuation and paragraphs."""
+        return """# Heading
+
+This is **bold** text. Don't stop here!  Is it e.g. done?
+
+- item one
+- item two
+
+Final paragraph...with trailing words"""
+
+    def test_counts_match_regex_semantics(self, sample_text):
+        """Test that counts match the regex based implementations they replace."""
+        document = TokenizedDocument.from_text(sample_text)
+
+        sentences = [s.strip() for s in re.split(r'[.!?]+', sample_text) if s.strip()]
+
+        assert document.word_count == len(re.findall(r'\b\w+\b', sample_text))
+        assert document.sentence_count == len(sentences)
+        assert list(document.sentence_lengths) == [len(s.split()) for s in sentences]
+        assert document.segment_count == len(re.split(r'[.!?]+', sample_text))
+        assert list(document.token_lengths) == [len(t) for t in sample_text.split()]
+        assert document.sentences() == sentences
+
+    def test_paragraphs(self, sample_text):
+        """Test blank-line separated paragraph offsets."""
+        document = TokenizedDocument.from_text(sample_text)
+
+        assert document.paragraph_count == 4
+        assert document.paragraphs()[0] == "# Heading"
+        assert document.paragraphs()[2] == "- item one\n- item two"
+
+    def test_words_and_lower(self):
+        """Test word extraction and cached lowercase text."""
+        document = TokenizedDocument.from_text("Hello World")
+
+        assert document.words() == ["Hello", "World"]
+        assert document.words(lower=True) == ["hello", "world"]
+        assert document.lower is document.lower
+        assert document.count_words(min_length=5) == 2
+
+    def test_empty_text(self):
+        """Test tokenizing empty text."""
+        document = TokenizedDocument.from_text("")
+
+        assert document.word_count == 0
+        assert document.sentence_count == 0
+        assert document.token_count == 0
+        assert document.paragraph_count == 0
+
+    def test_as_document(self):
+        """Test coercion of strings and documents."""
+        document = as_document("Some text.")
+
+        assert isinstance(document, TokenizedDocument)
+        assert as_document(document) is document
+
+    def test_parser_blocks(self, sample_text):
+        """Test that the parser records block offsets on the document."""
+        parsed = ContentParser().parse_content(sample_text + "\n\n```python\nx = 1\n```\n")
+        document = parsed['document']
+
+        assert document.blocks(BLOCK_HEADING) == ["# Heading"]
+        assert document.blocks(BLOCK_LIST_ITEM) == ["- item one", "- item two"]
+        assert document.blocks(BLOCK_CODE) == ["```python\nx = 1\n```"]
+        assert document.text == parsed['content']
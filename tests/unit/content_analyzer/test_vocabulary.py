@@ -0,0 +1,63 @@
+"""
+Tests for the hashed vocabulary lookup.
+"""
+
+import pytest
+from core.content_analyzer.style_analyzer import StyleAnalyzer
+from core.content_analyzer.tokenizer import TokenizedDocument
+from core.content_analyzer.vocabulary import Vocabulary, get_technical_vocabulary
+
+
+class TestVocabulary:
+    """Test cases for Vocabulary."""
+
+    @pytest.fixture
+    def vocabulary(self):
+        """Create a vocabulary with single and multi-word terms."""
+        return Vocabulary(['api', 'learning', 'machine learning', 'machine learning model'])
+
+    def test_single_word_terms(self, vocabulary):
+        """Test counting single-word terms."""
+        document = TokenizedDocument.from_text("The API and the api docs.")
+
+        assert vocabulary.count(document) == 2
+
+    def test_longest_multi_word_match(self, vocabulary):
+        """Test that the longest multi-word term wins without overlaps."""
+        document = TokenizedDocument.from_text("A machine learning model beats deep learning.")
+
+        assert vocabulary.count(document) == 2
+
+    def test_contains(self, vocabulary):
+        """Test membership checks."""
+        assert 'API' in vocabulary
+        assert 'machine learning' in vocabulary
+        assert 'machine' not in vocabulary
+        assert len(vocabulary) == 4
+
+    def test_from_file(self, tmp_path):
+        """Test loading a vocabulary from a data file."""
+        path = tmp_path / "terms.txt"
+        path.write_text("# comment\n\nkubernetes\nservice mesh\n")
+
+        vocabulary = Vocabulary.from_file(path)
+
+        assert 'kubernetes' in vocabulary
+        assert 'service mesh' in vocabulary
+        assert len(vocabulary) == 2
+
+    def test_bundled_technical_vocabulary(self):
+        """Test that the bundled vocabulary is loaded once and deduplicated."""
+        vocabulary = get_technical_vocabulary()
+
+        assert vocabulary is get_technical_vocabulary()
+        assert 'kubernetes' in vocabulary
+        assert 'altman' in vocabulary
+
+    def test_style_analyzer_custom_vocabulary(self):
+        """Test that StyleAnalyzer accepts a custom vocabulary."""
+        analyzer = StyleAnalyzer(technical_vocabulary=Vocabulary(['widget']))
+        metrics = analyzer.measure("Widget widget widget in a box.")
+
+        assert metrics.technical_term_count == 3
+        assert analyzer._analyze_vocabulary_level(metrics) == "technical"
@@ -0,0 +1,36 @@
+"""
+Unit tests for Brave Search results.
+"""
+
+from core.external_scraper.brave_search_client import BraveSearchClient, BraveSearchResult
+
+
+class TestBraveSearchResult:
+    """Test BraveSearchResult."""
+    
+    def test_defaults_and_to_dict(self):
+        """Test that missing fields get defaults and to_dict covers every field."""
+        result = BraveSearchResult({'title': 'Post', 'url': 'https://example.com/post'})
+        
+        assert not hasattr(result, '__dict__')
+        assert result.to_dict() == {
+            'title': 'Post',
+            'url': 'https://example.com/post',
+            'description': '',
+            'published_date': None,
+            'language': 'en',
+            'family_friendly': True,
+            'type': 'web',
+            'age': None,
+            'rank': 0,
+        }
+    
+    def test_process_search_response(self):
+        """Test that web results become BraveSearchResult objects."""
+        client = BraveSearchClient(api_key="test")
+        results = client._process_search_response({'web': {'results': [
+            {'title': 'A', 'url': 'https://a.com'},
+            {'title': 'B', 'url': 'https://b.com'},
+        ]}})
+        
+        assert [result.url for result in results] == ['https://a.com', 'https://b.com']
@@ -0,0 +1,277 @@
+"""
+Unit tests for per-host politeness scheduling.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from core.external_scraper.models import ScrapingConfig
+from core.external_scraper.politeness import (
+    HostQueue, HostScheduler, RobotsCache, MAX_CRAWL_DELAY, url_host
+)
+
+
+def _robots(texts):
+    """A robots.txt fetcher serving ``texts`` by origin and counting fetches."""
+    fetched = []
+
+    async def fetch(origin, user_agent):
+        fetched.append(origin)
+        await asyncio.sleep(0)
+        return texts.get(origin)
+
+    return fetch, fetched
+
+
+class TestHostQueue:
+    """Test HostQueue turn order."""
+
+    def test_url_host(self):
+        """Test splitting a URL into host and origin."""
+        assert url_host("https://Blog.Example.com:8443/a?b") == (
+            "blog.example.com:8443", "https://blog.example.com:8443"
+        )
+
+    def test_hosts_take_turns(self):
+        """Test that hosts are served round-robin in first-seen order."""
+        queue = HostQueue([
+            "https://a.com/1", "https://a.com/2", "https://a.com/3",
+            "https://b.com/1", "https://c.com/1", "https://b.com/2",
+        ])
+
+        order = []
+        while queue:
+            host, _ = queue.hosts()[0]
+            order.append(queue.pop(host))
+
+        assert [index for index, _ in order] == [0, 3, 4, 1, 5, 2]
+        assert len(queue) == 0
+
+
+class TestRobotsCache:
+    """Test RobotsCache."""
+
+    @pytest.mark.asyncio
+    async def test_fetches_each_origin_once(self):
+        """Test that concurrent lookups share one fetch and later ones hit the cache."""
+        fetch, fetched = _robots({"https://a.com": "User-agent: *\nCrawl-delay: 3\n"})
+        cache = RobotsCache(fetch=fetch)
+
+        rules = await asyncio.gather(*(cache.get("https://a.com") for _ in range(5)))
+        await cache.get("https://a.com")
+
+        assert fetched == ["https://a.com"]
+        assert rules[0].crawl_delay("BlogReviewer") == 3
+        assert cache.get_stats()["misses"] == 1
+        assert cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unreadable_robots_allows_everything(self):
+        """Test that a missing or failing robots.txt allows every URL."""
+        async def failing(origin, user_agent):
+            raise ConnectionError("refused")
+
+        for fetch in (_robots({})[0], failing):
+            rules = await RobotsCache(fetch=fetch).get("https://a.com")
+            assert rules.can_fetch("BlogReviewer", "https://a.com/private")
+            assert rules.crawl_delay("BlogReviewer") is None
+
+    @pytest.mark.asyncio
+    async def test_entries_expire(self):
+        """Test that rules are fetched again after the TTL."""
+        fetch, fetched = _robots({})
+        cache = RobotsCache(ttl=0.01, fetch=fetch)
+
+        await cache.get("https://a.com")
+        assert cache.peek("https://a.com") is not None
+        await asyncio.sleep(0.02)
+        assert cache.peek("https://a.com") is None
+        await cache.get("https://a.com")
+
+        assert len(fetched) == 2
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_origins_are_evicted(self):
+        """Test that the cache keeps at most max_entries origins."""
+        fetch, fetched = _robots({})
+        cache = RobotsCache(fetch=fetch, max_entries=2)
+
+        await cache.get("https://a.com")
+        await cache.get("https://b.com")
+        assert cache.peek("https://a.com") is not None
+        await cache.get("https://c.com")
+
+        assert cache.peek("https://b.com") is None
+        assert cache.peek("https://a.com") is not None
+        assert cache.get_stats()["size"] == 2
+
+
+class TestHostScheduler:
+    """Test HostScheduler."""
+
+    def _scheduler(self, texts=None):
+        return HostScheduler(RobotsCache(fetch=_robots(texts or {})[0]))
+
+    def test_host_policy(self):
+        """Test per-domain overrides and robots.txt crawl-delay."""
+        scheduler = self._scheduler()
+        config = ScrapingConfig(
+            delay_between_requests=1.0,
+            max_requests_per_host=2,
+            domain_delays={"example.com": 5.0, "fast.example.com": 0.5},
+            domain_concurrency={"example.com": 1},
+        )
+
+        assert scheduler.host_policy("other.org", config) == (2, 1.0)
+        assert scheduler.host_policy("blog.example.com", config) == (1, 5.0)
+        assert scheduler.host_policy("fast.example.com:8080", config) == (1, 0.5)
+        assert scheduler.host_policy("notexample.com", config) == (2, 1.0)
+
+    @pytest.mark.asyncio
+    async def test_crawl_delay_raises_delay(self):
+        """Test that a longer Crawl-delay wins, capped at MAX_CRAWL_DELAY."""
+        texts = {"https://a.com": "User-agent: *\nCrawl-delay: 10\n",
+                 "https://b.com": "User-agent: *\nCrawl-delay: 100000\n"}
+        scheduler = self._scheduler(texts)
+        config = ScrapingConfig(delay_between_requests=1.0)
+
+        a_rules = await scheduler.robots.get("https://a.com")
+        b_rules = await scheduler.robots.get("https://b.com")
+
+        assert scheduler.host_policy("a.com", config, a_rules) == (2, 10.0)
+        assert scheduler.host_policy("b.com", config, b_rules) == (2, MAX_CRAWL_DELAY)
+
+    @pytest.mark.asyncio
+    async def test_delay_between_requests_to_a_host(self):
+        """Test that requests to one host start at least the delay apart."""
+        scheduler = self._scheduler()
+        config = ScrapingConfig(delay_between_requests=0.05, max_requests_per_host=5)
+        queue = HostQueue(["https://a.com/1", "https://a.com/2", "https://a.com/3"])
+
+        starts = []
+        while (dispatch := await scheduler.take(queue, config)) is not None:
+            starts.append(time.monotonic())
+            await scheduler.release(dispatch.host)
+
+        assert len(starts) == 3
+        assert all(later - earlier >= 0.045 for earlier, later in zip(starts, starts[1:]))
+
+    @pytest.mark.asyncio
+    async def test_concurrency_per_host(self):
+        """Test that a host never has more requests in flight than allowed."""
+        scheduler = self._scheduler()
+        config = ScrapingConfig(delay_between_requests=0, max_requests_per_host=2)
+        queue = HostQueue([f"https://a.com/{i}" for i in range(8)])
+        active = peak = 0
+
+        async def worker():
+            nonlocal active, peak
+            while (dispatch := await scheduler.take(queue, config)) is not None:
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+                await scheduler.release(dispatch.host)
+
+        await asyncio.wait_for(asyncio.gather(*(worker() for _ in range(5))), timeout=5)
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_busy_host_does_not_block_others(self):
+        """Test that other hosts are served while one host waits for its delay."""
+        scheduler = self._scheduler()
+        config = ScrapingConfig(delay_between_requests=10)
+        queue = HostQueue(["https://a.com/1", "https://a.com/2", "https://b.com/1", "https://c.com/1"])
+        for origin in ("https://a.com", "https://b.com", "https://c.com"):
+            await scheduler.robots.get(origin)
+
+        hosts = []
+        for _ in range(3):
+            dispatch = await asyncio.wait_for(scheduler.take(queue, config), timeout=1)
+            hosts.append(dispatch.host)
+            await scheduler.release(dispatch.host)
+
+        assert hosts == ["a.com", "b.com", "c.com"]
+        assert len(queue) == 1
+
+    @pytest.mark.asyncio
+    async def test_robots_fetch_counts_as_a_request(self):
+        """Test that fetching robots.txt is subject to the host's concurrency and delay."""
+        in_flight = []
+
+        async def fetch(origin, user_agent):
+            in_flight.append(scheduler.get_stats()["active_requests"])
+            return None
+
+        scheduler = HostScheduler(RobotsCache(fetch=fetch))
+        config = ScrapingConfig(delay_between_requests=0.05, max_requests_per_host=1)
+        queue = HostQueue(["https://a.com/1"])
+
+        started = time.monotonic()
+        dispatch = await scheduler.take(queue, config)
+
+        assert in_flight == [1]
+        assert time.monotonic() - started >= 0.045
+        assert scheduler.get_stats()["active_requests"] == 1
+        await scheduler.release(dispatch.host)
+
+    def test_created_outside_event_loop(self):
+        """Test that a scheduler built before the loop starts works on that loop."""
+        scheduler = self._scheduler()
+        queue = HostQueue(["https://a.com/1"])
+
+        dispatch = asyncio.run(scheduler.take(queue, ScrapingConfig(delay_between_requests=0)))
+
+        assert dispatch.url == "https://a.com/1"
+
+    @pytest.mark.asyncio
+    async def test_robots_fetched_as_configured_user_agent(self):
+        """Test that robots.txt is requested with the user agent its rules are checked for."""
+        agents = []
+
+        async def fetch(origin, user_agent):
+            agents.append(user_agent)
+            return None
+
+        scheduler = HostScheduler(RobotsCache(fetch=fetch))
+        queue = HostQueue(["https://a.com/1"])
+        await scheduler.take(queue, ScrapingConfig(user_agent="ReviewBot/2.0"))
+
+        assert agents == ["ReviewBot/2.0"]
+
+    @pytest.mark.asyncio
+    async def test_idle_hosts_are_pruned(self):
+        """Test that hosts drop out of the state once idle and past their delay."""
+        scheduler = HostScheduler(RobotsCache(fetch=_robots({})[0]), prune_interval=0)
+        config = ScrapingConfig(delay_between_requests=0.05, respect_robots_txt=False)
+
+        first = await scheduler.take(HostQueue(["https://a.com/1"]), config)
+        second = await scheduler.take(HostQueue(["https://b.com/1"]), config)
+        await scheduler.release(first.host)
+        await scheduler.take(HostQueue(["https://c.com/1"]), config)
+        # a.com is idle but its delay has not run out
+        assert scheduler.get_stats()["hosts_tracked"] == 3
+
+        await asyncio.sleep(0.06)
+        await scheduler.take(HostQueue(["https://d.com/1"]), config)
+
+        # b.com and c.com still have requests in flight
+        assert set(scheduler._hosts) == {second.host, "c.com", "d.com"}
+
+    @pytest.mark.asyncio
+    async def test_disallowed_urls(self):
+        """Test that disallowed URLs are dispatched as not allowed unless robots.txt is ignored."""
+        texts = {"https://a.com": "User-agent: *\nDisallow: /private\n"}
+        scheduler = self._scheduler(texts)
+
+        queue = HostQueue(["https://a.com/private/1"])
+        dispatch = await scheduler.take(queue, ScrapingConfig())
+        assert dispatch.allowed is False
+        assert scheduler.get_stats()["active_requests"] == 0
+
+        queue = HostQueue(["https://a.com/private/1"])
+        dispatch = await scheduler.take(queue, ScrapingConfig(respect_robots_txt=False))
+        assert dispatch.allowed is True
@@ -0,0 +1,159 @@
+"""
+Unit tests for the Firecrawl response cache.
+"""
+
+import json
+import time
+import zlib
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from core.external_scraper.firecrawl_client import FirecrawlClient
+from core.external_scraper.response_cache import (
+    FileResponseStore, MemoryResponseStore, ResponseCache, ResponseStore, cache_key, create_response_cache,
+    normalize_url
+)
+
+
+PAGE = {"markdown": "# Post\n\nSome article text.", "html": "<h1>Post</h1>", "metadata": {"title": "Post"}}
+
+
+class FirecrawlApi:
+    """A fake Firecrawl API that counts scrapes."""
+
+    def __init__(self):
+        self.scrapes = 0
+        self.app = web.Application()
+        self.app.router.add_post("/scrape", self.scrape)
+
+    async def scrape(self, request):
+        self.scrapes += 1
+        return web.json_response(PAGE)
+
+
+@pytest_asyncio.fixture
+async def api():
+    api = FirecrawlApi()
+    server = TestServer(api.app)
+    await server.start_server()
+    api.base_url = str(server.make_url(""))
+    yield api
+    await server.close()
+
+
+class TestCacheKeys:
+    """Test URL normalization and cache keys."""
+
+    def test_normalize_url(self):
+        """Test that equivalent URLs normalize to the same form."""
+        assert normalize_url("HTTPS://Blog.Example.com:443/post?b=2&a=1&utm_source=x#comments") == (
+            "https://blog.example.com/post?a=1&b=2"
+        )
+        assert normalize_url("http://example.com") == "http://example.com/"
+        assert normalize_url("http://example.com:8080/a") == "http://example.com:8080/a"
+
+    def test_cache_key_includes_options(self):
+        """Test that the scrape options are part of the key."""
+        url = "https://example.com/post"
+        assert cache_key(url, {"a": 1, "b": 2}) == cache_key(url + "?fbclid=1", {"b": 2, "a": 1})
+        assert cache_key(url, {"waitFor": 2000}) != cache_key(url, {"waitFor": 0})
+
+    def test_create_response_cache(self, tmp_path, monkeypatch):
+        """Test building caches from their spec."""
+        monkeypatch.delenv("SCRAPE_CACHE", raising=False)
+        assert create_response_cache() is None
+        assert isinstance(create_response_cache("memory").store, MemoryResponseStore)
+        assert isinstance(create_response_cache(f"file:{tmp_path}").store, FileResponseStore)
+        assert create_response_cache("mongodb:pages").store.collection_name == "pages"
+        with pytest.raises(ValueError):
+            create_response_cache("redis")
+
+    def test_store_is_abstract(self):
+        """Test that a store must implement load, save and delete."""
+        with pytest.raises(TypeError):
+            ResponseStore()
+
+
+class TestResponseCache:
+    """Test ResponseCache storage and expiry."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_is_served(self):
+        """Test that an entry is a hit for equivalent URLs and the same options."""
+        cache = ResponseCache()
+        url = "https://example.com/post"
+
+        assert await cache.get(url, {}) is None
+        await cache.put(url, {}, PAGE)
+
+        assert await cache.get(url + "#top", {}) == PAGE
+        assert await cache.get(url, {"waitFor": 0}) is None
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["quota_saved"]) == (1, 2, 1)
+        assert stats["hit_ratio"] == 0.333
+
+    @pytest.mark.asyncio
+    async def test_file_store_persists_compressed(self, tmp_path):
+        """Test that entries survive the cache and are stored compressed."""
+        url = "https://example.com/post"
+        await ResponseCache(FileResponseStore(tmp_path)).put(url, {}, PAGE)
+
+        files = list(tmp_path.rglob("*.json.z"))
+        assert len(files) == 1
+        assert json.loads(zlib.decompress(files[0].read_bytes()))["data"] == PAGE
+
+        assert await ResponseCache(FileResponseStore(tmp_path)).get(url, {}) == PAGE
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_removed(self, tmp_path):
+        """Test that entries past the TTL are misses and get deleted."""
+        cache = ResponseCache(FileResponseStore(tmp_path), ttl_seconds=0.01)
+        await cache.put("https://example.com/post", {}, PAGE)
+        time.sleep(0.02)
+
+        assert await cache.get("https://example.com/post", {}) is None
+        assert list(tmp_path.rglob("*.json.z")) == []
+
+    @pytest.mark.asyncio
+    async def test_file_store_purges_expired_files(self, tmp_path):
+        """Test that saving sweeps out the files of expired entries."""
+        store = FileResponseStore(tmp_path, purge_interval=0)
+        await store.save("aa-old", b"old", time.time() - 1)
+        await store.save("bb-new", b"new", time.time() + 60)
+
+        assert [path.name for path in tmp_path.rglob("*.json.z")] == ["bb-new.json.z"]
+        assert store.purge(time.time() + 120) == 1
+        assert await store.load("bb-new") is None
+
+
+class TestFirecrawlClientCache:
+    """Test the cache in FirecrawlClient.scrape_url."""
+
+    @pytest.mark.asyncio
+    async def test_cached_page_is_not_scraped_again(self, api):
+        """Test that a cached page skips the Firecrawl request until it expires."""
+        url = "https://blog.example.com/post"
+        cache = ResponseCache()
+        async with FirecrawlClient("test", base_url=api.base_url, response_cache=cache) as client:
+            first = await client.scrape_url(url)
+            second = await client.scrape_url(url + "?utm_source=feed")
+
+            cache.ttl_seconds = 0
+            time.sleep(0.01)
+            third = await client.scrape_url(url)
+
+            status = client.get_cache_status()
+
+        assert api.scrapes == 2
+        assert first.content == second.content == third.content == PAGE["markdown"]
+        assert not second.errors
+        assert status["quota_saved"] == 1
+        assert status["stored"] == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_disabled(self):
+        """Test the status of a client without a cache."""
+        assert FirecrawlClient("test").get_cache_status() == {"enabled": False}
@@ -0,0 +1,193 @@
+"""
+Unit tests for the external scraper job pipeline.
+"""
+
+import asyncio
+
+import pytest
+
+from core.external_scraper.models import (
+    ContentMetadata, ContentType, ScrapingConfig, ScrapingResult, ScrapingStatus
+)
+from core.external_scraper.politeness import HostScheduler, RobotsCache
+from core.external_scraper.scraper import ExternalScraper
+
+
+class FakeFirecrawlClient:
+    """Returns a page per URL after a per-URL delay and records concurrency."""
+
+    def __init__(self, delays=None, failing=()):
+        self.delays = delays or {}
+        self.failing = set(failing)
+        self.started = []
+        self.active = 0
+        self.max_active = 0
+
+    async def scrape_url(self, url, options=None):
+        self.started.append(url)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(url, 0))
+            if url in self.failing:
+                raise ConnectionError("connection reset")
+            content = f"Article at {url}. " * 20
+            return ScrapingResult(
+                url=url,
+                content_type=ContentType.ARTICLE,
+                content=content,
+                metadata=ContentMetadata(title=url),
+                scraping_time=0.0,
+                content_hash=url
+            )
+        finally:
+            self.active -= 1
+
+
+def _make_scraper(client, robots_txt=None):
+    async def fetch_robots(origin, user_agent):
+        return robots_txt
+
+    scraper = ExternalScraper()
+    scraper.firecrawl_client = client
+    scraper.scheduler = HostScheduler(RobotsCache(fetch=fetch_robots))
+    scraper.content_processor.validate_content_quality = lambda content, metadata: (0.9, [])
+    return scraper
+
+
+# One URL per host and no delay, so host politeness (robots.txt fetches count
+# as requests too) does not pace these tests
+def _urls(count):
+    return [f"https://site{i}.example.com/post" for i in range(count)]
+
+
+class TestExecuteJob:
+    """Test the worker pipeline of ExternalScraper.execute_job."""
+
+    @pytest.mark.asyncio
+    async def test_scrapes_every_url_in_order(self):
+        """Test that all URLs are scraped and results follow the URL order."""
+        urls = _urls(12)
+        # Later URLs finish first
+        client = FakeFirecrawlClient({url: 0.01 * (12 - i) for i, url in enumerate(urls)})
+        scraper = _make_scraper(client)
+        progress = []
+        scraper.set_progress_callback(lambda job_id, value: progress.append(value))
+
+        job = await scraper.create_scraping_job(urls, ScrapingConfig(delay_between_requests=0))
+        await scraper.execute_job(job.job_id)
+
+        assert job.status == ScrapingStatus.COMPLETED
+        assert [result.url for result in job.results] == urls
+        assert job.processed_urls == job.successful_urls == 12
+        assert job.progress == 1.0
+        assert len(progress) == 12
+        assert progress == sorted(progress)
+
+    @pytest.mark.asyncio
+    async def test_keeps_earlier_results(self):
+        """Test that results already on the job stay in front of the new ones."""
+        urls = _urls(6)
+        client = FakeFirecrawlClient({url: 0.01 * (6 - i) for i, url in enumerate(urls)})
+        scraper = _make_scraper(client)
+
+        job = await scraper.create_scraping_job(urls, ScrapingConfig(delay_between_requests=0))
+        earlier = scraper._create_error_result("https://earlier.example.com/", "exception", "earlier run")
+        job.results.append(earlier)
+        await scraper.execute_job(job.job_id)
+
+        assert job.results[0] is earlier
+        assert [result.url for result in job.results[1:]] == urls
+
+    @pytest.mark.asyncio
+    async def test_slow_url_does_not_hold_back_others(self):
+        """Test that workers keep fetching while one URL is slow."""
+        urls = _urls(10)
+        client = FakeFirecrawlClient({urls[0]: 0.3})
+        scraper = _make_scraper(client)
+
+        job = await scraper.create_scraping_job(urls, ScrapingConfig(max_concurrent_requests=3, delay_between_requests=0))
+        task = asyncio.create_task(scraper.execute_job(job.job_id))
+        await asyncio.sleep(0.1)
+
+        # The other workers finished everything except the slow page
+        assert job.processed_urls == 9
+        await task
+        assert job.processed_urls == 10
+        assert client.max_active == 3
+
+    @pytest.mark.asyncio
+    async def test_worker_exception_becomes_failed_result(self):
+        """Test that an unexpected error fails only its URL."""
+        urls = _urls(2)
+        scraper = _make_scraper(FakeFirecrawlClient(failing=[urls[0]]))
+
+        job = await scraper.create_scraping_job(urls, ScrapingConfig(delay_between_requests=0))
+        await scraper.execute_job(job.job_id)
+
+        assert job.status == ScrapingStatus.COMPLETED
+        assert job.failed_urls == 1
+        assert job.successful_urls == 1
+        assert job.results[0].errors[0].error_type == "exception"
+        assert "connection reset" in job.results[0].errors[0].message
+
+    @pytest.mark.asyncio
+    async def test_cancel_stops_feeding_urls(self):
+        """Test that cancelling a running job stops scraping new URLs."""
+        urls = _urls(20)
+        client = FakeFirecrawlClient({url: 0.05 for url in urls})
+        scraper = _make_scraper(client)
+
+        job = await scraper.create_scraping_job(urls, ScrapingConfig(max_concurrent_requests=2, delay_between_requests=0))
+        task = asyncio.create_task(scraper.execute_job(job.job_id))
+        await asyncio.sleep(0.07)
+        scraper.cancel_job(job.job_id)
+        await task
+
+        assert job.status == ScrapingStatus.CANCELLED
+        assert len(client.started) < len(urls)
+        assert job.processed_urls == len(client.started)
+
+    @pytest.mark.asyncio
+    async def test_processing_error_fails_job(self):
+        """Test that an error in post-processing fails the job without hanging."""
+        scraper = _make_scraper(FakeFirecrawlClient())
+
+        def fail(content, metadata):
+            raise RuntimeError("validator crashed")
+        scraper.content_processor.validate_content_quality = fail
+
+        job = await scraper.create_scraping_job(_urls(30), ScrapingConfig(delay_between_requests=0))
+        await asyncio.wait_for(scraper.execute_job(job.job_id), timeout=5)
+
+        assert job.status == ScrapingStatus.FAILED
+        assert job.errors[-1].error_type == "job_execution"
+
+    @pytest.mark.asyncio
+    async def test_same_host_is_paced(self):
+        """Test that URLs of one host respect its concurrency and delay."""
+        urls = [f"https://blog.example.com/{i}" for i in range(4)]
+        client = FakeFirecrawlClient({url: 0.05 for url in urls})
+        scraper = _make_scraper(client)
+        config = ScrapingConfig(delay_between_requests=0.05, max_requests_per_host=1)
+
+        job = await scraper.create_scraping_job(urls, config)
+        await scraper.execute_job(job.job_id)
+
+        assert job.processed_urls == 4
+        assert client.max_active == 1
+
+    @pytest.mark.asyncio
+    async def test_robots_disallowed_url_is_not_fetched(self):
+        """Test that URLs disallowed by robots.txt fail without a request."""
+        robots_txt = "User-agent: *\nDisallow: /private/\n"
+        urls = ["https://blog.example.com/private/a", "https://blog.example.com/public/b"]
+        client = FakeFirecrawlClient()
+        scraper = _make_scraper(client, robots_txt)
+
+        job = await scraper.create_scraping_job(urls, ScrapingConfig(delay_between_requests=0))
+        await scraper.execute_job(job.job_id)
+
+        assert client.started == [urls[1]]
+        assert job.results[0].errors[0].error_type == "robots_txt"
+        assert job.successful_urls == 1
@@ -5,6 +5,7 @@ Unit tests for health check functionality.
 import pytest
 from fastapi.testclient import TestClient
 from api.main import app
+from core.content_analyzer.telemetry import stage_latency
 
 
 @pytest.fixture
@@ -59,3 +60,18 @@ def test_redoc_available(client):
     response = client.get("/redoc")
     assert response.status_code == 200
     assert "text/html" in response.headers["content-type"]
+
+
+def test_content_analysis_metrics(client):
+    """Test the content analysis latency histogram endpoint."""
+    stage_latency.reset()
+    stage_latency.observe("style_analysis", 1500, 0.004)
+
+    response = client.get("/metrics/content-analysis")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["stages"]["style_analysis"]["1k-5k"]["count"] == 1
+    assert data["size_buckets"][0] == "<1k"
+
+    response = client.get("/metrics/content-analysis", params={"stage": "parsed_content"})
+    assert response.json()["stages"] == {"parsed_content": {}}